@@ -12,5 +12,6 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "task_manager.settings")
+os.environ.setdefault("DJANGO_ROOT_URLCONF", "task_manager.asgi_urls")
 
 application = get_asgi_application()
@@ -0,0 +1,32 @@
+"""
+URL configuration of the project served over ASGI.
+
+The Task CRUD endpoints are served by async views, the other urls by the
+same views as over WSGI. See `task_manager.urls`. The stream of live task
+events is only served over ASGI.
+"""
+
+from django.urls import re_path
+
+from task_manager import urls
+from tasks import async_views as tasks_async_views
+
+urlpatterns = [
+    # Named like the routes of TaskViewSet, see task_manager.metrics.
+    re_path(
+        r"^api/v1/tasks$",
+        tasks_async_views.TaskAsyncListView.as_view(),
+        name="task-list",
+    ),
+    re_path(
+        r"^api/v1/tasks/events$",
+        tasks_async_views.TaskEventStreamView.as_view(),
+        name="task-events",
+    ),
+    re_path(
+        r"^api/v1/tasks/(?P<pk>[0-9]+)$",
+        tasks_async_views.TaskAsyncDetailView.as_view(),
+        name="task-detail",
+    ),
+    *urls.urlpatterns,
+]
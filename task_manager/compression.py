@@ -0,0 +1,211 @@
+"""This module contains the codecs compressing responses, see `CompressionMiddleware`.
+
+Each codec compresses a whole body at once, or a streamed body chunk by
+chunk. A streamed body is flushed once `flush_size` bytes were compressed
+since the last flush, so that the client receives it as it is sent: each
+flush ends a compressed block, and flushing the small chunks of a stream,
+e.g. the lines of an export, one by one would make both the body and the
+compression cost several times bigger.
+"""
+
+import zlib
+from collections import abc
+
+import brotli
+import zstandard
+from django.conf import settings
+from django.core import exceptions
+
+
+class StreamCompressor:
+    """Compresses the chunks of a streamed body one after the other.
+
+    Args:
+        flush_size (int): The number of bytes compressed between flushes, 0
+            to flush every chunk, e.g. for a stream of events.
+    """
+
+    def __init__(self, flush_size: int):
+        self.flush_size = flush_size
+        self.pending = 0
+
+    def compress(self, chunk: bytes) -> bytes:
+        """Return the data compressed so far, flushed every `flush_size` bytes."""
+        data = self.process(chunk)
+        self.pending += len(chunk)
+        if self.pending >= self.flush_size:
+            data += self.flush()
+            self.pending = 0
+        return data
+
+    def process(self, chunk: bytes) -> bytes:
+        """Compress a chunk, returning what the compressor output, if anything."""
+        raise NotImplementedError
+
+    def flush(self) -> bytes:
+        """Return the data compressed so far, so that it can be sent right away."""
+        raise NotImplementedError
+
+    def finish(self) -> bytes:
+        """Return the end of the compressed stream."""
+        raise NotImplementedError
+
+
+class Codec:
+    """A content coding of the `Content-Encoding` header.
+
+    Args:
+        level (int): The compression level, in the range of the codec.
+    """
+
+    encoding = ""
+
+    def __init__(self, level: int):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        """Return a whole body compressed."""
+        raise NotImplementedError
+
+    def stream(self, flush_size: int = 0) -> StreamCompressor:
+        """Return a compressor for a streamed body, see `StreamCompressor`."""
+        raise NotImplementedError
+
+
+class _GzipStreamCompressor(StreamCompressor):
+    def __init__(self, level: int, flush_size: int):
+        super().__init__(flush_size)
+        # 16 + MAX_WBITS writes a gzip header and trailer around the data.
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def process(self, chunk: bytes) -> bytes:
+        return self.compressor.compress(chunk)
+
+    def flush(self) -> bytes:
+        return self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self.compressor.flush()
+
+
+class GzipCodec(Codec):
+    """The `gzip` coding, levels 1 to 9."""
+
+    encoding = "gzip"
+
+    def compress(self, data: bytes) -> bytes:
+        stream = _GzipStreamCompressor(self.level, 0)
+        return stream.process(data) + stream.finish()
+
+    def stream(self, flush_size: int = 0) -> StreamCompressor:
+        return _GzipStreamCompressor(self.level, flush_size)
+
+
+class _BrotliStreamCompressor(StreamCompressor):
+    def __init__(self, level: int, flush_size: int):
+        super().__init__(flush_size)
+        self.compressor = brotli.Compressor(quality=level)
+
+    def process(self, chunk: bytes) -> bytes:
+        return self.compressor.process(chunk)
+
+    def flush(self) -> bytes:
+        return self.compressor.flush()
+
+    def finish(self) -> bytes:
+        return self.compressor.finish()
+
+
+class BrotliCodec(Codec):
+    """The `br` coding, levels 0 to 11."""
+
+    encoding = "br"
+
+    def compress(self, data: bytes) -> bytes:
+        return brotli.compress(data, quality=self.level)
+
+    def stream(self, flush_size: int = 0) -> StreamCompressor:
+        return _BrotliStreamCompressor(self.level, flush_size)
+
+
+class _ZstdStreamCompressor(StreamCompressor):
+    def __init__(self, level: int, flush_size: int):
+        super().__init__(flush_size)
+        self.compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def process(self, chunk: bytes) -> bytes:
+        return self.compressor.compress(chunk)
+
+    def flush(self) -> bytes:
+        return self.compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self.compressor.flush()
+
+
+class ZstdCodec(Codec):
+    """The `zstd` coding, levels 1 to 22."""
+
+    encoding = "zstd"
+
+    def compress(self, data: bytes) -> bytes:
+        # Compressors hold the state of one body, they are not shared
+        # between the threads of the server.
+        return zstandard.ZstdCompressor(level=self.level).compress(data)
+
+    def stream(self, flush_size: int = 0) -> StreamCompressor:
+        return _ZstdStreamCompressor(self.level, flush_size)
+
+
+CODECS: dict[str, type[Codec]] = {
+    codec.encoding: codec for codec in (ZstdCodec, BrotliCodec, GzipCodec)
+}
+
+
+def get_codecs() -> dict[str, Codec]:
+    """Return the codecs of `RESPONSE_COMPRESSION_ENCODINGS`, preferred first.
+
+    Raises:
+        ImproperlyConfigured: If some encodings are not supported.
+    """
+    unknown = set(settings.RESPONSE_COMPRESSION_ENCODINGS).difference(CODECS)
+    if unknown:
+        raise exceptions.ImproperlyConfigured(
+            f"Unsupported RESPONSE_COMPRESSION_ENCODINGS: {', '.join(sorted(unknown))}."
+        )
+    return {
+        encoding: CODECS[encoding](settings.RESPONSE_COMPRESSION_LEVELS[encoding])
+        for encoding in settings.RESPONSE_COMPRESSION_ENCODINGS
+    }
+
+
+def negotiate(accept_encoding: str, encodings: abc.Iterable[str]) -> str | None:
+    """Return the encoding a client accepts best, None to send the body as is.
+
+    Args:
+        accept_encoding (str): The `Accept-Encoding` header of the request,
+            e.g. `gzip;q=0.8, br`.
+        encodings (Iterable[str]): The encodings available, preferred first.
+            The first one wins between encodings accepted with the same weight.
+    """
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, *params = item.split(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name] = weight
+    best, best_weight = None, 0.0
+    for encoding in encodings:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
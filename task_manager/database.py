@@ -0,0 +1,27 @@
+"""This module reports how the database connections of the process are managed."""
+
+from django.db import connections
+
+
+def connection_stats(alias: str) -> dict:
+    """Return the connection settings of a database and the stats of its pool.
+
+    The pool stats are the ones of psycopg_pool, see
+    https://www.psycopg.org/psycopg3/docs/advanced/pool.html#pool-stats
+
+    Args:
+        alias (str): The alias of the database in the `DATABASES` setting.
+    """
+    connection = connections[alias]
+    pool = getattr(connection, "pool", None)
+    return {
+        "vendor": connection.vendor,
+        "conn_max_age": connection.settings_dict["CONN_MAX_AGE"],
+        "conn_health_checks": connection.settings_dict["CONN_HEALTH_CHECKS"],
+        "pool": pool.get_stats() if pool is not None else None,
+    }
+
+
+def database_stats() -> dict[str, dict]:
+    """Return the `connection_stats()` of every database, by alias."""
+    return {alias: connection_stats(alias) for alias in connections}
@@ -0,0 +1,43 @@
+"""
+URL configuration of the API documentation.
+
+Included by `task_manager.urls` when `API_DOCS_ENABLED` is set. The views of
+drf_spectacular are imported at their first request, so that processes
+never asked for the documentation do not load drf_spectacular.
+"""
+
+import functools
+
+from django.urls import path
+
+from task_manager import views
+
+
+def _spectacular_view(name: str, **initkwargs):
+    """Return a view calling the drf_spectacular view `name`, imported on first use."""
+
+    @functools.cache
+    def get_view():
+        from drf_spectacular import views as spectacular_views
+
+        return getattr(spectacular_views, name).as_view(**initkwargs)
+
+    def view(request, *args, **kwargs):
+        return get_view()(request, *args, **kwargs)
+
+    return view
+
+
+urlpatterns = [
+    path("api/v1/schema/", views.SchemaView.as_view(), name="schema"),
+    path(
+        "api/v1/docs/swagger/",
+        _spectacular_view("SpectacularSwaggerView", url_name="schema"),
+        name="swagger-ui",
+    ),
+    path(
+        "api/v1/docs/redoc/",
+        _spectacular_view("SpectacularRedocView", url_name="schema"),
+        name="redoc",
+    ),
+]
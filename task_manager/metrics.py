@@ -0,0 +1,138 @@
+"""This module contains the Prometheus metrics of the project.
+
+Metrics are recorded with `prometheus_client` and exposed at `/metrics` by
+`task_manager.views.MetricsView`:
+
+- the latency of the requests, by route name and method, and their count by
+  status code, recorded by `task_manager.middleware.MetricsMiddleware`
+- the API errors, by the `error_code` of their payload
+- the count and duration of the SQL queries, by database alias
+- the lookups of the task cache, by result, for its hit ratio
+
+A server running several worker processes must point the
+`PROMETHEUS_MULTIPROC_DIR` environment variable to an empty directory
+before the workers start: each process then writes its values to
+memory-mapped files there, which `/metrics` adds up.
+
+The children of labelled metrics are looked up once per label values and
+memoized, so recording a value only takes the lock of that value.
+"""
+
+import functools
+import time
+
+import prometheus_client
+from django import dispatch
+from django.db.backends import signals as db_signals
+
+NAMESPACE = "task_manager"
+
+# Latency buckets in seconds, from a cached read to a large export.
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+REQUEST_DURATION = prometheus_client.Histogram(
+    "http_request_duration_seconds",
+    "Time spent answering HTTP requests, up to the first byte of streamed ones.",
+    ["route", "method"],
+    namespace=NAMESPACE,
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS = prometheus_client.Counter(
+    "http_requests",
+    "HTTP requests answered.",
+    ["route", "method", "status"],
+    namespace=NAMESPACE,
+)
+API_ERRORS = prometheus_client.Counter(
+    "api_errors",
+    "API error responses, by the error_code of their payload.",
+    ["error_code"],
+    namespace=NAMESPACE,
+)
+DB_QUERY_DURATION = prometheus_client.Histogram(
+    "db_query_duration_seconds",
+    "Time spent running SQL queries.",
+    ["database"],
+    namespace=NAMESPACE,
+    buckets=LATENCY_BUCKETS,
+)
+TASK_CACHE_LOOKUPS = prometheus_client.Counter(
+    "task_cache_lookups",
+    "Lookups of the task cache: hit, miss, or missing_hit for a hit on an id "
+    "known to be missing (also counted as a hit).",
+    ["result"],
+    namespace=NAMESPACE,
+)
+
+
+@functools.cache
+def request_duration(route: str, method: str):
+    """Return the request latency histogram of a route and method."""
+    return REQUEST_DURATION.labels(route=route, method=method)
+
+
+@functools.cache
+def requests(route: str, method: str, status: int):
+    """Return the request counter of a route, method and status code."""
+    return REQUESTS.labels(route=route, method=method, status=str(status))
+
+
+@functools.cache
+def api_errors(error_code: str):
+    """Return the counter of the API errors with an error code."""
+    return API_ERRORS.labels(error_code=error_code)
+
+
+@functools.cache
+def db_query_duration(database: str):
+    """Return the query duration histogram of a database alias."""
+    return DB_QUERY_DURATION.labels(database=database)
+
+
+@functools.cache
+def task_cache_lookups(result: str):
+    """Return the counter of the task cache lookups with a result."""
+    return TASK_CACHE_LOOKUPS.labels(result=result)
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper recording the duration of every query.
+
+    For more information, see:
+    https://docs.djangoproject.com/en/5.2/topics/db/instrumentation/
+    """
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        db_query_duration(context["connection"].alias).observe(
+            time.perf_counter() - started
+        )
+
+
+def install(connection) -> None:
+    """Record the queries run on a database connection."""
+    if record_query not in connection.execute_wrappers:
+        # First, so that the bare pop() of `connection.execute_wrapper()`
+        # still removes the wrapper of a block this runs in.
+        connection.execute_wrappers.insert(0, record_query)
+
+
+@dispatch.receiver(db_signals.connection_created)
+def install_on_connect(sender, connection, **kwargs) -> None:
+    """Install the execute wrapper on the connections opened by any thread."""
+    install(connection)
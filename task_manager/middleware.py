@@ -0,0 +1,355 @@
+"""This module contains the middleware of the project."""
+
+import contextlib
+import json
+import logging
+import random
+import time
+
+import asgiref.sync
+from django.conf import settings
+from django.db import connections
+from django.utils import cache as cache_utils
+
+from task_manager import compression
+from task_manager import metrics
+from task_manager import routers
+from task_manager import timing
+
+logger = logging.getLogger(__name__)
+
+# Cookie telling that a client wrote recently.
+STICKY_COOKIE = "db_primary"
+
+
+class ReplicaStickinessMiddleware:
+    """Pins the reads of the clients that wrote recently to the primary database.
+
+    A request with an unsafe method runs on the primary and sets a cookie
+    living `DATABASE_REPLICA_STICKINESS` seconds; the requests carrying it
+    read from the primary too, so that a client never misses its own writes
+    because of replication lag.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = asgiref.sync.iscoroutinefunction(get_response)
+        if self.is_async:
+            asgiref.sync.markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        with routers.pinned_to_primary(self.is_pinned(request)):
+            response = self.get_response(request)
+        return self.process_response(request, response)
+
+    async def __acall__(self, request):
+        with routers.pinned_to_primary(self.is_pinned(request)):
+            response = await self.get_response(request)
+        return self.process_response(request, response)
+
+    def is_writing(self, request) -> bool:
+        """Return whether the request may write."""
+        return request.method not in ("GET", "HEAD", "OPTIONS", "TRACE")
+
+    def is_pinned(self, request) -> bool:
+        """Return whether the request must run on the primary."""
+        return self.is_writing(request) or STICKY_COOKIE in request.COOKIES
+
+    def process_response(self, request, response):
+        """Set the cookie pinning the next reads of a client that wrote."""
+        if settings.DATABASE_REPLICAS and self.is_writing(request):
+            response.set_cookie(
+                STICKY_COOKIE,
+                "1",
+                max_age=settings.DATABASE_REPLICA_STICKINESS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+class ServerTimingMiddleware:
+    """Reports where the time of sampled requests goes.
+
+    Each sampled request, a `SERVER_TIMING_SAMPLE_RATE` share of them,
+    records its SQL query count and time through the execute wrapper of
+    `task_manager.timing`, and the time spent in the phases measured with
+    `task_manager.timing.measure()`, e.g. serialization and rendering. They
+    are sent in a `Server-Timing` response header and logged as a JSON line.
+    A statement run `SERVER_TIMING_REPEATED_QUERY_THRESHOLD` times or more is
+    flagged as a probable N+1 query and logged as a warning.
+
+    Streamed content is produced after the response leaves the middleware,
+    its time is not included.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    # Phases reported besides the database time, in header order.
+    phases = ("serialize", "render")
+    # Characters of a repeated statement quoted in the log line.
+    max_statement_length = 200
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = asgiref.sync.iscoroutinefunction(get_response)
+        if self.is_async:
+            asgiref.sync.markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self.is_sampled(request):
+            return self.get_response(request)
+        with self.recording() as timings:
+            response = self.get_response(request)
+        return self.process_response(request, response, timings)
+
+    async def __acall__(self, request):
+        if not self.is_sampled(request):
+            return await self.get_response(request)
+        with self.recording() as timings:
+            response = await self.get_response(request)
+        return self.process_response(request, response, timings)
+
+    def is_sampled(self, request) -> bool:
+        """Return whether the request is timed."""
+        rate = settings.SERVER_TIMING_SAMPLE_RATE
+        return rate >= 1 or random.random() < rate
+
+    def recording(self) -> contextlib.AbstractContextManager[timing.RequestTimings]:
+        """Time the block and record the queries it runs on every database."""
+        # Connections opened before this module was loaded missed the
+        # `connection_created` receiver of the timing module.
+        for connection in connections.all():
+            timing.install(connection)
+        return timing.recording()
+
+    def process_response(self, request, response, timings: timing.RequestTimings):
+        """Send the timings in the Server-Timing header and log them."""
+        total = timings.elapsed()
+        durations = {"db": timings.durations.get("db", 0.0)}
+        durations.update(
+            (phase, timings.durations[phase])
+            for phase in self.phases
+            if phase in timings.durations
+        )
+        metrics = [
+            f'db;dur={durations["db"] * 1000:.1f};desc="{timings.queries} queries"',
+            *(
+                f"{phase};dur={durations[phase] * 1000:.1f}"
+                for phase in self.phases
+                if phase in durations
+            ),
+            f"total;dur={total * 1000:.1f}",
+        ]
+        if response.has_header("Server-Timing"):
+            metrics.insert(0, response["Server-Timing"])
+        response["Server-Timing"] = ", ".join(metrics)
+
+        repeated = timings.repeated_statements(
+            settings.SERVER_TIMING_REPEATED_QUERY_THRESHOLD
+        )
+        match = request.resolver_match
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "route": match.view_name if match is not None else None,
+            "status": response.status_code,
+            "queries": timings.queries,
+            **{
+                f"{phase}_ms": round(value * 1000, 3)
+                for phase, value in durations.items()
+            },
+            "total_ms": round(total * 1000, 3),
+            "repeated_queries": [
+                {"sql": sql[: self.max_statement_length], "count": count}
+                for sql, count in repeated
+            ],
+        }
+        logger.log(
+            logging.WARNING if repeated else logging.INFO,
+            "%s",
+            json.dumps(record),
+            extra={"timings": record},
+        )
+        return response
+
+
+class MetricsMiddleware:
+    """Records the Prometheus metrics of every request, see `task_manager.metrics`.
+
+    Requests are labelled by the name of their route, e.g. `task-list`, so
+    that ids in paths do not multiply the series. API errors are counted by
+    the `error_code` of their payload, whether it was produced by the
+    exception handler or served from the task cache.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    # Methods recorded under their name, the others under "other".
+    methods = frozenset(
+        ("GET", "HEAD", "OPTIONS", "POST", "PUT", "PATCH", "DELETE", "TRACE")
+    )
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = asgiref.sync.iscoroutinefunction(get_response)
+        if self.is_async:
+            asgiref.sync.markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        started = self.start()
+        response = self.get_response(request)
+        self.record(request, response, started)
+        return response
+
+    async def __acall__(self, request):
+        started = self.start()
+        response = await self.get_response(request)
+        self.record(request, response, started)
+        return response
+
+    def start(self) -> float:
+        """Make sure the queries are recorded and return the start time."""
+        # Connections opened before this module was loaded missed the
+        # `connection_created` receiver of the metrics module.
+        for connection in connections.all():
+            metrics.install(connection)
+        return time.perf_counter()
+
+    def record(self, request, response, started: float) -> None:
+        """Record the latency and the outcome of a request."""
+        elapsed = time.perf_counter() - started
+        match = request.resolver_match
+        route = match.view_name if match is not None else "unmatched"
+        method = request.method if request.method in self.methods else "other"
+        metrics.request_duration(route, method).observe(elapsed)
+        metrics.requests(route, method, response.status_code).inc()
+        data = getattr(response, "data", None)
+        if (
+            response.status_code >= 400
+            and isinstance(data, dict)
+            and isinstance(data.get("error_code"), str)
+        ):
+            metrics.api_errors(data["error_code"]).inc()
+
+
+class CompressionMiddleware:
+    """Compresses responses with the encoding the client accepts best.
+
+    The encoding is picked from `Accept-Encoding` among
+    `RESPONSE_COMPRESSION_ENCODINGS`, see `task_manager.compression`. Bodies
+    smaller than `RESPONSE_COMPRESSION_MIN_SIZE`, or that would not shrink,
+    are sent as they are. Streamed bodies, e.g. exports, are compressed as
+    they are sent and flushed every `RESPONSE_COMPRESSION_STREAM_FLUSH_SIZE`
+    bytes, never buffered whole.
+
+    Event streams are left alone: proxies and browsers would hold events
+    back until enough compressed data arrives.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    # Media types never compressed.
+    excluded_media_types = frozenset(("text/event-stream",))
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = asgiref.sync.iscoroutinefunction(get_response)
+        if self.is_async:
+            asgiref.sync.markcoroutinefunction(self)
+        self.codecs = compression.get_codecs()
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.process_response(request, await self.get_response(request))
+
+    def is_compressible(self, response) -> bool:
+        """Return whether the body of a response may be compressed."""
+        media_type = response.get("Content-Type", "").partition(";")[0].strip()
+        if (
+            not self.codecs
+            or response.has_header("Content-Encoding")
+            or response.has_header("Content-Range")
+            or media_type.lower() in self.excluded_media_types
+        ):
+            return False
+        min_size = settings.RESPONSE_COMPRESSION_MIN_SIZE
+        if not response.streaming:
+            return len(response.content) >= min_size
+        # File responses know their size.
+        length = response.get("Content-Length")
+        return length is None or not length.isdigit() or int(length) >= min_size
+
+    def process_response(self, request, response):
+        """Compress the body with the negotiated encoding, if any."""
+        if not self.is_compressible(response):
+            return response
+        # Caches must tell apart the encodings of the same url.
+        cache_utils.patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = compression.negotiate(
+            request.META.get("HTTP_ACCEPT_ENCODING", ""), self.codecs
+        )
+        if encoding is None:
+            return response
+        codec = self.codecs[encoding]
+
+        if response.streaming:
+            response.streaming_content = self.compress_stream(
+                response.streaming_content, codec, response.is_async
+            )
+            # The compressed size is only known once the stream is sent.
+            del response.headers["Content-Length"]
+        else:
+            compressed = codec.compress(response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        # A strong ETag identifies the bytes of the body, weaken it so that
+        # it still matches the conditional requests of the other encodings
+        # (RFC 9110 section 8.8.1).
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = f"W/{etag}"
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+    def compress_stream(self, chunks, codec: compression.Codec, is_async: bool):
+        """Compress a streamed body chunk by chunk, with the same iteration kind."""
+        flush_size = settings.RESPONSE_COMPRESSION_STREAM_FLUSH_SIZE
+        if is_async:
+
+            async def compress_async():
+                stream = codec.stream(flush_size)
+                async for chunk in chunks:
+                    if data := stream.compress(chunk):
+                        yield data
+                yield stream.finish()
+
+            return compress_async()
+
+        def compress():
+            stream = codec.stream(flush_size)
+            for chunk in chunks:
+                if data := stream.compress(chunk):
+                    yield data
+            yield stream.finish()
+
+        return compress()
@@ -0,0 +1,47 @@
+"""This module contains the OpenAPI schema generator of the project.
+
+It is only loaded to generate the schema, see `task_manager.schema`, so the
+views of the API are annotated here rather than where they are defined.
+"""
+
+import functools
+import threading
+
+from drf_spectacular import generators as spectacular_generators
+from drf_spectacular import types as spectacular_types
+from drf_spectacular import utils as spectacular_utils
+
+from task_manager import views
+from tasks import openapi as tasks_openapi
+
+_lock = threading.Lock()
+
+
+@functools.cache
+def _annotate_views() -> None:
+    spectacular_utils.extend_schema_view(
+        get=spectacular_utils.extend_schema(
+            responses=spectacular_types.OpenApiTypes.OBJECT
+        )
+    )(views.DatabaseStatsView)
+    tasks_openapi.annotate_views()
+
+
+def annotate_views() -> None:
+    """Attach the OpenAPI annotations to the views of all the apps, once per process."""
+    # The annotations replace methods of the view classes, which must not
+    # happen twice when requests generate the schema concurrently.
+    with _lock:
+        _annotate_views()
+
+
+class SchemaGenerator(spectacular_generators.SchemaGenerator):
+    """Generates the schema of the views once their annotations are attached.
+
+    Set as the `DEFAULT_GENERATOR_CLASS` of drf_spectacular, so that
+    `manage.py spectacular` and the deploy checks see the annotations too.
+    """
+
+    def get_schema(self, request=None, public=False) -> dict:
+        annotate_views()
+        return super().get_schema(request=request, public=public)
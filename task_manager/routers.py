@@ -0,0 +1,65 @@
+"""This module contains the database router sending task reads to replicas."""
+
+import contextlib
+import contextvars
+import random
+from collections import abc
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db import connections
+
+# Whether the queries of the current request must all go to the primary.
+_pinned_to_primary: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "pinned_to_primary", default=False
+)
+
+
+@contextlib.contextmanager
+def pinned_to_primary(pinned: bool = True) -> abc.Iterator[None]:
+    """Send the reads made in the block to the primary database."""
+    token = _pinned_to_primary.set(pinned)
+    try:
+        yield
+    finally:
+        _pinned_to_primary.reset(token)
+
+
+def is_pinned_to_primary() -> bool:
+    """Return whether the reads made now must go to the primary database."""
+    return _pinned_to_primary.get()
+
+
+class PrimaryReplicaRouter:
+    """Sends the reads of the routed apps to a replica, and writes to the primary.
+
+    Reads stay on the primary when they are pinned to it, see
+    `pinned_to_primary()`, and inside transactions of the primary, which may
+    lock rows or read their own writes. The replicas are the aliases of the
+    `DATABASE_REPLICAS` setting.
+    """
+
+    route_app_labels = {"tasks"}
+
+    def db_for_read(self, model, **hints) -> str | None:
+        """Return a replica for the reads of the routed apps, when allowed."""
+        if (
+            not settings.DATABASE_REPLICAS
+            or model._meta.app_label not in self.route_app_labels
+            or _pinned_to_primary.get()
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return None
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints) -> str:
+        """Return the primary."""
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints) -> bool:
+        """Allow relations across databases, which all hold the same data."""
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints) -> bool:
+        """Only migrate the primary, replicas follow it."""
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,98 @@
+"""This module builds the OpenAPI schema served by `SchemaView`, once per process.
+
+The schema is read from `API_SCHEMA_FILE` when `manage.py build_api_schema`
+wrote it, e.g. at deploy time, and generated at the first request otherwise.
+Both of its renderings are kept with their ETag, so later requests are
+answered without generating nor serializing anything.
+
+drf_spectacular is only imported here when the schema is built, so that
+processes never asked for it do not load it.
+"""
+
+import dataclasses
+import hashlib
+import json
+import logging
+import threading
+
+from django.conf import settings
+from django.utils import http as http_utils
+
+logger = logging.getLogger(__name__)
+
+# The media type of each format of the schema.
+MEDIA_TYPES = {
+    "yaml": "application/vnd.oai.openapi",
+    "json": "application/vnd.oai.openapi+json",
+}
+
+_documents: dict[str, "SchemaDocument"] = {}
+_lock = threading.Lock()
+
+
+@dataclasses.dataclass(frozen=True)
+class SchemaDocument:
+    """A rendering of the schema, ready to be sent."""
+
+    content: bytes
+    content_type: str
+    etag: str
+
+
+def generate_schema() -> dict:
+    """Generate the schema of the API views, see `task_manager.openapi`."""
+    from drf_spectacular.settings import spectacular_settings
+
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    return generator.get_schema(request=None, public=True)
+
+
+def render_schema(schema: dict, format: str) -> bytes:
+    """Render the schema in one of the `MEDIA_TYPES` formats."""
+    from drf_spectacular import renderers as spectacular_renderers
+
+    renderer = (
+        spectacular_renderers.OpenApiJsonRenderer()
+        if format == "json"
+        else spectacular_renderers.OpenApiYamlRenderer()
+    )
+    return renderer.render(schema, renderer_context={})
+
+
+def load_schema() -> dict:
+    """Return the schema written to `API_SCHEMA_FILE`, or generate it."""
+    if settings.API_SCHEMA_FILE:
+        try:
+            with open(settings.API_SCHEMA_FILE, "rb") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            logger.warning(
+                "%s is missing, generating the schema instead.",
+                settings.API_SCHEMA_FILE,
+            )
+    return generate_schema()
+
+
+def get_document(format: str) -> SchemaDocument:
+    """Return the schema rendered in a format, building it on first use.
+
+    Args:
+        format (str): One of the `MEDIA_TYPES` formats.
+    """
+    document = _documents.get(format)
+    if document is None:
+        # Concurrent first requests wait for a single build.
+        with _lock:
+            if not _documents:
+                schema = load_schema()
+                for name, media_type in MEDIA_TYPES.items():
+                    content = render_schema(schema, name)
+                    _documents[name] = SchemaDocument(
+                        content=content,
+                        content_type=media_type,
+                        etag=http_utils.quote_etag(
+                            hashlib.blake2b(content, digest_size=16).hexdigest()
+                        ),
+                    )
+            document = _documents[format]
+    return document
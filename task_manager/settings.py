@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import copy
 import os
 from pathlib import Path
 
@@ -38,16 +39,15 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # apps
     "tasks.apps.TasksConfig",
     # Third-party apps
     "rest_framework",
     "corsheaders",
-    "drf_spectacular",
 ]
 
 REST_FRAMEWORK = {
-    "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "EXCEPTION_HANDLER": "task_manager.exceptions_handler.handle_exception",
 }
 
@@ -55,11 +55,38 @@ SPECTACULAR_SETTINGS = {
     "TITLE": "Task Manager API",
     "DESCRIPTION": "API documentation for the Task Manager project",
     "VERSION": "1.0.0",
+    # Annotates the views before generating their schema, see task_manager.openapi.
+    "DEFAULT_GENERATOR_CLASS": "task_manager.openapi.SchemaGenerator",
 }
 
+# API documentation
+# The OpenAPI schema served by GET /api/v1/schema/ and its Swagger UI and
+# Redoc pages, see task_manager.schema.
+
+# Whether to serve the schema and the documentation pages. Processes serving
+# the API only can turn them off, so that they never load drf_spectacular:
+# routers resolve DEFAULT_SCHEMA_CLASS as soon as they list the actions of
+# the view sets.
+API_DOCS_ENABLED = os.getenv("API_DOCS_ENABLED", "true").lower() == "true"
+if API_DOCS_ENABLED:
+    # Provides the templates of the documentation pages.
+    INSTALLED_APPS.append("drf_spectacular")
+    REST_FRAMEWORK["DEFAULT_SCHEMA_CLASS"] = "drf_spectacular.openapi.AutoSchema"
+# JSON file written by `manage.py build_api_schema` and served as the schema.
+# Empty, or while the file is missing, the schema is generated at the first
+# request of each process.
+API_SCHEMA_FILE = os.getenv("API_SCHEMA_FILE", "")
+# Seconds clients and shared caches may reuse the schema before
+# revalidating it with its ETag.
+API_SCHEMA_MAX_AGE = int(os.getenv("API_SCHEMA_MAX_AGE", "3600"))
+
 MIDDLEWARE = [
+    "task_manager.middleware.MetricsMiddleware",
+    "task_manager.middleware.ServerTimingMiddleware",
+    "task_manager.middleware.CompressionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "task_manager.middleware.ReplicaStickinessMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -68,7 +95,8 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
-ROOT_URLCONF = "task_manager.urls"
+# task_manager.asgi serves the Task CRUD endpoints with async views.
+ROOT_URLCONF = os.getenv("DJANGO_ROOT_URLCONF", "task_manager.urls")
 
 TEMPLATES = [
     {
@@ -91,6 +119,10 @@ WSGI_APPLICATION = "task_manager.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Each process takes its connections from a psycopg pool, or keeps one open
+# between requests for CONN_MAX_AGE seconds when the pool is disabled.
+POSTGRES_POOL = os.getenv("POSTGRES_POOL", "true").lower() == "true"
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -99,9 +131,185 @@ DATABASES = {
         "PASSWORD": os.getenv("POSTGRES_PASSWORD", "root"),
         "HOST": os.getenv("POSTGRES_HOST", "localhost"),
         "PORT": os.getenv("POSTGRES_PORT", "5432"),
+        # Pooled connections cannot be persistent.
+        "CONN_MAX_AGE": (
+            0 if POSTGRES_POOL else int(os.getenv("POSTGRES_CONN_MAX_AGE", "60"))
+        ),
+        # Check that a reused connection is alive before handing it out.
+        "CONN_HEALTH_CHECKS": (
+            os.getenv("POSTGRES_CONN_HEALTH_CHECKS", "true").lower() == "true"
+        ),
+        # See https://www.psycopg.org/psycopg3/docs/api/pool.html
+        "OPTIONS": (
+            {
+                "pool": {
+                    "min_size": int(os.getenv("POSTGRES_POOL_MIN_SIZE", "2")),
+                    "max_size": int(os.getenv("POSTGRES_POOL_MAX_SIZE", "10")),
+                    # Seconds after which connections are replaced.
+                    "max_lifetime": float(
+                        os.getenv("POSTGRES_POOL_MAX_LIFETIME", "1800")
+                    ),
+                    # Seconds a request waits for a connection before failing.
+                    "timeout": float(os.getenv("POSTGRES_POOL_TIMEOUT", "10")),
+                }
+            }
+            if POSTGRES_POOL
+            else {}
+        ),
     }
 }
 
+# Read replicas of the default database, as comma-separated host[:port].
+# They get the other settings of the default database.
+for _index, _replica in enumerate(
+    filter(None, os.getenv("POSTGRES_REPLICAS", "").split(",")), start=1
+):
+    _host, _, _port = _replica.strip().partition(":")
+    DATABASES[f"replica_{_index}"] = {
+        **copy.deepcopy(DATABASES["default"]),
+        "HOST": _host,
+        "PORT": _port or DATABASES["default"]["PORT"],
+        # Tests read the replicas from the test default database.
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias.startswith("replica_")]
+
+DATABASE_ROUTERS = ["task_manager.routers.PrimaryReplicaRouter"]
+
+# Seconds during which the reads of a client that wrote go to the primary.
+DATABASE_REPLICA_STICKINESS = int(os.getenv("POSTGRES_REPLICA_STICKINESS", "5"))
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+TASKS_CACHE_BACKEND = os.getenv(
+    "TASKS_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+)
+TASKS_CACHE_MAX_ENTRIES = int(os.getenv("TASKS_CACHE_MAX_ENTRIES", "10000"))
+# Lifetime in seconds of the entries remembering that a task id does not exist.
+TASKS_CACHE_MISSING_TIMEOUT = int(os.getenv("TASKS_CACHE_MISSING_TIMEOUT", "30"))
+# Whether a process with a local (LocMemCache) backend listens for the task
+# writes of the other processes to drop their entries, see tasks/cache.py.
+# Without it, set a backend shared by all the processes writing tasks.
+TASKS_CACHE_LISTEN = os.getenv("TASKS_CACHE_LISTEN", "true").lower() == "true"
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # Serialized task payloads, see tasks/cache.py.
+    "tasks": {
+        "BACKEND": TASKS_CACHE_BACKEND,
+        "LOCATION": os.getenv("TASKS_CACHE_LOCATION", "tasks"),
+        "TIMEOUT": int(os.getenv("TASKS_CACHE_TIMEOUT", "300")),
+        # Bump when the serialized payload of a task changes.
+        "VERSION": 1,
+        # LocMemCache keeps its entries in LRU order, culling a single entry
+        # at a time makes it a bounded LRU cache.
+        "OPTIONS": (
+            {
+                "MAX_ENTRIES": TASKS_CACHE_MAX_ENTRIES,
+                "CULL_FREQUENCY": TASKS_CACHE_MAX_ENTRIES,
+            }
+            if TASKS_CACHE_BACKEND == "django.core.cache.backends.locmem.LocMemCache"
+            else {}
+        ),
+    },
+}
+
+
+# Pagination
+
+# Number of rows above which task listings report the planner's row estimate
+# instead of running an exact COUNT(*).
+TASKS_COUNT_ESTIMATE_THRESHOLD = int(
+    os.getenv("TASKS_COUNT_ESTIMATE_THRESHOLD", "100000")
+)
+
+
+# Change feed
+# Served by GET /api/v1/tasks/changes, see tasks.changes.
+
+# Seconds the change feed stays behind the present. Tasks are stamped when
+# they are written, not when their transaction commits, so a change may
+# become visible after later ones: the feed waits for it instead of letting
+# clients sync past it.
+TASKS_CHANGES_SETTLE_SECONDS = float(os.getenv("TASKS_CHANGES_SETTLE_SECONDS", "5"))
+# Days the tombstones of deleted tasks are kept. Clients that last synced
+# earlier must sync again from scratch.
+TASKS_TOMBSTONE_RETENTION_DAYS = int(os.getenv("TASKS_TOMBSTONE_RETENTION_DAYS", "30"))
+
+
+# Live events
+# Served over ASGI by GET /api/v1/tasks/events, see tasks.events.
+
+# Seconds between the keep-alive comments of idle event streams.
+TASKS_EVENTS_HEARTBEAT_SECONDS = float(
+    os.getenv("TASKS_EVENTS_HEARTBEAT_SECONDS", "15")
+)
+# Events buffered for a client reading slowly, before it is told to resync.
+TASKS_EVENTS_QUEUE_SIZE = int(os.getenv("TASKS_EVENTS_QUEUE_SIZE", "1000"))
+
+
+# Background jobs
+# Queued by POST /api/v1/jobs and run by `manage.py run_task_workers`, see
+# tasks.jobs.
+
+# Number of worker processes, hence of jobs running at once.
+TASKS_JOBS_WORKERS = int(os.getenv("TASKS_JOBS_WORKERS", "2"))
+# Seconds between two looks for jobs while the queue is empty.
+TASKS_JOBS_POLL_SECONDS = float(os.getenv("TASKS_JOBS_POLL_SECONDS", "1"))
+# Seconds a job stays claimed without reporting progress before its worker
+# is deemed lost and another worker claims it.
+TASKS_JOBS_LEASE_SECONDS = int(os.getenv("TASKS_JOBS_LEASE_SECONDS", "300"))
+# Claims of a job whose workers are lost before it is failed.
+TASKS_JOBS_MAX_ATTEMPTS = int(os.getenv("TASKS_JOBS_MAX_ATTEMPTS", "3"))
+
+
+# Server-Timing
+# Requests timed by task_manager.middleware.ServerTimingMiddleware.
+
+# Share of the requests timed, from 0 to 1.
+SERVER_TIMING_SAMPLE_RATE = float(
+    os.getenv("SERVER_TIMING_SAMPLE_RATE", "1" if DEBUG else "0.01")
+)
+# Number of runs of the same SQL statement in a request flagged as an N+1 query.
+SERVER_TIMING_REPEATED_QUERY_THRESHOLD = int(
+    os.getenv("SERVER_TIMING_REPEATED_QUERY_THRESHOLD", "5")
+)
+
+
+# Response compression
+# Applied by task_manager.middleware.CompressionMiddleware.
+
+# Encodings offered to clients, preferred first among those they accept
+# equally: comma-separated among zstd, br and gzip, empty to disable.
+RESPONSE_COMPRESSION_ENCODINGS = [
+    encoding.strip()
+    for encoding in os.getenv("RESPONSE_COMPRESSION_ENCODINGS", "zstd,br,gzip").split(
+        ","
+    )
+    if encoding.strip()
+]
+# Compression level of each encoding. Responses are compressed as they are
+# sent, so the defaults favour speed over size.
+RESPONSE_COMPRESSION_LEVELS = {
+    "zstd": int(os.getenv("RESPONSE_COMPRESSION_ZSTD_LEVEL", "3")),
+    "br": int(os.getenv("RESPONSE_COMPRESSION_BR_LEVEL", "4")),
+    "gzip": int(os.getenv("RESPONSE_COMPRESSION_GZIP_LEVEL", "6")),
+}
+# Size in bytes under which bodies are sent as they are. Streamed bodies of
+# unknown size are always compressed.
+RESPONSE_COMPRESSION_MIN_SIZE = int(os.getenv("RESPONSE_COMPRESSION_MIN_SIZE", "1024"))
+# Bytes of a streamed body compressed between two flushes to the client.
+# Each flush ends a compressed block: flushing small chunks one by one makes
+# the body and the compression cost grow several times.
+RESPONSE_COMPRESSION_STREAM_FLUSH_SIZE = int(
+    os.getenv("RESPONSE_COMPRESSION_STREAM_FLUSH_SIZE", "32768")
+)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -139,6 +347,11 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 
+# Files written by the application, e.g. the exports of background jobs.
+# https://docs.djangoproject.com/en/5.2/ref/settings/#media-root
+
+MEDIA_ROOT = os.getenv("MEDIA_ROOT", BASE_DIR / "media")
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
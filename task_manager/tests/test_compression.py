@@ -0,0 +1,86 @@
+"""Unit tests for compression.py."""
+
+import gzip
+
+import brotli
+import pytest
+import zstandard
+
+from task_manager import compression
+
+ENCODINGS = ["zstd", "br", "gzip"]
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        ("gzip, deflate, br, zstd", "zstd"),
+        ("gzip;q=1.0, br;q=0.5", "gzip"),
+        ("GZIP", "gzip"),
+        ("*", "zstd"),
+        ("*;q=0.5, br", "br"),
+        ("zstd;q=0, *", "br"),
+        ("gzip;q=invalid", None),
+        ("deflate", None),
+        ("", None),
+    ],
+)
+def testNegotiate_whenEncodingsAccepted_returnsBestOne(
+    accept_encoding, expected
+) -> None:
+    assert compression.negotiate(accept_encoding, ENCODINGS) == expected
+
+
+@pytest.mark.parametrize(
+    "codec, decompress",
+    [
+        (compression.GzipCodec(6), gzip.decompress),
+        (compression.BrotliCodec(4), brotli.decompress),
+        (
+            compression.ZstdCodec(3),
+            lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data),
+        ),
+    ],
+)
+def testCodec_whenBodyCompressedWholeOrStreamed_decompressesToBody(
+    codec, decompress
+) -> None:
+    body = b"Task description. " * 1000
+    stream = codec.stream()
+    streamed = b"".join(
+        stream.compress(body[i : i + 500]) for i in range(0, len(body), 500)
+    )
+
+    assert decompress(codec.compress(body)) == body
+    assert decompress(streamed + stream.finish()) == body
+
+
+@pytest.mark.parametrize(
+    "codec, decompress",
+    [
+        (compression.GzipCodec(6), gzip.decompress),
+        (compression.BrotliCodec(4), brotli.decompress),
+        (
+            compression.ZstdCodec(3),
+            lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data),
+        ),
+    ],
+)
+def testStreamCompressor_whenChunksSmall_flushesEveryFlushSize(
+    codec, decompress
+) -> None:
+    rows = [
+        b'{"id":%d,"title":"Task %d","description":"A description."}\n' % (i, i)
+        for i in range(2000)
+    ]
+
+    def stream_compress(flush_size: int) -> list[bytes]:
+        stream = codec.stream(flush_size)
+        return [stream.compress(row) for row in rows] + [stream.finish()]
+
+    each_row = stream_compress(0)
+    batched = stream_compress(32768)
+
+    assert decompress(b"".join(batched)) == b"".join(rows)
+    assert sum(map(bool, batched)) < len(rows) / 100
+    assert len(b"".join(batched)) * 2 < len(b"".join(each_row))
@@ -0,0 +1,36 @@
+"""Unit tests for database.py."""
+
+import json
+from unittest import mock
+
+import pytest
+from django.db import connections
+from django.urls import reverse
+from rest_framework import status
+
+from task_manager import database
+
+
+@pytest.mark.django_db
+def testDatabaseStatsView_whenPoolConfigured_returnsPoolStats(client) -> None:
+    response = client.get(reverse("database-stats"))
+
+    assert response.status_code == status.HTTP_200_OK
+    stats = json.loads(response.content)["default"]
+    assert stats["vendor"] == "postgresql"
+    assert stats["conn_max_age"] == 0
+    pool_options = connections["default"].settings_dict["OPTIONS"]["pool"]
+    assert stats["pool"]["pool_min"] == pool_options["min_size"]
+    assert stats["pool"]["pool_max"] == pool_options["max_size"]
+    assert stats["pool"]["pool_size"] >= 1
+
+
+def testConnectionStats_whenNoPool_returnsPersistentConnectionSettings() -> None:
+    with mock.patch.object(
+        type(connections["default"]), "pool", new_callable=mock.PropertyMock
+    ) as pool:
+        pool.return_value = None
+        stats = database.connection_stats("default")
+
+    assert stats["pool"] is None
+    assert stats["conn_health_checks"] is True
@@ -0,0 +1,79 @@
+"""Unit tests for the Prometheus metrics of the project."""
+
+import prometheus_client
+import pytest
+from django.urls import reverse
+
+from tasks import models as tasks_models
+
+
+def sample(name: str, **labels) -> float:
+    value = prometheus_client.REGISTRY.get_sample_value(f"task_manager_{name}", labels)
+    return value or 0.0
+
+
+@pytest.mark.django_db
+def testMetricsMiddleware_whenTaskRetrieved_recordsRouteQueriesAndCacheLookups(
+    client,
+) -> None:
+    task = tasks_models.Task.objects.create(title="Task", description="")
+    route = {"route": "task-detail", "method": "GET"}
+    before = {
+        "requests": sample("http_requests_total", **route, status="200"),
+        "latency": sample("http_request_duration_seconds_count", **route),
+        "queries": sample("db_query_duration_seconds_count", database="default"),
+        "misses": sample("task_cache_lookups_total", result="miss"),
+        "hits": sample("task_cache_lookups_total", result="hit"),
+    }
+
+    client.get(reverse("task-detail", args=[task.id]))
+    client.get(reverse("task-detail", args=[task.id]))
+
+    assert (
+        sample("http_requests_total", **route, status="200") == before["requests"] + 2
+    )
+    assert sample("http_request_duration_seconds_count", **route) == (
+        before["latency"] + 2
+    )
+    assert sample("db_query_duration_seconds_count", database="default") == (
+        before["queries"] + 1
+    )
+    assert sample("task_cache_lookups_total", result="miss") == before["misses"] + 1
+    assert sample("task_cache_lookups_total", result="hit") == before["hits"] + 1
+
+
+@pytest.mark.django_db
+def testMetricsMiddleware_whenApiErrorAnswered_countsItsErrorCode(client) -> None:
+    before = sample("api_errors_total", error_code="task_not_found")
+
+    client.get(reverse("task-detail", args=[404]))
+    # Served from the negative cache, without the exception handler.
+    client.get(reverse("task-detail", args=[404]))
+
+    assert sample("api_errors_total", error_code="task_not_found") == before + 2
+
+
+@pytest.mark.django_db
+def testMetricsMiddleware_whenMethodUnknown_recordsItAsOther(client) -> None:
+    before = sample(
+        "http_requests_total", route="task-list", method="other", status="400"
+    )
+
+    client.generic("BREW", reverse("task-list"))
+
+    assert sample(
+        "http_requests_total", route="task-list", method="other", status="400"
+    ) == (before + 1)
+
+
+@pytest.mark.django_db
+def testMetricsView_whenScraped_returnsPrometheusTextFormat(client) -> None:
+    client.get(reverse("task-list"))
+
+    response = client.get(reverse("metrics"))
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == prometheus_client.CONTENT_TYPE_LATEST
+    assert b'task_manager_http_requests_total{method="GET",route="task-list"' in (
+        response.content
+    )
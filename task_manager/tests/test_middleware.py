@@ -0,0 +1,271 @@
+"""Unit tests for middleware.py."""
+
+import gzip
+import json
+import logging
+
+import brotli
+import pytest
+import zstandard
+from asgiref import sync
+from django import db
+from django import http
+from django import test
+
+from task_manager import metrics
+from task_manager import middleware
+from task_manager import routers
+from task_manager import timing
+from tasks import models as tasks_models
+
+
+def pinned_response(request) -> http.HttpResponse:
+    return http.HttpResponse(str(routers._pinned_to_primary.get()))
+
+
+async def async_pinned_response(request) -> http.HttpResponse:
+    return pinned_response(request)
+
+
+def testReplicaStickinessMiddleware_whenClientWrites_pinsItsNextReads(
+    settings,
+) -> None:
+    settings.DATABASE_REPLICAS = ["replica_1"]
+    settings.DATABASE_REPLICA_STICKINESS = 7
+    factory = test.RequestFactory()
+    sticky = middleware.ReplicaStickinessMiddleware(pinned_response)
+
+    write = sticky(factory.post("/api/v1/tasks"))
+    factory.cookies[middleware.STICKY_COOKIE] = "1"
+    sticky_read = sticky(factory.get("/api/v1/tasks"))
+
+    assert write.content == b"True"
+    assert write.cookies[middleware.STICKY_COOKIE]["max-age"] == 7
+    assert sticky_read.content == b"True"
+    assert middleware.STICKY_COOKIE not in sticky_read.cookies
+
+
+def testReplicaStickinessMiddleware_whenClientOnlyReads_doesNotPinReads(
+    settings,
+) -> None:
+    settings.DATABASE_REPLICAS = ["replica_1"]
+    sticky = middleware.ReplicaStickinessMiddleware(pinned_response)
+
+    response = sticky(test.RequestFactory().get("/api/v1/tasks"))
+
+    assert response.content == b"False"
+    assert middleware.STICKY_COOKIE not in response.cookies
+
+
+def testReplicaStickinessMiddleware_whenServedAsync_pinsWrites(settings) -> None:
+    settings.DATABASE_REPLICAS = ["replica_1"]
+    sticky = middleware.ReplicaStickinessMiddleware(async_pinned_response)
+
+    response = sync.async_to_sync(sticky)(test.AsyncRequestFactory().delete("/"))
+
+    assert response.content == b"True"
+    assert middleware.STICKY_COOKIE in response.cookies
+
+
+def task_lookups_response(request) -> http.HttpResponse:
+    for task_id in range(6):
+        tasks_models.Task.objects.filter(pk=task_id).exists()
+    return http.HttpResponse()
+
+
+async def async_task_lookups_response(request) -> http.HttpResponse:
+    for task_id in range(2):
+        await tasks_models.Task.objects.filter(pk=task_id).aexists()
+    return http.HttpResponse()
+
+
+@pytest.mark.django_db
+def testServerTimingMiddleware_whenQueryRepeated_flagsProbableNPlusOne(
+    settings, caplog
+) -> None:
+    settings.SERVER_TIMING_SAMPLE_RATE = 1
+    settings.SERVER_TIMING_REPEATED_QUERY_THRESHOLD = 5
+    timed = middleware.ServerTimingMiddleware(task_lookups_response)
+
+    with caplog.at_level(logging.INFO, logger="task_manager.middleware"):
+        response = timed(test.RequestFactory().get("/api/v1/tasks"))
+
+    assert response["Server-Timing"].startswith("db;dur=")
+    assert 'desc="6 queries"' in response["Server-Timing"]
+    assert "total;dur=" in response["Server-Timing"]
+    (log,) = caplog.records
+    record = json.loads(log.getMessage())
+    assert log.levelno == logging.WARNING
+    assert record["queries"] == 6
+    assert [item["count"] for item in record["repeated_queries"]] == [6]
+    assert record["repeated_queries"][0]["sql"].startswith("SELECT")
+
+
+def testServerTimingMiddleware_whenRequestNotSampled_addsNothing(settings) -> None:
+    settings.SERVER_TIMING_SAMPLE_RATE = 0
+    timed = middleware.ServerTimingMiddleware(pinned_response)
+
+    response = timed(test.RequestFactory().get("/"))
+
+    assert not response.has_header("Server-Timing")
+
+
+@pytest.mark.django_db
+def testServerTimingMiddleware_whenServedAsync_countsAsyncQueries(settings) -> None:
+    settings.SERVER_TIMING_SAMPLE_RATE = 1
+    timed = middleware.ServerTimingMiddleware(async_task_lookups_response)
+
+    response = sync.async_to_sync(timed)(test.AsyncRequestFactory().get("/"))
+
+    assert 'desc="2 queries"' in response["Server-Timing"]
+
+
+@pytest.mark.django_db
+def testServerTimingMiddleware_whenTasksListed_timesSerializationAndRendering(
+    client, settings
+) -> None:
+    settings.SERVER_TIMING_SAMPLE_RATE = 1
+    task = tasks_models.Task.objects.create(title="Task", description="")
+
+    response = client.get(f"/api/v1/tasks/{task.id}")
+
+    metrics = [metric.split(";")[0] for metric in response["Server-Timing"].split(", ")]
+    assert metrics == ["db", "serialize", "render", "total"]
+
+
+BODY = b'{"title":"Task","description":"A long description."}' * 100
+
+
+def large_response(request) -> http.HttpResponse:
+    response = http.HttpResponse(BODY, content_type="application/json")
+    response["ETag"] = '"1-2-json"'
+    return response
+
+
+def testCompressionMiddleware_whenClientAcceptsSeveral_usesPreferredEncoding() -> None:
+    compress = middleware.CompressionMiddleware(large_response)
+    request = test.RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip, br;q=0.9")
+
+    response = compress(request)
+
+    assert response["Content-Encoding"] == "gzip"
+    assert response["Vary"] == "Accept-Encoding"
+    assert response["ETag"] == 'W/"1-2-json"'
+    assert response["Content-Length"] == str(len(response.content))
+    assert gzip.decompress(response.content) == BODY
+
+
+@pytest.mark.parametrize("accept_encoding", ["", "identity", "gzip;q=0", "compress"])
+def testCompressionMiddleware_whenNoEncodingAccepted_sendsBodyAsIs(
+    accept_encoding,
+) -> None:
+    compress = middleware.CompressionMiddleware(large_response)
+    request = test.RequestFactory().get("/", HTTP_ACCEPT_ENCODING=accept_encoding)
+
+    response = compress(request)
+
+    assert not response.has_header("Content-Encoding")
+    assert response["Vary"] == "Accept-Encoding"
+    assert response.content == BODY
+
+
+def testCompressionMiddleware_whenBodySmall_sendsBodyAsIs(settings) -> None:
+    settings.RESPONSE_COMPRESSION_MIN_SIZE = len(BODY) + 1
+    compress = middleware.CompressionMiddleware(large_response)
+    request = test.RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip")
+
+    response = compress(request)
+
+    assert not response.has_header("Content-Encoding")
+    assert response.content == BODY
+
+
+def testCompressionMiddleware_whenStreaming_flushesChunksAsSent(settings) -> None:
+    settings.RESPONSE_COMPRESSION_STREAM_FLUSH_SIZE = len(BODY)
+    sent = []
+
+    def chunks():
+        for index in range(3):
+            sent.append(index)
+            yield BODY
+
+    compress = middleware.CompressionMiddleware(
+        lambda request: http.StreamingHttpResponse(chunks())
+    )
+    request = test.RequestFactory().get("/", HTTP_ACCEPT_ENCODING="zstd")
+
+    response = compress(request)
+    stream = iter(response.streaming_content)
+    decompressor = zstandard.ZstdDecompressor().decompressobj()
+    first = decompressor.decompress(next(stream))
+    body = first + b"".join(decompressor.decompress(chunk) for chunk in stream)
+
+    assert response["Content-Encoding"] == "zstd"
+    assert not response.has_header("Content-Length")
+    assert first == BODY
+    assert body == BODY * 3
+    assert sent == [0, 1, 2]
+
+
+def testCompressionMiddleware_whenStreamingAsync_compressesChunks() -> None:
+    async def chunks():
+        for _ in range(3):
+            yield BODY
+
+    async def streaming_response(request) -> http.StreamingHttpResponse:
+        return http.StreamingHttpResponse(chunks())
+
+    async def read(response) -> bytes:
+        return b"".join([chunk async for chunk in response.streaming_content])
+
+    compress = middleware.CompressionMiddleware(streaming_response)
+    request = test.AsyncRequestFactory().get("/", headers={"Accept-Encoding": "br"})
+
+    response = sync.async_to_sync(compress)(request)
+
+    assert response["Content-Encoding"] == "br"
+    assert brotli.decompress(sync.async_to_sync(read)(response)) == BODY * 3
+
+
+def testCompressionMiddleware_whenEventStream_sendsEventsAsIs() -> None:
+    compress = middleware.CompressionMiddleware(
+        lambda request: http.StreamingHttpResponse(
+            iter([BODY]), content_type="text/event-stream; charset=utf-8"
+        )
+    )
+    request = test.RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip")
+
+    response = compress(request)
+
+    assert not response.has_header("Content-Encoding")
+    assert b"".join(response.streaming_content) == BODY
+
+
+@pytest.mark.django_db
+def testCompressionMiddleware_whenTasksExported_streamsCompressedExport(client) -> None:
+    tasks_models.Task.objects.bulk_create(
+        [tasks_models.Task(title=f"Task {i}", description="D" * 100) for i in range(50)]
+    )
+    url = "/api/v1/tasks/export"
+
+    plain = client.get(url)
+    compressed = client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+
+    assert compressed["Content-Encoding"] == "gzip"
+    body = gzip.decompress(b"".join(compressed.streaming_content))
+    assert body == b"".join(plain.streaming_content)
+
+
+@pytest.mark.parametrize("module", [timing, metrics])
+def testInstall_whenRunInsideExecuteWrapperBlock_outlivesOnlyTheBlock(
+    module, monkeypatch
+) -> None:
+    def wrapper(execute, sql, params, many, context):
+        return execute(sql, params, many, context)
+
+    monkeypatch.setattr(db.connection, "execute_wrappers", [])
+
+    with db.connection.execute_wrapper(wrapper):
+        module.install(db.connection)
+
+    assert db.connection.execute_wrappers == [module.record_query]
@@ -0,0 +1,53 @@
+"""Unit tests for routers.py."""
+
+from unittest import mock
+
+import pytest
+from django.contrib.auth import models as auth_models
+from django.db import connections
+
+from task_manager import routers
+from tasks import models as task_models
+
+
+@pytest.fixture
+def replicas(settings) -> list[str]:
+    settings.DATABASE_REPLICAS = ["replica_1", "replica_2"]
+    return settings.DATABASE_REPLICAS
+
+
+def testDbForRead_whenTaskRead_returnsReplica(replicas) -> None:
+    router = routers.PrimaryReplicaRouter()
+
+    assert router.db_for_read(task_models.Task) in replicas
+    assert router.db_for_write(task_models.Task) == "default"
+
+
+def testDbForRead_whenNoReplica_returnsNone(settings) -> None:
+    settings.DATABASE_REPLICAS = []
+
+    assert routers.PrimaryReplicaRouter().db_for_read(task_models.Task) is None
+
+
+def testDbForRead_whenModelOfAnotherApp_returnsNone(replicas) -> None:
+    assert routers.PrimaryReplicaRouter().db_for_read(auth_models.User) is None
+
+
+def testDbForRead_whenPinnedToPrimary_returnsNone(replicas) -> None:
+    router = routers.PrimaryReplicaRouter()
+
+    with routers.pinned_to_primary():
+        assert router.db_for_read(task_models.Task) is None
+    assert router.db_for_read(task_models.Task) in replicas
+
+
+def testDbForRead_whenInPrimaryTransaction_returnsNone(replicas) -> None:
+    with mock.patch.object(connections["default"], "in_atomic_block", True):
+        assert routers.PrimaryReplicaRouter().db_for_read(task_models.Task) is None
+
+
+def testAllowMigrate_whenReplica_returnsFalse() -> None:
+    router = routers.PrimaryReplicaRouter()
+
+    assert router.allow_migrate("default", "tasks")
+    assert not router.allow_migrate("replica_1", "tasks")
@@ -0,0 +1,92 @@
+"""Unit tests for the OpenAPI schema and its lazy loading."""
+
+import io
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from django.conf import settings as django_settings
+from django.core import management
+from django.urls import reverse
+
+from task_manager import schema
+
+
+@pytest.fixture(autouse=True)
+def documents(monkeypatch):
+    monkeypatch.setattr(schema, "_documents", {})
+
+
+def testSchemaView_whenRequested_returnsAnnotatedSchemaWithETag(client) -> None:
+    response = client.get(reverse("schema"), {"format": "json"})
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/vnd.oai.openapi+json"
+    assert response["ETag"].startswith('"')
+    assert "max-age=3600" in response["Cache-Control"]
+    list_parameters = {
+        parameter["name"]
+        for parameter in response.json()["paths"]["/api/v1/tasks"]["get"]["parameters"]
+    }
+    assert {"fields", "page"} <= list_parameters
+
+
+def testSchemaView_whenETagMatches_returnsNotModified(client) -> None:
+    etag = client.get(reverse("schema"))["ETag"]
+
+    response = client.get(reverse("schema"), headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response["ETag"] == etag
+    assert response.content == b""
+
+
+def testSchemaView_whenSchemaFileSet_servesItWithoutGenerating(
+    client, settings, tmp_path, monkeypatch
+) -> None:
+    settings.API_SCHEMA_FILE = tmp_path / "schema.json"
+    management.call_command("build_api_schema", stdout=io.StringIO())
+    built = json.loads(settings.API_SCHEMA_FILE.read_bytes())
+    monkeypatch.setattr(schema, "generate_schema", pytest.fail)
+
+    yaml_response = client.get(reverse("schema"))
+    json_response = client.get(
+        reverse("schema"), headers={"Accept": "application/json"}
+    )
+
+    assert yaml_response["Content-Type"] == "application/vnd.oai.openapi"
+    assert yaml_response.content.startswith(b"openapi: 3")
+    assert json_response.json() == built
+    assert yaml_response["ETag"] != json_response["ETag"]
+
+
+def testSchemaView_whenFormatUnknown_returnsNotFound(client) -> None:
+    response = client.get(reverse("schema"), {"format": "xml"})
+
+    assert response.status_code == 404
+
+
+def testUrls_whenDocsDisabled_doNotLoadSpectacular() -> None:
+    script = (
+        "import sys, django; django.setup();"
+        "from django.urls import get_resolver; get_resolver().url_patterns;"
+        "print(sorted(m for m in sys.modules if m.startswith('drf_spectacular')))"
+    )
+    environ = {
+        **os.environ,
+        "API_DOCS_ENABLED": "false",
+        "DJANGO_SETTINGS_MODULE": "task_manager.settings",
+    }
+
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=django_settings.BASE_DIR,
+        env=environ,
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+
+    assert output.strip() == "[]"
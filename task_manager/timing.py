@@ -0,0 +1,131 @@
+"""This module records where the time of a request goes.
+
+`ServerTimingMiddleware` (see `task_manager.middleware`) starts a
+`RequestTimings` for the sampled requests. Database queries are recorded by
+an execute wrapper installed on every connection, whatever the thread that
+runs the query, the other phases by the code running them, with `measure()`:
+
+    with timing.measure("serialize"):
+        data = serializer.data
+
+`measure()` and the execute wrapper only read a context variable when no
+request is being timed, so they cost next to nothing outside of sampled
+requests.
+"""
+
+import collections
+import contextlib
+import contextvars
+import dataclasses
+import time
+from collections import abc
+
+from django import dispatch
+from django.db.backends import signals as db_signals
+
+_current: contextvars.ContextVar["RequestTimings | None"] = contextvars.ContextVar(
+    "request_timings", default=None
+)
+
+
+@dataclasses.dataclass
+class RequestTimings:
+    """The time spent by a request in each phase.
+
+    Attributes:
+        started (float): The `time.perf_counter()` value when the request started.
+        queries (int): The number of SQL queries run.
+        durations (dict[str, float]): Seconds spent per phase, e.g. `db`,
+            `serialize` or `render`.
+        statements (Counter[str]): The number of executions of each SQL statement,
+            parameters excluded.
+    """
+
+    started: float = dataclasses.field(default_factory=time.perf_counter)
+    queries: int = 0
+    durations: dict[str, float] = dataclasses.field(default_factory=dict)
+    statements: collections.Counter[str] = dataclasses.field(
+        default_factory=collections.Counter
+    )
+
+    def add(self, phase: str, seconds: float) -> None:
+        """Add time spent in a phase."""
+        self.durations[phase] = self.durations.get(phase, 0.0) + seconds
+
+    def repeated_statements(self, threshold: int) -> list[tuple[str, int]]:
+        """Return the statements run at least `threshold` times, most repeated first.
+
+        The same statement run with different parameters for each row of a
+        result is the mark of an N+1 query.
+        """
+        return [
+            (sql, count)
+            for sql, count in self.statements.most_common()
+            if count >= threshold
+        ]
+
+    def elapsed(self) -> float:
+        """Return the seconds since the request started."""
+        return time.perf_counter() - self.started
+
+
+def current() -> RequestTimings | None:
+    """Return the timings of the request being timed, if any."""
+    return _current.get()
+
+
+@contextlib.contextmanager
+def recording() -> abc.Iterator[RequestTimings]:
+    """Time the code run in the block, e.g. the handling of a request."""
+    timings = RequestTimings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+@contextlib.contextmanager
+def measure(phase: str) -> abc.Iterator[None]:
+    """Add the time spent in the block to a phase of the request being timed."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, time.perf_counter() - started)
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper recording the queries of the request being timed.
+
+    For more information, see:
+    https://docs.djangoproject.com/en/5.2/topics/db/instrumentation/
+    """
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.add("db", time.perf_counter() - started)
+        timings.queries += 1
+        timings.statements[sql] += 1
+
+
+def install(connection) -> None:
+    """Record the queries of the timed requests run on a database connection."""
+    if record_query not in connection.execute_wrappers:
+        # First, so that the bare pop() of `connection.execute_wrapper()`
+        # still removes the wrapper of a block this runs in.
+        connection.execute_wrappers.insert(0, record_query)
+
+
+@dispatch.receiver(db_signals.connection_created)
+def install_on_connect(sender, connection, **kwargs) -> None:
+    """Install the execute wrapper on the connections opened by any thread."""
+    install(connection)
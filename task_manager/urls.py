@@ -15,30 +15,27 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+from django.conf import settings
 from django.contrib import admin
 from django.urls import include
 from django.urls import path
-from drf_spectacular import views as spectacular_views
 from rest_framework import routers as rest_routers
 
+from task_manager import views
 from tasks import views as tasks_views
 
 router = rest_routers.DefaultRouter(trailing_slash=False)
 router.register(r"tasks", tasks_views.TaskViewSet)
+router.register(r"jobs", tasks_views.JobViewSet)
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/v1/", include(router.urls)),
     path(
-        "api/v1/schema/", spectacular_views.SpectacularAPIView.as_view(), name="schema"
-    ),
-    path(
-        "api/v1/docs/swagger/",
-        spectacular_views.SpectacularSwaggerView.as_view(url_name="schema"),
-        name="swagger-ui",
-    ),
-    path(
-        "api/v1/docs/redoc/",
-        spectacular_views.SpectacularRedocView.as_view(url_name="schema"),
-        name="redoc",
+        "api/v1/stats/database",
+        views.DatabaseStatsView.as_view(),
+        name="database-stats",
     ),
+    path("metrics", views.MetricsView.as_view(), name="metrics"),
 ]
+if settings.API_DOCS_ENABLED:
+    urlpatterns.append(path("", include("task_manager.docs_urls")))
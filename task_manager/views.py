@@ -0,0 +1,79 @@
+"""This module contains the views of the project that are not tied to an app."""
+
+import os
+
+import prometheus_client
+from prometheus_client import multiprocess as prometheus_multiprocess
+from django import http
+from django.conf import settings
+from django.utils import cache as cache_utils
+from django.views import generic
+from rest_framework import response as drf_response
+from rest_framework import views
+
+from task_manager import database
+from task_manager import schema
+
+
+class DatabaseStatsView(views.APIView):
+    """Reports the connection settings and pool stats of each database.
+
+    Pools are per process, the stats are the ones of the process answering
+    the request.
+    """
+
+    def get(self, request, *args, **kwargs) -> drf_response.Response:
+        """Return the stats, by database alias."""
+        return drf_response.Response(database.database_stats())
+
+
+class MetricsView(generic.View):
+    """Exposes the Prometheus metrics, see `task_manager.metrics`.
+
+    With `PROMETHEUS_MULTIPROC_DIR` set, the values of all the worker
+    processes are added up; otherwise they are the ones of this process.
+    """
+
+    def get(self, request, *args, **kwargs) -> http.HttpResponse:
+        """Return the metrics in the Prometheus text format."""
+        registry: prometheus_client.CollectorRegistry = prometheus_client.REGISTRY
+        if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+            registry = prometheus_client.CollectorRegistry()
+            prometheus_multiprocess.MultiProcessCollector(registry)
+        return http.HttpResponse(
+            prometheus_client.generate_latest(registry),
+            content_type=prometheus_client.CONTENT_TYPE_LATEST,
+        )
+
+
+class SchemaView(generic.View):
+    """Serves the OpenAPI schema, built once per process, see `task_manager.schema`.
+
+    The schema is YAML, or JSON with `?format=json` or an `Accept` header
+    asking for JSON. Its ETag only changes when the schema does, so clients
+    and caches revalidate it for free.
+    """
+
+    def get_format(self, request) -> str:
+        """Return the format asked for by the request."""
+        format = request.GET.get("format")
+        if format is not None:
+            if format not in schema.MEDIA_TYPES:
+                raise http.Http404(f"Unsupported schema format: {format}.")
+            return format
+        return "json" if "json" in request.headers.get("Accept", "") else "yaml"
+
+    def get(self, request, *args, **kwargs) -> http.HttpResponse:
+        """Return the schema, or 304 when the client has it already."""
+        document = schema.get_document(self.get_format(request))
+        response = cache_utils.get_conditional_response(request, etag=document.etag)
+        if response is None:
+            response = http.HttpResponse(
+                document.content, content_type=document.content_type
+            )
+        response["ETag"] = document.etag
+        cache_utils.patch_cache_control(
+            response, public=True, max_age=settings.API_SCHEMA_MAX_AGE
+        )
+        cache_utils.patch_vary_headers(response, ["Accept"])
+        return response
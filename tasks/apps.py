@@ -8,3 +8,7 @@ class TasksConfig(django_apps.AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "tasks"
+
+    def ready(self) -> None:
+        """Connect the signal receivers of the application."""
+        from tasks import receivers  # noqa: F401
@@ -0,0 +1,304 @@
+"""This module contains the async views of the Task CRUD endpoints.
+
+Served over ASGI (see `task_manager.asgi_urls`), they answer `/tasks` and
+`/tasks/<id>` without holding a thread for each request: queries go through
+Django's async ORM and lookups through the async API of the task cache.
+Everything that is not I/O, from the authentication, permission and throttle
+checks, the filters and the pagination to the validators and the error
+payloads, is done by the methods of a `TaskViewSet` bound to the request, so
+responses are the ones of the synchronous views. They are rendered as JSON
+only.
+"""
+
+import asyncio
+import typing
+from collections import abc
+
+from asgiref import sync
+from django import http as django_http
+from django.conf import settings
+from django.core import exceptions as django_exceptions
+from django.utils.decorators import classonlymethod
+from django.views import generic
+from django.views.decorators import csrf
+from rest_framework import exceptions as drf_exceptions
+from rest_framework import response as drf_response
+from rest_framework import status
+
+from task_manager import exceptions_handler
+from tasks import cache as tasks_cache
+from tasks import conditional as tasks_conditional
+from tasks import events as tasks_events
+from tasks import exceptions as tasks_exceptions
+from tasks import filters as tasks_filters
+from tasks import models as tasks_models
+from tasks import pagination as tasks_pagination
+from tasks import renderers as tasks_renderers
+from tasks import views as tasks_views
+
+# The exceptions the API exception handler turns into responses, the others
+# propagate like they do from DRF views.
+HANDLED_EXCEPTIONS = (
+    exceptions_handler.Error,
+    drf_exceptions.APIException,
+    django_http.Http404,
+    django_exceptions.PermissionDenied,
+)
+
+
+class TaskAsyncView(generic.View):
+    """Base class of the async Task views.
+
+    Does what DRF's `APIView` does around a handler: wraps the request, runs
+    the checks of `TaskViewSet.initial()`, turns exceptions into responses
+    with the API exception handler and renders the responses.
+
+    Attributes:
+        actions (dict): The viewset action of each request method.
+        renderer_classes (tuple): The renderers the content is negotiated
+            among, errors are rendered as JSON.
+    """
+
+    actions: typing.ClassVar[dict[str, str]] = {}
+    renderer = tasks_renderers.TaskJSONRenderer()
+    renderer_classes: tuple = (tasks_renderers.TaskJSONRenderer,)
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        """Return the view, exempt from CSRF checks like DRF views."""
+        return csrf.csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        """Run the handler of the request method and render its response."""
+        self.viewset = tasks_views.TaskViewSet(
+            args=args,
+            kwargs=kwargs,
+            action_map=self.actions,
+            renderer_classes=self.renderer_classes,
+        )
+        request = self.viewset.initialize_request(request, *args, **kwargs)
+        self.request = self.viewset.request = request
+        try:
+            # Authenticating may load the session or the user from the
+            # database, with the sync ORM.
+            await sync.sync_to_async(self.viewset.initial)(request, *args, **kwargs)
+            response = await super().dispatch(request, *args, **kwargs)
+        except HANDLED_EXCEPTIONS as exc:
+            response = self.viewset.handle_exception(exc)
+        return self.finalize_response(response)
+
+    async def http_method_not_allowed(self, request, *args, **kwargs):
+        """Reject the request method like DRF views do."""
+        raise drf_exceptions.MethodNotAllowed(request.method)
+
+    def finalize_response(self, response):
+        """Render a DRF response with the JSON renderer."""
+        if not isinstance(response, drf_response.Response):
+            return response
+        response.accepted_renderer = self.renderer
+        response.accepted_media_type = self.renderer.media_type
+        response.renderer_context = {
+            "view": self,
+            "request": self.request,
+            "response": response,
+        }
+        response["Allow"] = ", ".join(self._allowed_methods())
+        response["Vary"] = "Accept"
+        return response.render()
+
+    async def get_object(self, viewset: tasks_views.TaskViewSet) -> tasks_models.Task:
+        """Return the task in the url, like `TaskViewSet.get_object()` does.
+
+        Raises:
+            TaskNotFoundException: If the task does not exist.
+        """
+        task_id = viewset.get_lookup_task_id()
+        # retrieve has looked the id up in the cache already.
+        if (
+            viewset.action != "retrieve"
+            and await tasks_cache.task_cache.aget_missing(task_id) is not None
+        ):
+            raise tasks_exceptions.TaskNotFoundException(task_id=task_id)
+        queryset = viewset.filter_queryset(viewset.get_queryset())
+        try:
+            return await queryset.aget(pk=task_id)
+        except tasks_models.Task.DoesNotExist:
+            exception = tasks_exceptions.TaskNotFoundException(task_id=task_id)
+            await tasks_cache.task_cache.aset_missing(
+                task_id, exception.detail, using=queryset.db
+            )
+            raise exception
+
+    async def cache_task(
+        self, viewset: tasks_views.TaskViewSet, task: tasks_models.Task
+    ) -> tasks_cache.CacheEntry:
+        """Serialize a task and cache it, like `TaskViewSet.cache_task()` does."""
+        entry = (task.updated_at, viewset.get_serializer(task).data)
+        if viewset.get_requested_fields() is None:
+            await tasks_cache.task_cache.aset(task.id, *entry, using=task._state.db)
+        return entry
+
+
+class TaskAsyncListView(TaskAsyncView):
+    """Lists and creates tasks, like the `list` and `create` actions."""
+
+    actions: typing.ClassVar[dict[str, str]] = {"get": "list", "post": "create"}
+
+    async def get(self, request, *args, **kwargs) -> drf_response.Response:
+        """List a page of tasks, see `TaskViewSet.list()`."""
+        viewset = self.viewset
+        page_queryset = viewset.get_page_queryset()
+        if tasks_conditional.is_conditional(request):
+            versions = [
+                version
+                async for version in page_queryset.values_list("id", "updated_at")
+            ]
+            await self.count_page(viewset, versions)
+            not_modified = viewset.get_page_not_modified(versions)
+            if not_modified is not None:
+                return not_modified
+
+        representation = viewset.get_row_representation(page_queryset)
+        rows = [
+            row
+            async for row in (
+                page_queryset
+                if representation is None
+                else representation.get_rows(page_queryset)
+            )
+        ]
+        await self.count_page(viewset, rows)
+        return viewset.get_page_response(rows, representation)
+
+    async def count_page(
+        self, viewset: tasks_views.TaskViewSet, rows: abc.Sequence
+    ) -> None:
+        """Count the rows of a page-number page once, before its ETag is computed.
+
+        See `TaskPageNumberPagination.count_page()`.
+        """
+        paginator = viewset.paginator
+        if (
+            isinstance(paginator, tasks_pagination.TaskPageNumberPagination)
+            and paginator.count is None
+        ):
+            # Estimating a count runs EXPLAIN, which has no async API.
+            await sync.sync_to_async(paginator.count_page)(rows)
+
+    async def post(self, request, *args, **kwargs) -> drf_response.Response:
+        """Create a task."""
+        viewset = self.viewset
+        serializer = viewset.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        task = await tasks_models.Task.objects.acreate(**serializer.validated_data)
+        return drf_response.Response(
+            viewset.get_serializer(task).data, status=status.HTTP_201_CREATED
+        )
+
+
+class TaskAsyncDetailView(TaskAsyncView):
+    """Retrieves, updates and deletes a task, like the detail actions."""
+
+    actions: typing.ClassVar[dict[str, str]] = {
+        "get": "retrieve",
+        "put": "update",
+        "patch": "partial_update",
+        "delete": "destroy",
+    }
+
+    async def get(self, request, *args, **kwargs) -> drf_response.Response:
+        """Retrieve a task through the task cache, see `TaskViewSet.retrieve()`."""
+        viewset = self.viewset
+        task_id = viewset.get_lookup_task_id()
+        entry = await tasks_cache.task_cache.aget(task_id)
+        if entry is not None:
+            return viewset.get_task_response(task_id, entry, cache_status="HIT")
+
+        if tasks_conditional.is_conditional(request):
+            not_modified = viewset.get_task_not_modified(
+                task_id, await viewset.get_version_queryset(task_id).afirst()
+            )
+            if not_modified is not None:
+                return not_modified
+
+        entry = await self.cache_task(viewset, await self.get_object(viewset))
+        return viewset.get_task_response(task_id, entry, cache_status="MISS")
+
+    async def put(self, request, *args, **kwargs) -> drf_response.Response:
+        """Update a task."""
+        return await self.update(request, partial=False)
+
+    async def patch(self, request, *args, **kwargs) -> drf_response.Response:
+        """Partially update a task."""
+        return await self.update(request, partial=True)
+
+    async def update(self, request, partial: bool) -> drf_response.Response:
+        """Update the fields of a task given in the request, see `TaskViewSet.update()`."""
+        viewset = self.viewset
+        serializer = viewset.get_serializer(data=request.data, partial=partial)
+        if not serializer.is_valid():
+            # A missing task is reported before the errors of the data.
+            await self.get_object(viewset)
+            serializer.is_valid(raise_exception=True)
+        tasks = await viewset.get_update_queryset().aupdate_returning(
+            **serializer.validated_data
+        )
+        if not tasks:
+            # Reports, and remembers, the missing task.
+            await self.get_object(viewset)
+        return drf_response.Response(viewset.get_serializer(tasks[0]).data)
+
+    async def delete(self, request, *args, **kwargs) -> drf_response.Response:
+        """Delete a task."""
+        viewset = self.viewset
+        task = await self.get_object(viewset)
+        await task.adelete()
+        return drf_response.Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class TaskEventStreamView(TaskAsyncView):
+    """Streams the live events of tasks as Server-Sent Events, see `tasks.events`.
+
+    Each stream waits on a queue fed by the `LISTEN` connection of the
+    process, so an open stream holds neither a thread nor a database
+    connection.
+    """
+
+    actions: typing.ClassVar[dict[str, str]] = {"get": "events"}
+    event_renderer = tasks_renderers.TaskEventStreamRenderer()
+    renderer_classes = (
+        tasks_renderers.TaskEventStreamRenderer,
+        tasks_renderers.TaskJSONRenderer,
+    )
+
+    async def get(self, request, *args, **kwargs) -> django_http.StreamingHttpResponse:
+        """Stream the create, update and delete events of the tasks matching the list filters."""
+        lookups = tasks_filters.TaskFilterBackend().get_filters(request)
+        response = django_http.StreamingHttpResponse(
+            self.stream(lookups),
+            content_type=(
+                f"{self.event_renderer.media_type}; "
+                f"charset={self.event_renderer.charset}"
+            ),
+        )
+        response["Cache-Control"] = "no-cache"
+        # Tells nginx not to buffer the stream.
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    async def stream(self, lookups: dict) -> abc.AsyncGenerator[bytes, None]:
+        """Yield the events matching the filters, and a comment when idle for a while.
+
+        The subscription ends when the client disconnects, which cancels
+        the stream.
+        """
+        async with tasks_events.broker.subscribe(lookups) as subscription:
+            yield self.event_renderer.render_comment("connected")
+            while True:
+                try:
+                    yield await asyncio.wait_for(
+                        subscription.get(), settings.TASKS_EVENTS_HEARTBEAT_SECONDS
+                    )
+                except TimeoutError:
+                    # Keeps proxies from closing an idle connection.
+                    yield self.event_renderer.render_comment("keep-alive")
@@ -0,0 +1,430 @@
+"""This module contains the benchmark of the Task API.
+
+The `benchmark_api` command seeds the task table with a deterministic
+dataset, then times requests to `TaskViewSet` through Django's WSGI handler,
+like a server would send them, without network or external services.
+Results are summarized as latency percentiles and throughput, and compared
+with the results of a previous run to catch regressions.
+"""
+
+import functools
+import io
+import json
+import math
+import random
+import time
+import wsgiref.util
+from collections import abc
+from urllib import parse
+
+from django.core.handlers import wsgi
+from django.db import connection
+from django.db import models
+from rest_framework import renderers as drf_renderers
+
+from tasks import models as tasks_models
+from tasks import renderers as tasks_renderers
+from tasks import representations as tasks_representations
+from tasks import serializers as tasks_serializers
+
+# Words of the seeded descriptions, each one is also a search term.
+WORDS = (
+    "report",
+    "invoice",
+    "meeting",
+    "deploy",
+    "review",
+    "budget",
+    "release",
+    "customer",
+)
+
+# A timed operation, e.g. sending one request.
+Call = abc.Callable[[], object]
+
+# Seeded tasks are created one second apart from this time.
+SEED_START = "2024-01-01T00:00:00Z"
+
+# Tops the table up to a number of rows. The content of the i-th task only
+# depends on i, so a table seeded in steps is the same as one seeded at once.
+SEED_SQL = """
+INSERT INTO tasks_task (title, description, completed, created_at, updated_at)
+SELECT
+    'Task ' || i,
+    format(
+        'Prepare the %%s for the %%s, then %%s it.',
+        words[1 + i %% 8], words[1 + (i / 8) %% 8], words[1 + (i / 64) %% 8]
+    ),
+    i %% 10 <> 0,
+    %(start)s::timestamptz + i * interval '1 second',
+    %(start)s::timestamptz + i * interval '1 second'
+FROM generate_series(%(first)s, %(last)s) AS i,
+    (SELECT %(words)s::text[] AS words) AS seed
+"""
+
+
+def seed_tasks(size: int) -> int:
+    """Make the task table hold the first `size` tasks of the benchmark dataset.
+
+    The table is emptied first when it holds more tasks, then vacuumed and
+    analyzed so that the planner sees it like a table in production.
+
+    Returns:
+        int: The number of tasks inserted.
+    """
+    table = connection.ops.quote_name(tasks_models.Task._meta.db_table)
+    current = tasks_models.Task.objects.count()
+    with connection.cursor() as cursor:
+        if current > size:
+            cursor.execute(f"TRUNCATE {table} RESTART IDENTITY")
+            current = 0
+        if current < size:
+            cursor.execute(
+                SEED_SQL,
+                {
+                    "start": SEED_START,
+                    "first": current + 1,
+                    "last": size,
+                    "words": list(WORDS),
+                },
+            )
+        cursor.execute(f"VACUUM ANALYZE {table}")
+    return size - current
+
+
+def percentile(ordered: abc.Sequence[float], rank: float) -> float:
+    """Return the nearest-rank percentile of sorted values."""
+    index = max(math.ceil(rank / 100 * len(ordered)) - 1, 0)
+    return ordered[index]
+
+
+def summarize(durations: abc.Sequence[float], elapsed: float) -> dict:
+    """Summarize the durations of the requests of a scenario.
+
+    Args:
+        durations (Sequence[float]): The duration of each request, in seconds.
+        elapsed (float): The seconds spent running all the requests.
+    """
+    ordered = sorted(durations)
+    return {
+        "requests": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p90_ms": round(percentile(ordered, 90) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+        "throughput_rps": round(len(ordered) / elapsed, 1),
+    }
+
+
+def compare(
+    results: dict,
+    baseline: dict,
+    max_regression: float,
+    metrics: abc.Sequence[str] = ("p50_ms", "p90_ms"),
+) -> list[str]:
+    """Return the regressions of benchmark results over baseline results.
+
+    Args:
+        results (dict): Summaries by dataset size, then scenario.
+        baseline (dict): The summaries of a previous run, in the same shape.
+        max_regression (float): The slowdown tolerated, e.g. 0.2 for 20%.
+        metrics (Sequence[str]): The summary values compared.
+
+    Returns:
+        list[str]: A description of each regression.
+    """
+    regressions = []
+    for size, scenarios in results.items():
+        for scenario, summary in scenarios.items():
+            previous = baseline.get(size, {}).get(scenario)
+            if previous is None:
+                continue
+            for metric in metrics:
+                if summary[metric] > previous[metric] * (1 + max_regression):
+                    regressions.append(
+                        f"{scenario} on {size} tasks: {metric} "
+                        f"{previous[metric]} -> {summary[metric]}"
+                    )
+    return regressions
+
+
+class WSGIClient:
+    """Sends requests to the project through its WSGI handler.
+
+    Unlike the test client, responses are closed like a WSGI server closes
+    them, so the end of each request releases its database connection.
+    """
+
+    def __init__(self):
+        self.handler = wsgi.WSGIHandler()
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        params: dict | None = None,
+        data: object = None,
+        keep_body: bool = True,
+    ) -> tuple[int, bytes]:
+        """Send a request and read its response.
+
+        Args:
+            method (str): The request method.
+            path (str): The request path.
+            params (dict, optional): The query string parameters.
+            data (object, optional): The request data, sent as JSON.
+            keep_body (bool): Whether to return the body, or only read it.
+
+        Returns:
+            tuple[int, bytes]: The status code and the body of the response.
+        """
+        body = b"" if data is None else json.dumps(data).encode()
+        environ = {
+            "REQUEST_METHOD": method,
+            "PATH_INFO": path,
+            "QUERY_STRING": parse.urlencode(params or {}),
+            "CONTENT_TYPE": "application/json",
+            "CONTENT_LENGTH": str(len(body)),
+            "wsgi.input": io.BytesIO(body),
+        }
+        wsgiref.util.setup_testing_defaults(environ)
+        statuses = []
+
+        def start_response(status, headers, exc_info=None):
+            statuses.append(int(status.split(" ", 1)[0]))
+
+        result = self.handler(environ, start_response)
+        try:
+            chunks: list[bytes] | None = [] if keep_body else None
+            for chunk in result:
+                if chunks is not None:
+                    chunks.append(chunk)
+        finally:
+            result.close()
+        return statuses[0], b"".join(chunks or ())
+
+
+class Benchmark:
+    """Times the scenarios of the Task API against the current task table.
+
+    Args:
+        requests (int): The number of requests timed per scenario.
+        export_requests (int): The number of full exports timed.
+        page_size (int): The page size of the listings.
+        seed (int): Seeds the choice of the tasks read, for reproducible runs.
+    """
+
+    path = "/api/v1/tasks"
+
+    def __init__(
+        self,
+        requests: int,
+        export_requests: int = 3,
+        page_size: int = 50,
+        seed: int = 0,
+    ):
+        self.requests = requests
+        self.export_requests = export_requests
+        self.page_size = page_size
+        self.random = random.Random(seed)
+        self.client = WSGIClient()
+        self.created_ids: list[int] = []
+
+    def run(self) -> dict[str, dict]:
+        """Run every scenario, warming each one up first.
+
+        Returns:
+            dict[str, dict]: The summary of each scenario.
+        """
+        scenarios = {
+            "list": self.list_calls,
+            "list_filtered": self.list_filtered_calls,
+            "search": self.search_calls,
+            "retrieve": self.retrieve_calls,
+            "create": self.create_calls,
+            "update": self.update_calls,
+            "delete": self.delete_calls,
+            "export": self.export_calls,
+            "page_serializer": self.page_serializer_calls,
+            "page_rows": self.page_rows_calls,
+        }
+        results = {}
+        for name, calls in scenarios.items():
+            results[name] = self.time_calls(calls())
+        return results
+
+    def time_calls(self, calls: abc.Sequence[Call]) -> dict:
+        """Run the calls one after the other and summarize their durations."""
+        # The first call warms caches and connections up, it is not timed.
+        calls[0]()
+        durations = []
+        started = time.perf_counter()
+        for call in calls[1:]:
+            call_started = time.perf_counter()
+            call()
+            durations.append(time.perf_counter() - call_started)
+        return summarize(durations, time.perf_counter() - started)
+
+    def call(
+        self,
+        method: str,
+        path: str,
+        expected_status: int = 200,
+        **kwargs,
+    ) -> bytes:
+        """Send a request, checking that the API answered as expected.
+
+        Raises:
+            RuntimeError: If the response has another status code.
+        """
+        status_code, body = self.client.request(method, path, **kwargs)
+        if status_code != expected_status:
+            raise RuntimeError(
+                f"{method} {path} answered {status_code}: {body[:200]!r}"
+            )
+        return body
+
+    def sample_ids(self, count: int) -> list[int]:
+        """Return the ids of random tasks of the table.
+
+        Ids are drawn between the smallest and the largest id rather than out
+        of a list of every id of a table of up to millions of tasks. Seeded
+        ids are dense, so draws rarely land in a gap, e.g. of tasks created
+        and deleted by an earlier run, and those are drawn again.
+
+        Raises:
+            RuntimeError: If the table holds no task.
+        """
+        bounds = tasks_models.Task.objects.aggregate(
+            first=models.Min("id"), last=models.Max("id")
+        )
+        if bounds["first"] is None:
+            raise RuntimeError("No tasks to sample, seed the table first.")
+        ids: list[int] = []
+        while len(ids) < count:
+            drawn = [
+                self.random.randint(bounds["first"], bounds["last"])
+                for _ in range(count - len(ids))
+            ]
+            existing = set(
+                tasks_models.Task.objects.filter(id__in=set(drawn)).values_list(
+                    "id", flat=True
+                )
+            )
+            ids.extend(task_id for task_id in drawn if task_id in existing)
+        return ids
+
+    def list_calls(self) -> abc.Sequence[Call]:
+        """Walk the pages of all the tasks, following the next links."""
+        cursor = None
+
+        def list_page() -> None:
+            nonlocal cursor
+            params = {"page_size": self.page_size}
+            if cursor is not None:
+                params["cursor"] = cursor
+            page = json.loads(self.call("GET", self.path, params=params))
+            cursor = None
+            if page["next"]:
+                query = parse.parse_qs(parse.urlsplit(page["next"]).query)
+                cursor = query["cursor"][0]
+
+        return [list_page] * (self.requests + 1)
+
+    def list_filtered_calls(self) -> abc.Sequence[Call]:
+        """Read the first page of the open tasks."""
+        params = {"page_size": self.page_size, "completed": "false"}
+        call = functools.partial(self.call, "GET", self.path, params=params)
+        return [call] * (self.requests + 1)
+
+    def search_calls(self) -> abc.Sequence[Call]:
+        """Search the tasks for each seeded word in turn."""
+        return [
+            functools.partial(
+                self.call,
+                "GET",
+                self.path,
+                params={"page_size": self.page_size, "q": WORDS[index % len(WORDS)]},
+            )
+            for index in range(self.requests + 1)
+        ]
+
+    def retrieve_calls(self) -> abc.Sequence[Call]:
+        """Retrieve random tasks, through the task cache like clients do."""
+        return [
+            functools.partial(self.call, "GET", f"{self.path}/{task_id}")
+            for task_id in self.sample_ids(self.requests + 1)
+        ]
+
+    def create_calls(self) -> abc.Sequence[Call]:
+        """Create tasks, later updated and deleted by the next scenarios."""
+
+        def create(index: int) -> None:
+            body = self.call(
+                "POST",
+                self.path,
+                expected_status=201,
+                data={"title": f"Benchmark {index}", "description": WORDS[0]},
+            )
+            self.created_ids.append(json.loads(body)["id"])
+
+        return [functools.partial(create, index) for index in range(self.requests + 1)]
+
+    def update_calls(self) -> abc.Sequence[Call]:
+        """Partially update the created tasks."""
+        return [
+            functools.partial(
+                self.call, "PATCH", f"{self.path}/{task_id}", data={"completed": True}
+            )
+            for task_id in self.created_ids
+        ]
+
+    def delete_calls(self) -> abc.Sequence[Call]:
+        """Delete the created tasks, leaving the table as it was seeded."""
+        calls = [
+            functools.partial(
+                self.call, "DELETE", f"{self.path}/{task_id}", expected_status=204
+            )
+            for task_id in self.created_ids
+        ]
+        self.created_ids = []
+        return calls
+
+    def export_calls(self) -> abc.Sequence[Call]:
+        """Export all the tasks as NDJSON."""
+        call = functools.partial(
+            self.call,
+            "GET",
+            f"{self.path}/export",
+            params={"format": "ndjson"},
+            keep_body=False,
+        )
+        return [call] * (self.export_requests + 1)
+
+    def page_serializer_calls(self) -> abc.Sequence[Call]:
+        """Build a page with `TaskSerializer` and `JSONRenderer`, query included.
+
+        The path of listings that `tasks.representations` cannot serve.
+        """
+        renderer = drf_renderers.JSONRenderer()
+
+        def render_page() -> bytes:
+            tasks = tasks_models.Task.objects.all()[: self.page_size]
+            data = tasks_serializers.TaskSerializer(tasks, many=True).data
+            return renderer.render(data)
+
+        return [render_page] * (self.requests + 1)
+
+    def page_rows_calls(self) -> abc.Sequence[Call]:
+        """Build a page from rows with `TaskJSONRenderer`, query included."""
+        renderer = tasks_renderers.TaskJSONRenderer()
+        representation = tasks_representations.TaskRowRepresentation()
+
+        def render_page() -> bytes:
+            rows = representation.get_rows(
+                tasks_models.Task.objects.all()[: self.page_size]
+            )
+            return renderer.render(representation.to_representation(rows))
+
+        return [render_page] * (self.requests + 1)
@@ -0,0 +1,332 @@
+"""This module contains the read-through cache of serialized tasks.
+
+Entries live in the `tasks` cache of the CACHES setting, so the backend can
+be swapped for a shared one (e.g. Redis) through configuration. Entries are
+keyed by task id and by the cache VERSION, which must be bumped whenever the
+serialized payload changes shape.
+
+The default LocMemCache keeps the entries of each process in its memory,
+while tasks are also written by other processes: the other workers of the
+server, the job workers of `run_task_workers` or `import_tasks`. Their
+receivers only drop the entries of their own process. So a process with a
+local cache listens, from a thread started by its first lookup, to the
+notifications the trigger of the task table sends when writes commit (see
+`tasks.events`), and drops the entries of the tasks written, a few
+milliseconds after the commit. A shared backend needs no listener, the
+writers drop the entries themselves.
+
+Ids known to be missing are cached too, for a short while, with their
+pre-rendered 404 payload. They share the key of the task, so the receivers
+that invalidate a task on save also drop the negative entry when a task is
+created with that id.
+
+Entries read from a read replica may lag behind the primary, they live no
+longer than the DATABASE_REPLICA_STICKINESS window. Requests pinned to the
+primary, by a recent write of their client, do not look them up: their
+reads go to the primary, and refill the cache from it.
+
+Lookups are also counted by the `task_cache_lookups` Prometheus metric,
+which adds up the lookups of all the worker processes.
+"""
+
+import datetime
+import json
+import logging
+import threading
+from collections import abc
+
+import psycopg
+from django.conf import settings
+from django.core import cache as django_cache
+from django.core.cache.backends import locmem
+from django.db import connections
+from django.db import router
+
+from task_manager import metrics
+from task_manager import routers
+from tasks import events as tasks_events
+from tasks import models as tasks_models
+
+logger = logging.getLogger(__name__)
+
+TASKS_CACHE_ALIAS = "tasks"
+
+# Seconds the listener waits for a notification before checking whether it
+# is stopped.
+LISTEN_TIMEOUT = 1.0
+
+# (updated_at, payload) of a task, or (None, 404 payload) of a missing id.
+CacheEntry = tuple[datetime.datetime | None, dict]
+
+
+class TaskCacheListener:
+    """Drops from a local cache the entries of the tasks written by any process.
+
+    Args:
+        task_cache (TaskCache): The cache to drop the entries from.
+    """
+
+    def __init__(self, task_cache: "TaskCache"):
+        self.task_cache = task_cache
+        self.thread: threading.Thread | None = None
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+        # Set once the listener runs LISTEN.
+        self.ready = threading.Event()
+
+    def is_running(self) -> bool:
+        """Return whether the listener thread runs."""
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self) -> None:
+        """Start listening from a thread of the process, unless it already does."""
+        with self.lock:
+            if self.is_running():
+                return
+            self.stopping.clear()
+            self.ready.clear()
+            self.thread = threading.Thread(
+                target=self.listen, name="task-cache-listener", daemon=True
+            )
+            self.thread.start()
+
+    def stop(self) -> None:
+        """Stop listening, waiting for the thread to exit."""
+        with self.lock:
+            thread, self.thread = self.thread, None
+            self.stopping.set()
+        if thread is not None:
+            thread.join()
+
+    def listen(self) -> None:
+        """Drop the entries of the tasks notified, reconnecting when the connection is lost."""
+        while not self.stopping.is_set():
+            try:
+                with psycopg.connect(
+                    autocommit=True, **tasks_events.get_connection_params()
+                ) as connection:
+                    connection.execute(f"LISTEN {tasks_events.CHANNEL}")
+                    # Writes committed while not listening were missed.
+                    self.task_cache.cache.clear()
+                    self.ready.set()
+                    while not self.stopping.is_set():
+                        for notify in connection.notifies(timeout=LISTEN_TIMEOUT):
+                            self.handle(notify.payload)
+            except psycopg.Error:
+                logger.exception("Lost the LISTEN connection of the task cache.")
+                self.stopping.wait(tasks_events.RECONNECT_DELAY)
+
+    def handle(self, payload: str) -> None:
+        """Drop the entries of the tasks of a notification of the trigger."""
+        notification = json.loads(payload)
+        if notification["op"] == "RESYNC":
+            # Too many tasks were written to list them.
+            self.task_cache.cache.clear()
+        else:
+            self.task_cache.invalidate(row["id"] for row in notification["rows"])
+
+
+class TaskCache:
+    """Cache of (updated_at, payload) entries of serialized tasks.
+
+    Attributes:
+        alias (str): The alias of the cache in the CACHES setting.
+        hits (int): Number of lookups served from the cache by this process.
+        misses (int): Number of lookups that missed the cache in this process.
+        missing_hits (int): Number of hits that found an id known to be missing.
+    """
+
+    def __init__(self, alias: str = TASKS_CACHE_ALIAS):
+        self.alias = alias
+        self.hits = 0
+        self.misses = 0
+        self.missing_hits = 0
+        self.listener = TaskCacheListener(self)
+
+    @property
+    def cache(self) -> django_cache.BaseCache:
+        """Return the cache backend."""
+        return django_cache.caches[self.alias]
+
+    @property
+    def is_local(self) -> bool:
+        """Return whether the entries live in the memory of this process."""
+        return isinstance(self.cache, locmem.LocMemCache)
+
+    def ensure_listening(self) -> None:
+        """Start the listener of a local cache, unless disabled or running."""
+        if (
+            settings.TASKS_CACHE_LISTEN
+            and self.is_local
+            and not self.listener.is_running()
+            and connections[router.db_for_write(tasks_models.Task)].vendor
+            == "postgresql"
+        ):
+            self.listener.start()
+
+    @staticmethod
+    def is_bypassed() -> bool:
+        """Return whether lookups are skipped, the reads being pinned to the primary.
+
+        Entries may have been read from a replica lagging behind the writes
+        that pinned the request.
+        """
+        return bool(settings.DATABASE_REPLICAS) and routers.is_pinned_to_primary()
+
+    @staticmethod
+    def make_key(task_id: int) -> str:
+        """Return the cache key of a task."""
+        return f"task:{task_id}"
+
+    def get(self, task_id: int) -> CacheEntry | None:
+        """Return the cached entry of a task, if any and not bypassed."""
+        if self.is_bypassed():
+            return None
+        self.ensure_listening()
+        return self.count_lookup(self.cache.get(self.make_key(task_id)))
+
+    async def aget(self, task_id: int) -> CacheEntry | None:
+        """Return the cached entry of a task, like `get()` without blocking."""
+        if self.is_bypassed():
+            return None
+        self.ensure_listening()
+        return self.count_lookup(await self.aget_entry(self.make_key(task_id)))
+
+    def count_lookup(self, entry: CacheEntry | None) -> CacheEntry | None:
+        """Count a lookup as a hit or a miss, then return its entry."""
+        if entry is None:
+            self.misses += 1
+            metrics.task_cache_lookups("miss").inc()
+        else:
+            self.hits += 1
+            metrics.task_cache_lookups("hit").inc()
+            if entry[0] is None:
+                self.missing_hits += 1
+                metrics.task_cache_lookups("missing_hit").inc()
+        return entry
+
+    def get_missing(self, task_id: int) -> dict | None:
+        """Return the 404 payload of an id known to be missing, if it is and not bypassed."""
+        if self.is_bypassed():
+            return None
+        self.ensure_listening()
+        return self.count_missing(self.cache.get(self.make_key(task_id)))
+
+    async def aget_missing(self, task_id: int) -> dict | None:
+        """Return the 404 payload of a missing id, like `get_missing()` without blocking."""
+        if self.is_bypassed():
+            return None
+        self.ensure_listening()
+        return self.count_missing(await self.aget_entry(self.make_key(task_id)))
+
+    def count_missing(self, entry: CacheEntry | None) -> dict | None:
+        """Return the 404 payload of an entry of a missing id, counting the hit."""
+        if entry is None or entry[0] is not None:
+            return None
+        self.missing_hits += 1
+        metrics.task_cache_lookups("missing_hit").inc()
+        return entry[1]
+
+    def set(
+        self,
+        task_id: int,
+        updated_at: datetime.datetime,
+        payload: dict,
+        using: str | None = None,
+    ) -> None:
+        """Cache the serialized payload of a task.
+
+        Args:
+            using (str | None): The alias of the database the task was read from.
+        """
+        self.cache.set(
+            self.make_key(task_id),
+            (updated_at, dict(payload)),
+            self.get_timeout(using),
+        )
+
+    async def aset(
+        self,
+        task_id: int,
+        updated_at: datetime.datetime,
+        payload: dict,
+        using: str | None = None,
+    ) -> None:
+        """Cache the serialized payload of a task, like `set()` without blocking."""
+        await self.aset_entry(
+            self.make_key(task_id),
+            (updated_at, dict(payload)),
+            self.get_timeout(using),
+        )
+
+    def get_timeout(self, using: str | None) -> float | None:
+        """Return the lifetime of the entry of a task read from a database."""
+        if using in settings.DATABASE_REPLICAS:
+            return settings.DATABASE_REPLICA_STICKINESS
+        return self.cache.default_timeout
+
+    def set_missing(
+        self, task_id: int, payload: dict, using: str | None = None
+    ) -> None:
+        """Remember for a short while that a task does not exist.
+
+        Args:
+            using (str | None): The alias of the database the task was looked up in.
+        """
+        self.cache.set(
+            self.make_key(task_id),
+            (None, dict(payload)),
+            self.get_missing_timeout(using),
+        )
+
+    async def aset_missing(
+        self, task_id: int, payload: dict, using: str | None = None
+    ) -> None:
+        """Remember that a task does not exist, like `set_missing()` without blocking."""
+        await self.aset_entry(
+            self.make_key(task_id),
+            (None, dict(payload)),
+            self.get_missing_timeout(using),
+        )
+
+    @staticmethod
+    def get_missing_timeout(using: str | None) -> int:
+        """Return the lifetime of the entry of an id looked up in a database."""
+        timeout = settings.TASKS_CACHE_MISSING_TIMEOUT
+        if using in settings.DATABASE_REPLICAS:
+            timeout = min(timeout, settings.DATABASE_REPLICA_STICKINESS)
+        return timeout
+
+    async def aget_entry(self, key: str) -> CacheEntry | None:
+        """Read an entry without blocking the event loop.
+
+        A local cache is read in memory right away: the async API of
+        LocMemCache would only add a hop to a thread.
+        """
+        if self.is_local:
+            return self.cache.get(key)
+        return await self.cache.aget(key)
+
+    async def aset_entry(
+        self, key: str, entry: CacheEntry, timeout: float | None
+    ) -> None:
+        """Write an entry without blocking the event loop, see `aget_entry()`."""
+        if self.is_local:
+            self.cache.set(key, entry, timeout)
+        else:
+            await self.cache.aset(key, entry, timeout)
+
+    def invalidate(self, task_ids: abc.Iterable[int]) -> None:
+        """Drop the entries of the given tasks."""
+        self.cache.delete_many([self.make_key(task_id) for task_id in task_ids])
+
+    def stats(self) -> dict[str, int]:
+        """Return the hit and miss counters of this process."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "missing_hits": self.missing_hits,
+        }
+
+
+task_cache = TaskCache()
@@ -0,0 +1,209 @@
+"""This module contains the change feed of tasks, for the delta sync of clients.
+
+A client syncs from scratch by reading `GET /tasks/changes` until it has no
+more changes, then keeps the `cursor` of the last page and sends it back as
+`since` on its next sync, downloading only the tasks written or deleted in
+between.
+
+Changes are ordered by (changed_at, id): written tasks by their
+(updated_at, id), read through the `task_updated_at_id_idx` index, deleted
+tasks by the (deleted_at, task_id) of their tombstones, written by a database
+trigger (see the `0007_task_tombstone` migration).
+
+Tasks are stamped when they are written, not when their transaction commits,
+so the feed stays `TASKS_CHANGES_SETTLE_SECONDS` behind the present rather
+than letting a client sync past a change not committed yet. On PostgreSQL it
+also stays behind the start of the oldest transaction still open that has
+written, e.g. a long import: its rows are stamped after that start and only
+show once it commits. It is read from the primary database for the same
+reason: a lagging replica would hide changes the cursor then moves past.
+"""
+
+import base64
+import binascii
+import dataclasses
+import datetime
+import json
+
+from django.conf import settings
+from django.db import connections
+from django.db import models
+from django.db import router
+from django.utils import timezone
+
+from tasks import exceptions as tasks_exceptions
+from tasks import models as tasks_models
+
+
+@dataclasses.dataclass(frozen=True)
+class ChangeCursor:
+    """A position in the (changed_at, id) order of the change feed.
+
+    Attributes:
+        changed_at (datetime.datetime): The time of the change at the position.
+        id (int): The id of the task of the change at the position.
+    """
+
+    changed_at: datetime.datetime
+    id: int
+
+
+@dataclasses.dataclass(frozen=True)
+class Change:
+    """A task written or deleted.
+
+    Attributes:
+        id (int): The id of the task.
+        changed_at (datetime.datetime): When the task was written or deleted.
+        task (Task | None): The task as written, None when it was deleted.
+    """
+
+    id: int
+    changed_at: datetime.datetime
+    task: tasks_models.Task | None = None
+
+    @property
+    def deleted(self) -> bool:
+        """Return whether the task was deleted."""
+        return self.task is None
+
+    @property
+    def cursor(self) -> ChangeCursor:
+        """Return the position of the change in the feed."""
+        return ChangeCursor(self.changed_at, self.id)
+
+
+def encode_change_cursor(cursor: ChangeCursor) -> str:
+    """Encode a change cursor into an opaque url-safe token."""
+    raw = json.dumps([cursor.changed_at.isoformat(), cursor.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_change_cursor(token: str) -> ChangeCursor:
+    """Decode a token produced by `encode_change_cursor`.
+
+    Raises:
+        InvalidCursorException: If the token is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        changed_at, task_id = json.loads(raw)
+        cursor = ChangeCursor(
+            changed_at=datetime.datetime.fromisoformat(changed_at), id=int(task_id)
+        )
+    except (binascii.Error, ValueError, TypeError):
+        raise tasks_exceptions.InvalidCursorException()
+    if cursor.changed_at.tzinfo is None:
+        raise tasks_exceptions.InvalidCursorException()
+    return cursor
+
+
+def retention_horizon() -> datetime.datetime:
+    """Return the time before which tombstones are purged."""
+    return timezone.now() - datetime.timedelta(
+        days=settings.TASKS_TOMBSTONE_RETENTION_DAYS
+    )
+
+
+def open_writes_start(using: str) -> datetime.datetime | None:
+    """Return when the oldest other transaction still open that wrote started.
+
+    Returns:
+        datetime.datetime | None: The start of the transaction, None if there
+            is none or the database does not tell.
+    """
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        # Transactions are given an xid by their first write.
+        cursor.execute(
+            "SELECT min(xact_start) FROM pg_stat_activity"
+            " WHERE datname = current_database() AND backend_xid IS NOT NULL"
+            " AND pid <> pg_backend_pid()"
+        )
+        return cursor.fetchone()[0]
+
+
+def changes_horizon(using: str) -> datetime.datetime:
+    """Return the time before which the changes of the feed are settled."""
+    horizon = timezone.now()
+    started = open_writes_start(using)
+    if started is not None:
+        horizon = min(horizon, started)
+    return horizon - datetime.timedelta(seconds=settings.TASKS_CHANGES_SETTLE_SECONDS)
+
+
+def changed_after(
+    queryset: models.QuerySet,
+    time_field: str,
+    id_field: str,
+    since: ChangeCursor | None,
+    horizon: datetime.datetime,
+) -> models.QuerySet:
+    """Return the rows of a queryset changed after a cursor, in the feed order.
+
+    The redundant `time_field` bound lets the database start the index scan
+    at the cursor, the OR only breaks ties on equal timestamps.
+    """
+    queryset = queryset.filter(**{f"{time_field}__lt": horizon})
+    if since is not None:
+        queryset = queryset.filter(
+            models.Q(**{f"{time_field}__gt": since.changed_at})
+            | models.Q(**{f"{id_field}__gt": since.id}),
+            **{f"{time_field}__gte": since.changed_at},
+        )
+    return queryset.order_by(time_field, id_field)
+
+
+def read_changes(
+    tasks: models.QuerySet, since: ChangeCursor | None, limit: int
+) -> tuple[list[Change], bool]:
+    """Read the changes of tasks after a cursor.
+
+    Args:
+        tasks (QuerySet): The tasks to read the written ones from.
+        since (ChangeCursor | None): The position to read from, None to read
+            all the tasks.
+        limit (int): The maximum number of changes read.
+
+    Returns:
+        tuple[list[Change], bool]: The changes, oldest first, and whether
+            more follow.
+
+    Raises:
+        ChangesCursorExpiredException: If tombstones since the cursor may
+            have been purged.
+    """
+    if since is not None and since.changed_at < retention_horizon():
+        raise tasks_exceptions.ChangesCursorExpiredException()
+    using = router.db_for_write(tasks_models.Task)
+    horizon = changes_horizon(using)
+    written = changed_after(tasks.using(using), "updated_at", "id", since, horizon)
+    deleted = changed_after(
+        tasks_models.TaskTombstone.objects.using(using),
+        "deleted_at",
+        "task_id",
+        since,
+        horizon,
+    )
+    # Each side reads one row more than the page, to tell whether more follow.
+    changes = [Change(task.id, task.updated_at, task) for task in written[: limit + 1]]
+    changes.extend(
+        Change(tombstone.task_id, tombstone.deleted_at)
+        for tombstone in deleted[: limit + 1]
+    )
+    changes.sort(key=lambda change: (change.changed_at, change.id))
+    return changes[:limit], len(changes) > limit
+
+
+def purge_tombstones() -> int:
+    """Delete the tombstones older than `TASKS_TOMBSTONE_RETENTION_DAYS`.
+
+    Returns:
+        int: The number of tombstones deleted.
+    """
+    deleted, _ = tasks_models.TaskTombstone.objects.filter(
+        deleted_at__lt=retention_horizon()
+    ).delete()
+    return deleted
@@ -0,0 +1,65 @@
+"""This module contains helpers for conditional GET requests on tasks.
+
+Validators are derived from the `updated_at` timestamps maintained by the
+database, so they can be computed from a cheap query without loading or
+serializing the tasks.
+"""
+
+import datetime
+import hashlib
+from collections import abc
+
+from django.utils import http as http_utils
+
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.UTC)
+
+
+def _microseconds(value: datetime.datetime) -> int:
+    """Return a timestamp as an exact number of microseconds since the epoch."""
+    return (value - _EPOCH) // datetime.timedelta(microseconds=1)
+
+
+def is_conditional(request) -> bool:
+    """Return whether the request carries cache validators."""
+    return (
+        "HTTP_IF_NONE_MATCH" in request.META or "HTTP_IF_MODIFIED_SINCE" in request.META
+    )
+
+
+def task_etag(task_id: int, updated_at: datetime.datetime, variant: str) -> str:
+    """Return the strong ETag of a task representation.
+
+    Args:
+        task_id (int): The id of the task.
+        updated_at (datetime.datetime): The last update time of the task.
+        variant (str): Identifies the representation, e.g. the rendered format.
+    """
+    return http_utils.quote_etag(f"{task_id}-{_microseconds(updated_at)}-{variant}")
+
+
+def page_etag(
+    versions: abc.Iterable[tuple[int, datetime.datetime]], variant: str
+) -> str:
+    """Return the strong ETag of a page of tasks.
+
+    The tag combines the row count and the latest `updated_at` of the page
+    with a digest of its ids, so that a row leaving the page also changes it.
+
+    Args:
+        versions (Iterable[tuple[int, datetime.datetime]]): The (id, updated_at) of each row.
+        variant (str): Identifies the representation, e.g. the rendered format.
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    count = 0
+    latest = 0
+    for task_id, updated_at in versions:
+        microseconds = _microseconds(updated_at)
+        digest.update(f"{task_id}:{microseconds};".encode())
+        count += 1
+        latest = max(latest, microseconds)
+    return http_utils.quote_etag(f"{count}-{latest}-{digest.hexdigest()}-{variant}")
+
+
+def last_modified(updated_at: datetime.datetime) -> str:
+    """Return the Last-Modified header value of a task."""
+    return http_utils.http_date(updated_at.timestamp())
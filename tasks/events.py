@@ -0,0 +1,264 @@
+"""This module contains the live events of tasks, pushed to clients over SSE.
+
+A database trigger (see the `0008_task_notify` migration) sends a
+notification on the `tasks_task` channel for every statement writing tasks,
+once the transaction commits. Each notification lists the written tasks with
+their filterable fields, as they were before an update or a delete. A
+statement writing more than 1000 tasks sends a single `RESYNC` notification
+instead (see the `0010_task_notify_resync` migration), published as a
+`resync` event: loading and fanning out so many tasks would cost every
+process more than the clients reloading theirs.
+
+Each process keeps one `LISTEN` connection to the primary database, opened
+when the first client subscribes and closed when the last one leaves. For
+each notification it loads the written tasks once, with a single query, then
+encodes every event once and fans it out to the queue of every subscriber
+whose filters match, so the number of connected clients costs no query.
+"""
+
+import asyncio
+import contextlib
+import dataclasses
+import datetime
+import json
+import logging
+import operator
+from collections import abc
+from typing import Any
+
+import psycopg
+from django.conf import settings
+from django.db import connections
+from django.db import router
+
+from tasks import models as tasks_models
+from tasks import renderers as tasks_renderers
+from tasks import serializers as tasks_serializers
+
+logger = logging.getLogger(__name__)
+
+# The channel notified by the trigger of the task table.
+CHANNEL = "tasks_task"
+
+# The event sent for each operation of the trigger.
+EVENT_NAMES = {"INSERT": "create", "UPDATE": "update", "DELETE": "delete"}
+
+_renderer = tasks_renderers.TaskEventStreamRenderer()
+
+# Sent when events may have been lost, e.g. while the LISTEN connection was
+# reconnecting or because a client read too slowly: clients reload the tasks
+# they show, e.g. through the change feed.
+RESYNC = _renderer.render_event("resync", {})
+
+# Seconds waited before reconnecting a lost LISTEN connection.
+RECONNECT_DELAY = 1.0
+
+_OPERATORS: dict[str, abc.Callable[[Any, Any], bool]] = {
+    "exact": operator.eq,
+    "gte": operator.ge,
+    "lte": operator.le,
+}
+
+# The fields of the tasks the filters apply to, as sent by the trigger.
+_FIELD_PARSERS: dict[str, abc.Callable[[Any], Any]] = {
+    "completed": bool,
+    "created_at": datetime.datetime.fromisoformat,
+    "updated_at": datetime.datetime.fromisoformat,
+}
+
+
+def get_connection_params() -> dict:
+    """Return the parameters of a LISTEN connection to the primary database."""
+    alias = router.db_for_write(tasks_models.Task)
+    params = connections[alias].get_connection_params()
+    # Options of the sync connections of Django.
+    for option in ("cursor_factory", "context"):
+        params.pop(option, None)
+    return params
+
+
+def matches(values: dict, lookups: dict) -> bool:
+    """Return whether the fields of a task match the lookups of `TaskFilterBackend`.
+
+    Args:
+        values (dict): The filterable fields of the task.
+        lookups (dict): The lookups, e.g. `{"completed": False}`.
+    """
+    for lookup, expected in lookups.items():
+        field, _, name = lookup.partition("__")
+        if not _OPERATORS[name or "exact"](values[field], expected):
+            return False
+    return True
+
+
+@dataclasses.dataclass(frozen=True)
+class Event:
+    """An encoded event, with the task it is about before and after the write.
+
+    Attributes:
+        message (bytes): The event, in the text/event-stream format.
+        before (dict | None): The filterable fields of the task before an
+            update or a delete.
+        after (dict | None): The filterable fields of the task after a create
+            or an update.
+    """
+
+    message: bytes
+    before: dict | None
+    after: dict | None
+
+    def matches(self, lookups: dict) -> bool:
+        """Return whether a subscriber with these filters gets the event.
+
+        An update reaches the subscribers the task matched before or after
+        it, so that they also see the tasks leaving their filters.
+        """
+        return any(
+            values is not None and matches(values, lookups)
+            for values in (self.before, self.after)
+        )
+
+
+class Subscription:
+    """The events to send to a client, filtered with the lookups it asked for.
+
+    Args:
+        lookups (dict): The lookups of `TaskFilterBackend` events must match.
+        size (int): The number of events buffered for a client reading slowly.
+    """
+
+    def __init__(self, lookups: dict, size: int):
+        self.lookups = lookups
+        self.queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=size)
+
+    def put(self, message: bytes) -> None:
+        """Queue a message, replacing the whole backlog by `RESYNC` when full."""
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+    async def get(self) -> bytes:
+        """Wait for the next message."""
+        return await self.queue.get()
+
+
+class TaskEventBroker:
+    """Fans the notifications of the task table out to the subscribers of a process."""
+
+    def __init__(self) -> None:
+        self.subscriptions: set[Subscription] = set()
+        self.listener: asyncio.Task | None = None
+        # Resolved once the listener runs LISTEN, or failed to connect.
+        self.ready: asyncio.Future | None = None
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self, lookups: dict) -> abc.AsyncIterator[Subscription]:
+        """Subscribe to the events matching filters for the duration of the block.
+
+        The process starts listening with the first subscriber, and stops
+        when the last one leaves.
+        """
+        subscription = Subscription(lookups, settings.TASKS_EVENTS_QUEUE_SIZE)
+        self.subscriptions.add(subscription)
+        try:
+            if self.listener is None or self.listener.done():
+                self.ready = asyncio.get_running_loop().create_future()
+                self.listener = asyncio.create_task(self.listen(self.ready))
+            # Events are only delivered once LISTEN runs.
+            assert self.ready is not None
+            await asyncio.shield(self.ready)
+            yield subscription
+        finally:
+            self.subscriptions.discard(subscription)
+            if not self.subscriptions and self.listener is not None:
+                listener, self.listener = self.listener, None
+                listener.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await listener
+
+    def publish(self, event: Event) -> None:
+        """Queue an event for the subscribers whose filters it matches."""
+        for subscription in self.subscriptions:
+            if event.matches(subscription.lookups):
+                subscription.put(event.message)
+
+    def resync(self) -> None:
+        """Tell every subscriber that events may have been lost."""
+        for subscription in self.subscriptions:
+            subscription.put(RESYNC)
+
+    async def listen(self, ready: asyncio.Future) -> None:
+        """Publish the events of the notifications, reconnecting when the connection is lost."""
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(
+                    autocommit=True, **get_connection_params()
+                ) as connection:
+                    await connection.execute(f"LISTEN {CHANNEL}")
+                    if ready.done():
+                        # Notifications sent while reconnecting are lost.
+                        self.resync()
+                    else:
+                        ready.set_result(None)
+                    async for notify in connection.notifies():
+                        try:
+                            await self.handle(notify.payload)
+                        except Exception:
+                            logger.exception("Could not publish the task events.")
+                            self.resync()
+            except psycopg.Error:
+                logger.exception("Lost the LISTEN connection of the task events.")
+                if not ready.done():
+                    ready.set_result(None)
+                await asyncio.sleep(RECONNECT_DELAY)
+
+    async def handle(self, payload: str) -> None:
+        """Publish the events of a notification of the trigger."""
+        notification = json.loads(payload)
+        if notification["op"] == "RESYNC":
+            self.resync()
+            return
+        name = EVENT_NAMES[notification["op"]]
+        rows = [
+            {field: parse(row[field]) for field, parse in _FIELD_PARSERS.items()}
+            | {"id": row["id"]}
+            for row in notification["rows"]
+        ]
+        if name == "delete":
+            for row in rows:
+                self.publish(
+                    Event(
+                        _renderer.render_event(name, {"id": row["id"]}),
+                        before=row,
+                        after=None,
+                    )
+                )
+            return
+
+        using = router.db_for_write(tasks_models.Task)
+        tasks = {
+            task.id: task
+            async for task in tasks_models.Task.objects.using(using).filter(
+                id__in=[row["id"] for row in rows]
+            )
+        }
+        for row in rows:
+            task = tasks.get(row["id"])
+            if task is None:
+                # Deleted since, its delete event follows.
+                continue
+            self.publish(
+                Event(
+                    _renderer.render_event(
+                        name, tasks_serializers.TaskSerializer(task).data
+                    ),
+                    before=row if name == "update" else None,
+                    after={field: getattr(task, field) for field in _FIELD_PARSERS},
+                )
+            )
+
+
+broker = TaskEventBroker()
@@ -12,3 +12,78 @@ class TaskNotFoundException(exceptions_handler.BaseAPIError):
             message=f"Task with id={task_id} not found.",
             http_status_code=status.HTTP_404_NOT_FOUND,
         )
+
+
+class InvalidCursorException(exceptions_handler.BaseAPIError):
+    """Exception raised when a pagination cursor cannot be decoded."""
+
+    def __init__(self):
+        super().__init__(
+            error_code="invalid_cursor",
+            message="Given cursor is not valid.",
+            http_status_code=status.HTTP_400_BAD_REQUEST,
+        )
+
+
+class InvalidPageException(exceptions_handler.BaseAPIError):
+    """Exception raised when a page number is not a page of the listing."""
+
+    def __init__(self):
+        super().__init__(
+            error_code="invalid_page",
+            message="Invalid page.",
+            http_status_code=status.HTTP_404_NOT_FOUND,
+        )
+
+
+class ChangesCursorExpiredException(exceptions_handler.BaseAPIError):
+    """Exception raised when the changes since a cursor are no longer all known.
+
+    The tombstones of the tasks deleted since then may have been purged, the
+    client has to sync again from scratch.
+    """
+
+    def __init__(self):
+        super().__init__(
+            error_code="changes_cursor_expired",
+            message="Changes since given cursor are no longer available, sync again without it.",
+            http_status_code=status.HTTP_410_GONE,
+        )
+
+
+class BulkOperationException(exceptions_handler.BaseAPIError):
+    """Exception raised when some items of a bulk request cannot be processed.
+
+    The metadata holds the error payload of each failing item, keyed by its
+    index in the request.
+    """
+
+    def __init__(self, item_errors: dict[int, dict]):
+        super().__init__(
+            error_code="bulk_operation_failed",
+            message="Some items of the batch cannot be processed.",
+            http_status_code=status.HTTP_400_BAD_REQUEST,
+            metadata=item_errors,
+        )
+
+
+class JobNotFoundException(exceptions_handler.BaseAPIError):
+    """Exception raised when a background job is not found."""
+
+    def __init__(self, job_id: int | str):
+        super().__init__(
+            error_code="job_not_found",
+            message=f"Job with id={job_id} not found.",
+            http_status_code=status.HTTP_404_NOT_FOUND,
+        )
+
+
+class JobResultUnavailableException(exceptions_handler.BaseAPIError):
+    """Exception raised when the file of a job is asked before the job wrote it."""
+
+    def __init__(self, job_id: int):
+        super().__init__(
+            error_code="job_result_unavailable",
+            message=f"Job with id={job_id} has no file to download, it is not a succeeded export.",
+            http_status_code=status.HTTP_409_CONFLICT,
+        )
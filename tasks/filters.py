@@ -0,0 +1,129 @@
+"""This module contains the filter backends for the Task API."""
+
+from collections import abc
+
+from django.contrib.postgres import search as postgres_search
+from django.db import models
+from django.db.models import functions as db_functions
+from rest_framework import exceptions as drf_exceptions
+from rest_framework import fields as drf_fields
+from rest_framework import filters
+
+from tasks import models as tasks_models
+
+
+def search_query(terms: str) -> postgres_search.SearchQuery:
+    """Return the full-text query matching search terms typed by a user.
+
+    The web search syntax accepts quoted phrases, `or` and `-` exclusions,
+    and never fails to parse.
+    """
+    return postgres_search.SearchQuery(
+        terms, config=tasks_models.SEARCH_CONFIG, search_type="websearch"
+    )
+
+
+class TaskFilterBackend(filters.BaseFilterBackend):
+    """Filter tasks on their completion status and timestamp ranges.
+
+    Every filter is translated to a WHERE clause, so it runs in the database
+    and can use the indexes declared on the Task model.
+    """
+
+    filter_fields: dict[str, drf_fields.Field] = {
+        "completed": drf_fields.BooleanField(),
+        "created_at__gte": drf_fields.DateTimeField(),
+        "created_at__lte": drf_fields.DateTimeField(),
+        "updated_at__gte": drf_fields.DateTimeField(),
+        "updated_at__lte": drf_fields.DateTimeField(),
+    }
+
+    def get_filters(self, request) -> dict:
+        """Parse the filters given in the query string.
+
+        Raises:
+            ValidationError: If some filter values are not valid.
+        """
+        return self.parse_filters(request.query_params)
+
+    def parse_filters(self, params: abc.Mapping) -> dict:
+        """Parse filters given as query string parameters, e.g. `{"completed": "false"}`.
+
+        Raises:
+            ValidationError: If some filter values are not valid.
+        """
+        lookups = {}
+        errors = {}
+        for param, field in self.filter_fields.items():
+            value = params.get(param)
+            if value is None:
+                continue
+            try:
+                lookups[param] = field.run_validation(value)
+            except drf_exceptions.ValidationError as exc:
+                errors[param] = exc.detail
+        if errors:
+            raise drf_exceptions.ValidationError(errors)
+        return lookups
+
+    def filter_queryset(self, request, queryset, view) -> models.QuerySet:
+        """Return the queryset narrowed to the filters given in the query string."""
+        lookups = self.get_filters(request)
+        if not lookups:
+            return queryset
+        return queryset.filter(**lookups)
+
+    def get_schema_operation_parameters(self, view) -> list[dict]:
+        """Describe the filter query parameters for the OpenAPI schema."""
+        return [
+            {
+                "name": param,
+                "required": False,
+                "in": "query",
+                "schema": (
+                    {"type": "boolean"}
+                    if isinstance(field, drf_fields.BooleanField)
+                    else {"type": "string", "format": "date-time"}
+                ),
+            }
+            for param, field in self.filter_fields.items()
+        ]
+
+
+class TaskSearchBackend(filters.BaseFilterBackend):
+    """Full-text search over the task title and description.
+
+    Matches are found through the GIN index on `Task.search_vector` and
+    annotated with their `rank`, best matches first.
+    """
+
+    search_param = "q"
+
+    def filter_queryset(self, request, queryset, view) -> models.QuerySet:
+        """Return the tasks matching the search terms, ranked by relevance."""
+        terms = request.query_params.get(self.search_param, "").strip()
+        if not terms:
+            return queryset
+        query = search_query(terms)
+        # ts_rank() returns a real, cast it to a double so that a rank read
+        # back from a cursor compares equal to the one computed in SQL.
+        rank = db_functions.Cast(
+            postgres_search.SearchRank("search_vector", query), models.FloatField()
+        )
+        return (
+            queryset.filter(search_vector=query)
+            .annotate(rank=rank)
+            .order_by("-rank", "-created_at", "-id")
+        )
+
+    def get_schema_operation_parameters(self, view) -> list[dict]:
+        """Describe the search query parameter for the OpenAPI schema."""
+        return [
+            {
+                "name": self.search_param,
+                "required": False,
+                "in": "query",
+                "description": "Full-text search terms, results are ranked by relevance.",
+                "schema": {"type": "string"},
+            }
+        ]
@@ -0,0 +1,284 @@
+"""This module contains the background jobs running heavy operations on tasks.
+
+Operations too long for a request, e.g. deleting or exporting millions of
+tasks, are queued as `Job` rows by `POST /api/v1/jobs`, which answers 202
+right away. The worker processes of `manage.py run_task_workers` each claim
+the oldest queued job with `SELECT ... FOR UPDATE SKIP LOCKED`, so workers
+never wait on one another nor run the same job, and the number of workers
+bounds the number of operations running at once.
+
+A claimed job is leased to its worker for `TASKS_JOBS_LEASE_SECONDS`, and
+the lease is extended every time the job reports progress. A job whose
+worker was lost is claimed again once its lease expires, up to
+`TASKS_JOBS_MAX_ATTEMPTS` times.
+"""
+
+import datetime
+import logging
+import tempfile
+import threading
+from collections import abc
+from multiprocessing import synchronize
+
+from django import db
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import models
+from django.db import router
+from django.db import transaction
+from django.utils import timezone
+
+from tasks import filters as tasks_filters
+from tasks import models as tasks_models
+from tasks import renderers as tasks_renderers
+from tasks import representations as tasks_representations
+from tasks import serializers as tasks_serializers
+from tasks import stats as tasks_stats
+
+logger = logging.getLogger(__name__)
+
+# Tasks deleted per statement and transaction by bulk delete jobs, so that
+# rows stay locked briefly and progress shows as the job runs.
+DELETE_BATCH_SIZE = 1000
+
+# Rows fetched per round trip of the server-side cursor of exports, and
+# between two progress reports.
+EXPORT_CHUNK_SIZE = 2000
+
+# The renderers of the export formats.
+EXPORT_RENDERERS: dict[str, type[tasks_renderers.TaskStreamRenderer]] = {
+    renderer.format: renderer
+    for renderer in (
+        tasks_renderers.TaskNDJSONRenderer,
+        tasks_renderers.TaskCSVRenderer,
+    )
+}
+
+Handler = abc.Callable[[tasks_models.Job], dict]
+
+_handlers: dict[str, Handler] = {}
+
+
+class JobLostError(Exception):
+    """Raised when a job was claimed by another worker after its lease expired."""
+
+
+def handler(kind: str) -> abc.Callable[[Handler], Handler]:
+    """Register the function running the jobs of a kind.
+
+    Handlers return the result of the job, stored as JSON, and should report
+    their progress at least once per lease.
+    """
+
+    def register(function: Handler) -> Handler:
+        _handlers[kind] = function
+        return function
+
+    return register
+
+
+def _jobs() -> models.QuerySet:
+    """Return the jobs of the primary database, where workers claim them."""
+    return tasks_models.Job.objects.using(router.db_for_write(tasks_models.Job))
+
+
+def _lease_end() -> datetime.datetime:
+    return timezone.now() + datetime.timedelta(
+        seconds=settings.TASKS_JOBS_LEASE_SECONDS
+    )
+
+
+def claim_job() -> tasks_models.Job | None:
+    """Claim the oldest queued job, or a running one whose worker was lost.
+
+    Jobs locked by other workers in the middle of claiming them are skipped,
+    rather than waited for. Lost jobs claimed `TASKS_JOBS_MAX_ATTEMPTS` times
+    already are failed instead.
+
+    Returns:
+        Job | None: The claimed job, marked running, None if none is pending.
+    """
+    Status = tasks_models.Job.Status
+    while True:
+        now = timezone.now()
+        with transaction.atomic(using=_jobs().db):
+            job = (
+                _jobs()
+                .select_for_update(skip_locked=True)
+                .filter(
+                    models.Q(status=Status.QUEUED)
+                    | models.Q(status=Status.RUNNING, locked_until__lt=now)
+                )
+                .order_by("created_at", "id")
+                .first()
+            )
+            if job is None:
+                return None
+            if job.attempts >= settings.TASKS_JOBS_MAX_ATTEMPTS:
+                job.status = Status.FAILED
+                job.error = "The workers running the job were lost."
+                job.locked_until = None
+                job.finished_at = now
+                job.save(
+                    update_fields=["status", "error", "locked_until", "finished_at"]
+                )
+                continue
+            job.status = Status.RUNNING
+            job.attempts += 1
+            job.started_at = now
+            job.locked_until = _lease_end()
+            job.save(update_fields=["status", "attempts", "started_at", "locked_until"])
+            return job
+
+
+def _owned(job: tasks_models.Job) -> models.QuerySet:
+    """Return the job row while the worker that claimed it still owns it."""
+    return _jobs().filter(
+        pk=job.pk, status=tasks_models.Job.Status.RUNNING, attempts=job.attempts
+    )
+
+
+def report_progress(
+    job: tasks_models.Job, progress: int, total: int | None = None
+) -> None:
+    """Record the progress of a running job and extend its lease.
+
+    Raises:
+        JobLostError: If another worker claimed the job since.
+    """
+    values: dict = {"progress": progress, "locked_until": _lease_end()}
+    if total is not None:
+        values["total"] = total
+    if not _owned(job).update(**values):
+        raise JobLostError(f"Job {job.pk} was claimed by another worker.")
+    job.progress = progress
+    if total is not None:
+        job.total = total
+
+
+def run_job(job: tasks_models.Job) -> None:
+    """Run a claimed job and record its outcome."""
+    Status = tasks_models.Job.Status
+    try:
+        result = _handlers[job.kind](job)
+    except JobLostError:
+        logger.warning("Job %s was claimed by another worker.", job.pk)
+        return
+    except Exception as exc:
+        logger.exception("Job %s failed.", job.pk)
+        values: dict = {"status": Status.FAILED, "error": str(exc) or repr(exc)}
+    else:
+        values = {"status": Status.SUCCEEDED, "result": result}
+    _owned(job).update(locked_until=None, finished_at=timezone.now(), **values)
+
+
+def run_worker(
+    stop: threading.Event | synchronize.Event,
+    poll_interval: float,
+    burst: bool = False,
+) -> int:
+    """Run jobs one after the other until `stop` is set.
+
+    Args:
+        stop (Event): Set to stop once the job at hand is finished.
+        poll_interval (float): Seconds waited before looking for jobs again
+            when none is pending.
+        burst (bool): Whether to stop as soon as no job is pending.
+
+    Returns:
+        int: The number of jobs run.
+    """
+    ran = 0
+    while not stop.is_set():
+        # Like between requests, drop connections that broke or outlived
+        # CONN_MAX_AGE.
+        db.close_old_connections()
+        job = claim_job()
+        if job is None:
+            if burst:
+                break
+            stop.wait(poll_interval)
+            continue
+        logger.info("Running %s.", job)
+        run_job(job)
+        ran += 1
+    return ran
+
+
+def get_tasks(filters: dict) -> models.QuerySet:
+    """Return the tasks matching the list filters stored in the params of a job."""
+    lookups = tasks_filters.TaskFilterBackend().parse_filters(filters)
+    return tasks_models.Task.objects.filter(**lookups)
+
+
+@handler(tasks_models.Job.Kind.BULK_DELETE)
+def bulk_delete(job: tasks_models.Job) -> dict:
+    """Delete the tasks matching the filters, `DELETE_BATCH_SIZE` at a time.
+
+    Workers are processes of their own: the `post_delete` receivers drop the
+    deleted tasks from a shared cache only, the server processes drop them
+    from their local caches when notified of the deletes, see `tasks.cache`.
+    """
+    tasks = get_tasks(job.params["filters"])
+    using = router.db_for_write(tasks_models.Task)
+    report_progress(job, 0, tasks.count())
+    deleted = 0
+    while True:
+        with transaction.atomic(using=using):
+            ids = list(
+                tasks.using(using)
+                .order_by("id")
+                .values_list("id", flat=True)[:DELETE_BATCH_SIZE]
+            )
+            if not ids:
+                break
+            # post_delete receivers make Django load the rows before deleting
+            # them, only their ids are needed.
+            _, rows = (
+                tasks_models.Task.objects.using(using)
+                .filter(id__in=ids)
+                .only("id")
+                .delete()
+            )
+        deleted += rows.get(tasks_models.Task._meta.label, 0)
+        report_progress(job, deleted)
+    return {"deleted": deleted}
+
+
+@handler(tasks_models.Job.Kind.EXPORT)
+def export(job: tasks_models.Job) -> dict:
+    """Write the tasks matching the filters to a file of the default storage."""
+    tasks = get_tasks(job.params.get("filters", {}))
+    renderer = EXPORT_RENDERERS[job.params.get("format", "ndjson")]()
+    fields = job.params.get("fields") or tasks_serializers.TaskSerializer.Meta.fields
+    report_progress(job, 0, tasks.count())
+
+    def items() -> abc.Iterator[dict]:
+        representations = tasks_representations.iter_representations(
+            tasks, fields, EXPORT_CHUNK_SIZE
+        )
+        count = 0
+        for item in representations:
+            yield item
+            count += 1
+            if count % EXPORT_CHUNK_SIZE == 0:
+                report_progress(job, count)
+        report_progress(job, count)
+
+    with tempfile.TemporaryFile() as file:
+        for chunk in renderer.render_stream(items(), fields):
+            file.write(chunk)
+        file.seek(0)
+        name = default_storage.save(
+            f"exports/tasks-{job.pk}.{renderer.format}", File(file)
+        )
+    return {"file": name, "format": renderer.format, "rows": job.progress}
+
+
+@handler(tasks_models.Job.Kind.REBUILD_STATS)
+def rebuild_stats(job: tasks_models.Job) -> dict:
+    """Recompute the daily task counts, see `tasks.stats.rebuild_daily_counts()`."""
+    rows = tasks_stats.rebuild_daily_counts()
+    report_progress(job, rows, rows)
+    return {"daily_counts": rows}
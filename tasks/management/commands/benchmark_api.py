@@ -0,0 +1,154 @@
+"""This module contains the command benchmarking the Task API."""
+
+import datetime
+import json
+import os
+import pathlib
+import platform
+import sys
+
+import django
+from django.core.management import base
+from django.db import connection, connections
+from django.test import utils as test_utils
+
+from tasks import benchmark as tasks_benchmark
+
+
+class Command(base.BaseCommand):
+    """Benchmark the Task API over seeded datasets of growing sizes.
+
+    The benchmark runs in a `benchmark_` database, created for the run like
+    the test runner creates the test database, so neither the development
+    data nor the test database are touched. For each
+    dataset size the task table is seeded, then every scenario of
+    `tasks.benchmark.Benchmark` is timed. Results are written to a JSON
+    file; given the file of a previous run, the command fails when a
+    latency percentile regressed by more than `--max-regression`.
+    """
+
+    help = "Benchmark the Task API over seeded datasets and compare with a baseline."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--sizes",
+            default="10000,100000,1000000",
+            help="Comma-separated numbers of seeded tasks.",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=200,
+            help="Number of requests timed per scenario.",
+        )
+        parser.add_argument(
+            "--export-requests",
+            type=int,
+            default=3,
+            help="Number of full exports timed.",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Seeds the choice of the tasks read.",
+        )
+        parser.add_argument(
+            "--output",
+            default="benchmark.json",
+            help="File the results are written to.",
+        )
+        parser.add_argument(
+            "--baseline",
+            help="Results of a previous run to compare with.",
+        )
+        parser.add_argument(
+            "--max-regression",
+            type=float,
+            default=0.2,
+            help="Slowdown of p50 or p90 tolerated over the baseline, e.g. 0.2 for 20%%.",
+        )
+        parser.add_argument(
+            "--keepdb",
+            action="store_true",
+            help="Keep the benchmark database and its seeded tasks between runs.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        try:
+            sizes = [int(size) for size in options["sizes"].split(",")]
+        except ValueError:
+            raise base.CommandError("--sizes must be comma-separated integers.")
+        if options["requests"] < 1 or options["export_requests"] < 1:
+            raise base.CommandError("Scenarios need at least one timed request.")
+        baseline = None
+        if options["baseline"]:
+            baseline = json.loads(pathlib.Path(options["baseline"]).read_text())
+
+        verbosity = options["verbosity"]
+        # A database of its own, so that a kept benchmark database and the test
+        # database of the suite never replace one another.
+        for alias in connections:
+            settings_dict = connections[alias].settings_dict
+            settings_dict["TEST"]["NAME"] = f"benchmark_{settings_dict['NAME']}"
+        old_config = test_utils.setup_databases(
+            verbosity, interactive=False, keepdb=options["keepdb"]
+        )
+        try:
+            # Production settings: no query log, no request timing.
+            with test_utils.override_settings(DEBUG=False, SERVER_TIMING_SAMPLE_RATE=0):
+                report: dict = {
+                    "started_at": datetime.datetime.now(datetime.UTC).isoformat(),
+                    "environment": self.get_environment(),
+                    "options": {
+                        name: options[name]
+                        for name in ("requests", "export_requests", "seed")
+                    },
+                    "results": self.run(sizes, options),
+                }
+        finally:
+            test_utils.teardown_databases(
+                old_config, verbosity, keepdb=options["keepdb"]
+            )
+
+        pathlib.Path(options["output"]).write_text(json.dumps(report, indent=2) + "\n")
+        self.stdout.write(f"Results written to {options['output']}.")
+        if baseline is not None:
+            regressions = tasks_benchmark.compare(
+                report["results"], baseline["results"], options["max_regression"]
+            )
+            if regressions:
+                raise base.CommandError(
+                    "Performance regressed:\n" + "\n".join(regressions)
+                )
+            self.stdout.write(self.style.SUCCESS("No regression over the baseline."))
+
+    def run(self, sizes: list[int], options: dict) -> dict[str, dict]:
+        """Seed each dataset size and time the scenarios on it."""
+        results = {}
+        for size in sorted(sizes):
+            self.stdout.write(f"Seeding {size} tasks...")
+            tasks_benchmark.seed_tasks(size)
+            benchmark = tasks_benchmark.Benchmark(
+                options["requests"], options["export_requests"], seed=options["seed"]
+            )
+            results[str(size)] = benchmark.run()
+            for scenario, summary in results[str(size)].items():
+                self.stdout.write(
+                    f"  {scenario:<16} p50 {summary['p50_ms']:>9.2f} ms"
+                    f"  p90 {summary['p90_ms']:>9.2f} ms"
+                    f"  p99 {summary['p99_ms']:>9.2f} ms"
+                    f"  {summary['throughput_rps']:>8.1f} req/s"
+                )
+        return results
+
+    def get_environment(self) -> dict:
+        """Describe what the benchmark ran on, to tell comparable runs apart."""
+        return {
+            "python": sys.version.split()[0],
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "database_version": getattr(connection, "pg_version", None),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        }
@@ -0,0 +1,41 @@
+"""This module contains the command building the OpenAPI schema of the API."""
+
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.management import base
+
+from task_manager import schema
+
+
+class Command(base.BaseCommand):
+    """Generate the OpenAPI schema and write it to `API_SCHEMA_FILE`.
+
+    Run at deploy time, so that the processes serving the schema read it from
+    the file instead of each generating it, see `task_manager.schema`. The
+    file is replaced at once, processes never read it half written.
+    """
+
+    help = "Generate the OpenAPI schema and write it to API_SCHEMA_FILE."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--file",
+            default=settings.API_SCHEMA_FILE,
+            help="Path of the JSON file to write, API_SCHEMA_FILE by default.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        if not settings.API_DOCS_ENABLED:
+            # The views are only described by drf_spectacular with the docs on.
+            raise base.CommandError("API_DOCS_ENABLED must be set.")
+        path = options["file"]
+        if not path:
+            raise base.CommandError("Set API_SCHEMA_FILE or pass --file.")
+        content = schema.render_schema(schema.generate_schema(), "json")
+        directory = os.path.dirname(os.path.abspath(path))
+        with tempfile.NamedTemporaryFile(dir=directory, delete=False) as file:
+            file.write(content)
+        os.replace(file.name, path)
+        self.stdout.write(self.style.SUCCESS(f"Wrote the API schema to {path}."))
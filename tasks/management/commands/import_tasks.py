@@ -0,0 +1,258 @@
+"""This module contains the command importing tasks from a CSV or NDJSON file."""
+
+import contextlib
+import csv
+import io
+import itertools
+import pathlib
+import sys
+import time
+import typing
+from collections import abc
+
+import orjson
+from django.core import exceptions as django_exceptions
+from django.core.management import base
+from django.db import connection
+from django.db import models
+from django.db import transaction
+from django.utils import timezone
+
+from tasks import cache as tasks_cache
+from tasks import models as tasks_models
+
+# Columns written by the import, the others are maintained by the database.
+COLUMNS = ("title", "description", "completed", "created_at", "updated_at")
+
+# Number of validation errors listed when an import is rejected.
+MAX_REPORTED_ERRORS = 10
+
+
+class Command(base.BaseCommand):
+    """Import tasks from a CSV or NDJSON file with `COPY FROM STDIN`.
+
+    Rows are read and validated against the constraints of the Task fields
+    one chunk at a time, then each chunk is copied into the table, so memory
+    use does not grow with the size of the file. The import runs in a single
+    transaction: an invalid row rejects the whole file.
+
+    Ids are assigned by the database and a missing `created_at` defaults to
+    now. `updated_at` is set to the time of the import, whatever the file
+    says, so that clients syncing through the change feed download the
+    imported tasks rather than finding them behind their cursor.
+    """
+
+    help = "Import tasks from a CSV (with a header line) or NDJSON file."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("path", help="File to import, or - to read stdin.")
+        parser.add_argument(
+            "--format",
+            choices=["csv", "ndjson"],
+            help="Format of the file. Defaults to the one of its extension.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=10_000,
+            help="Number of rows validated and written at once.",
+        )
+        parser.add_argument(
+            "--no-copy",
+            action="store_true",
+            help="Insert the rows with bulk_create() instead of COPY.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        file_format = options["format"] or self.get_format(options["path"])
+        use_copy = not options["no_copy"] and connection.vendor == "postgresql"
+        write_chunk = self.copy_chunk if use_copy else self.create_chunk
+
+        started = time.perf_counter()
+        imported = 0
+        with self.open(options["path"]) as file, transaction.atomic():
+            items = self.read(file, file_format)
+            while chunk := list(itertools.islice(items, options["chunk_size"])):
+                write_chunk(self.clean_chunk(chunk, first_number=imported + 1))
+                imported += len(chunk)
+                if options["verbosity"] >= 2:
+                    self.stdout.write(f"{imported} tasks written...")
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {imported} tasks in {elapsed:.2f}s "
+                f"({imported / elapsed if elapsed else 0:.0f} tasks/s, "
+                f"{'COPY' if use_copy else 'bulk_create'})."
+            )
+        )
+
+    def get_format(self, path: str) -> str:
+        """Return the format of a file from its extension.
+
+        Raises:
+            CommandError: If the extension is not a known one.
+        """
+        suffix = pathlib.Path(path).suffix.lower()
+        if suffix == ".csv":
+            return "csv"
+        if suffix in (".ndjson", ".jsonl"):
+            return "ndjson"
+        raise base.CommandError(f"Cannot tell the format of {path}, use --format.")
+
+    def open(self, path: str) -> contextlib.AbstractContextManager[typing.TextIO]:
+        """Open the file to import as text."""
+        if path == "-":
+            return contextlib.nullcontext(sys.stdin)
+        try:
+            return open(path, encoding="utf-8", newline="")
+        except OSError as exc:
+            raise base.CommandError(f"Cannot open {path}: {exc.strerror}.")
+
+    def read(self, file, file_format: str) -> abc.Iterator[dict]:
+        """Yield the raw items of the file, one per task.
+
+        Raises:
+            CommandError: If a line of an NDJSON file is not a JSON object.
+        """
+        if file_format == "csv":
+            yield from csv.DictReader(file)
+            return
+        for number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                item = orjson.loads(line)
+            except orjson.JSONDecodeError as exc:
+                raise base.CommandError(f"Line {number} is not valid JSON: {exc}.")
+            if not isinstance(item, dict):
+                raise base.CommandError(f"Line {number} is not a JSON object.")
+            yield item
+
+    def clean_chunk(self, chunk: list[dict], first_number: int) -> list[dict]:
+        """Validate the items of a chunk and return the values to write.
+
+        Raises:
+            CommandError: Listing the first errors, if some items are not valid.
+        """
+        now = timezone.now()
+        rows = []
+        errors = []
+        for number, item in enumerate(chunk, start=first_number):
+            try:
+                rows.append(self.clean_item(item, now))
+            except django_exceptions.ValidationError as exc:
+                errors.append(f"Task {number}: {exc.message_dict}")
+        if errors:
+            raise base.CommandError(
+                "Nothing was imported, some tasks are not valid:\n"
+                + "\n".join(errors[:MAX_REPORTED_ERRORS])
+            )
+        return rows
+
+    def clean_item(self, item: dict, now) -> dict:
+        """Return the values of the task described by an item.
+
+        Raises:
+            ValidationError: If some values break the constraints of their field.
+        """
+        values: dict = {}
+        errors = {}
+        for name in COLUMNS:
+            if name == "updated_at":
+                values[name] = now
+                continue
+            field = tasks_models.Task._meta.get_field(name)
+            assert isinstance(field, models.Field)
+            value = item.get(name)
+            if value is None or value == "":
+                if name == "created_at":
+                    value = now
+                elif field.has_default():
+                    value = field.get_default()
+            elif isinstance(field, models.BooleanField) and isinstance(value, str):
+                # As written by the CSV export.
+                value = {"true": True, "false": False}.get(value.lower(), value)
+            try:
+                value = field.clean(value, None)
+            except django_exceptions.ValidationError as exc:
+                errors[name] = exc.messages
+                continue
+            if name == "created_at" and timezone.is_naive(value):
+                value = timezone.make_aware(value)
+            values[name] = value
+        if errors:
+            raise django_exceptions.ValidationError(errors)
+        return values
+
+    def copy_chunk(self, rows: list[dict]) -> None:
+        """Write rows with `COPY FROM STDIN`.
+
+        COPY sends no signal, so with a shared cache backend the ids the
+        rows may have taken are dropped from the task cache once the import
+        commits, like the receivers of `post_bulk_save` do: clients that
+        looked them up before must not keep getting the cached 404. Local
+        caches live in the processes of the server, whose listeners drop the
+        ids, see `tasks.cache`.
+        """
+        buffer = io.StringIO()
+        # Quoting every value keeps empty strings from being read as NULL.
+        writer = csv.writer(buffer, quoting=csv.QUOTE_ALL)
+        writer.writerows([row[name] for name in COLUMNS] for row in rows)
+        table = connection.ops.quote_name(tasks_models.Task._meta.db_table)
+        columns = ", ".join(connection.ops.quote_name(name) for name in COLUMNS)
+        sql = f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)"
+        sequence = "pg_get_serial_sequence(%s, 'id')"
+        is_shared = not tasks_cache.task_cache.is_local
+        with connection.cursor() as cursor:
+            if is_shared:
+                # The ids are taken from the sequence, after the last one
+                # taken by any session, and up to the last one taken by this
+                # one.
+                cursor.execute(
+                    f"SELECT pg_sequence_last_value({sequence}::regclass)",
+                    [tasks_models.Task._meta.db_table],
+                )
+                first_id = (cursor.fetchone()[0] or 0) + 1
+            driver_cursor = cursor.cursor
+            if hasattr(driver_cursor, "copy_expert"):  # psycopg2
+                buffer.seek(0)
+                driver_cursor.copy_expert(sql, buffer)
+            else:  # psycopg 3
+                with driver_cursor.copy(sql) as copy:
+                    copy.write(buffer.getvalue())
+            if is_shared:
+                cursor.execute(
+                    f"SELECT currval({sequence})", [tasks_models.Task._meta.db_table]
+                )
+                ids = range(first_id, cursor.fetchone()[0] + 1)
+                transaction.on_commit(lambda: tasks_cache.task_cache.invalidate(ids))
+
+    def create_chunk(self, rows: list[dict]) -> None:
+        """Write rows with `bulk_create()`, for databases without COPY."""
+        with _timestamps_kept():
+            tasks_models.Task.objects.bulk_create(
+                [tasks_models.Task(**row) for row in rows]
+            )
+
+
+@contextlib.contextmanager
+def _timestamps_kept() -> abc.Iterator[None]:
+    """Keep the Task timestamps from being set to now when tasks are inserted.
+
+    This switches `auto_now` and `auto_now_add` off for the whole process, so
+    it is only meant for commands.
+    """
+    fields = [
+        field
+        for field in tasks_models.Task._meta.concrete_fields
+        if isinstance(field, models.DateTimeField)
+    ]
+    flags = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, flags):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
@@ -0,0 +1,21 @@
+"""This module contains the command purging the tombstones of deleted tasks."""
+
+from django.core.management import base
+
+from tasks import changes as tasks_changes
+
+
+class Command(base.BaseCommand):
+    """Delete the tombstones older than TASKS_TOMBSTONE_RETENTION_DAYS.
+
+    Tombstones report deleted tasks to the clients syncing through the change
+    feed. Clients that last synced before the retention period are asked to
+    sync again from scratch, so older tombstones are no longer needed. Meant
+    to run daily, e.g. from cron.
+    """
+
+    help = "Delete the tombstones of tasks deleted before the retention period."
+
+    def handle(self, *args, **options) -> None:
+        deleted = tasks_changes.purge_tombstones()
+        self.stdout.write(self.style.SUCCESS(f"Purged {deleted} task tombstones."))
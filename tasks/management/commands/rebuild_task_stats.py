@@ -0,0 +1,20 @@
+"""This module contains the command rebuilding the task statistics."""
+
+from django.core.management import base
+
+from tasks import stats as tasks_stats
+
+
+class Command(base.BaseCommand):
+    """Recompute the daily task counts from the task table.
+
+    The counts are maintained by database triggers, rebuilding them is only
+    needed after they were written by hand or the triggers were disabled,
+    e.g. by a restore. Writes to tasks wait until the rebuild commits.
+    """
+
+    help = "Recompute the daily task counts behind the task statistics."
+
+    def handle(self, *args, **options) -> None:
+        rows = tasks_stats.rebuild_daily_counts()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} daily task counts."))
@@ -0,0 +1,88 @@
+"""This module contains the command running the workers of the background jobs."""
+
+import multiprocessing
+import signal
+import time
+from multiprocessing import synchronize
+
+import django
+from django.conf import settings
+from django.core.management import base
+from django.db import connections
+
+
+def run_worker_process(stop: synchronize.Event, poll_interval: float) -> None:
+    """Entry point of the worker processes, which start before Django is set up."""
+    django.setup()
+    # Models can only be imported once Django is set up.
+    from tasks import jobs as tasks_jobs
+
+    # Ctrl+C reaches the whole process group, the parent sets `stop` so that
+    # the job at hand finishes first.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    tasks_jobs.run_worker(stop, poll_interval)
+
+
+class Command(base.BaseCommand):
+    """Run a pool of worker processes running the queued background jobs.
+
+    Each worker runs one job at a time, so `--workers` bounds the number of
+    heavy operations running at once, see `tasks.jobs`. On SIGINT or SIGTERM
+    the workers finish the job at hand, then exit; workers that die are
+    started again.
+    """
+
+    help = "Run the worker processes running the queued background jobs."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.TASKS_JOBS_WORKERS,
+            help="Number of worker processes.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.TASKS_JOBS_POLL_SECONDS,
+            help="Seconds between two looks for jobs while the queue is empty.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        if options["workers"] < 1:
+            raise base.CommandError("--workers must be at least 1.")
+        # Spawned workers set Django up afresh, with no connection inherited
+        # from this process.
+        context = multiprocessing.get_context("spawn")
+        stop = context.Event()
+        signals: list[int] = []
+        # The handlers only record the signal: setting `stop` from them could
+        # deadlock on the lock of the event, held by the interrupted code.
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda signum, frame: signals.append(signum))
+        connections.close_all()
+
+        def start(index: int) -> multiprocessing.process.BaseProcess:
+            process = context.Process(
+                target=run_worker_process,
+                args=(stop, options["poll_interval"]),
+                name=f"task-worker-{index}",
+            )
+            process.start()
+            return process
+
+        workers = [start(index) for index in range(options["workers"])]
+        self.stdout.write(f"Started {len(workers)} task workers.")
+        while not signals:
+            time.sleep(1)
+            for index, worker in enumerate(workers):
+                if not worker.is_alive():
+                    self.stderr.write(
+                        f"{worker.name} exited with code {worker.exitcode}, restarting it."
+                    )
+                    workers[index] = start(index)
+        self.stdout.write("Stopping, waiting for the jobs at hand to finish...")
+        stop.set()
+        for worker in workers:
+            worker.join()
+        self.stdout.write(self.style.SUCCESS("Task workers stopped."))
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:23
+
+from django.contrib.postgres import operations as postgres_operations
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Indexes are built concurrently so the migration does not block writes.
+    atomic = False
+
+    dependencies = [
+        ("tasks", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="task",
+            options={"ordering": ["-created_at", "-id"]},
+        ),
+        postgres_operations.AddIndexConcurrently(
+            model_name="task",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="task_created_at_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:02
+
+from django.contrib.postgres import operations as postgres_operations
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Indexes are built concurrently so the migration does not block writes.
+    atomic = False
+
+    dependencies = [
+        ("tasks", "0002_task_created_at_id_idx"),
+    ]
+
+    operations = [
+        postgres_operations.AddIndexConcurrently(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("completed", False)),
+                fields=["-created_at", "-id"],
+                name="task_open_created_at_id_idx",
+            ),
+        ),
+        postgres_operations.AddIndexConcurrently(
+            model_name="task",
+            index=models.Index(fields=["updated_at"], name="task_updated_at_idx"),
+        ),
+    ]
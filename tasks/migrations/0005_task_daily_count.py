@@ -0,0 +1,140 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:56
+
+from django.db import migrations, models
+
+
+# Statement-level triggers read the rows written by a statement from its
+# transition tables, so a bulk write or a COPY updates each counter once.
+# Counters are upserted in (day, completed) order so that concurrent
+# statements lock them in the same order and cannot deadlock.
+COUNT_TRIGGERS_SQL = """
+CREATE FUNCTION tasks_task_count_insert() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO tasks_taskdailycount AS counts (day, completed, count)
+    SELECT (created_at AT TIME ZONE 'UTC')::date, completed, count(*)
+    FROM new_rows
+    GROUP BY 1, 2
+    ORDER BY 1, 2
+    ON CONFLICT (day, completed) DO UPDATE SET count = counts.count + EXCLUDED.count;
+    RETURN NULL;
+END;
+$$;
+
+CREATE FUNCTION tasks_task_count_update() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO tasks_taskdailycount AS counts (day, completed, count)
+    SELECT day, completed, sum(delta)
+    FROM (
+        SELECT (created_at AT TIME ZONE 'UTC')::date AS day, completed, -1 AS delta
+        FROM old_rows
+        UNION ALL
+        SELECT (created_at AT TIME ZONE 'UTC')::date, completed, 1
+        FROM new_rows
+    ) AS changes
+    GROUP BY day, completed
+    HAVING sum(delta) <> 0
+    ORDER BY day, completed
+    ON CONFLICT (day, completed) DO UPDATE SET count = counts.count + EXCLUDED.count;
+    RETURN NULL;
+END;
+$$;
+
+CREATE FUNCTION tasks_task_count_delete() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO tasks_taskdailycount AS counts (day, completed, count)
+    SELECT (created_at AT TIME ZONE 'UTC')::date, completed, -count(*)
+    FROM old_rows
+    GROUP BY 1, 2
+    ORDER BY 1, 2
+    ON CONFLICT (day, completed) DO UPDATE SET count = counts.count + EXCLUDED.count;
+    RETURN NULL;
+END;
+$$;
+
+CREATE FUNCTION tasks_task_count_truncate() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    DELETE FROM tasks_taskdailycount;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER task_count_insert
+AFTER INSERT ON tasks_task
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION tasks_task_count_insert();
+
+CREATE TRIGGER task_count_update
+AFTER UPDATE ON tasks_task
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION tasks_task_count_update();
+
+CREATE TRIGGER task_count_delete
+AFTER DELETE ON tasks_task
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION tasks_task_count_delete();
+
+CREATE TRIGGER task_count_truncate
+AFTER TRUNCATE ON tasks_task
+FOR EACH STATEMENT EXECUTE FUNCTION tasks_task_count_truncate();
+"""
+
+DROP_COUNT_TRIGGERS_SQL = """
+DROP TRIGGER task_count_truncate ON tasks_task;
+DROP TRIGGER task_count_delete ON tasks_task;
+DROP TRIGGER task_count_update ON tasks_task;
+DROP TRIGGER task_count_insert ON tasks_task;
+DROP FUNCTION tasks_task_count_truncate();
+DROP FUNCTION tasks_task_count_delete();
+DROP FUNCTION tasks_task_count_update();
+DROP FUNCTION tasks_task_count_insert();
+"""
+
+# Creating the triggers locks the task table against writes until the
+# migration commits, so the counts of the existing tasks stay exact.
+FILL_COUNTS_SQL = """
+INSERT INTO tasks_taskdailycount (day, completed, count)
+SELECT (created_at AT TIME ZONE 'UTC')::date, completed, count(*)
+FROM tasks_task
+GROUP BY 1, 2;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0004_task_search_vector"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskDailyCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("completed", models.BooleanField()),
+                ("count", models.BigIntegerField(default=0)),
+            ],
+            options={
+                "ordering": ["day", "completed"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("day", "completed"),
+                        name="task_daily_count_day_completed_uniq",
+                    )
+                ],
+            },
+        ),
+        migrations.RunSQL(COUNT_TRIGGERS_SQL, DROP_COUNT_TRIGGERS_SQL),
+        migrations.RunSQL(FILL_COUNTS_SQL, migrations.RunSQL.noop),
+    ]
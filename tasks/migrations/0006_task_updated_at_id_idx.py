@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:19
+
+from django.contrib.postgres import operations as postgres_operations
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Indexes are built concurrently so the migration does not block writes.
+    atomic = False
+
+    dependencies = [
+        ("tasks", "0005_task_daily_count"),
+    ]
+
+    operations = [
+        # The composite index is built before the one it replaces is dropped,
+        # so updated_at filters are served by an index throughout.
+        postgres_operations.AddIndexConcurrently(
+            model_name="task",
+            index=models.Index(
+                fields=["updated_at", "id"], name="task_updated_at_id_idx"
+            ),
+        ),
+        postgres_operations.RemoveIndexConcurrently(
+            model_name="task",
+            name="task_updated_at_idx",
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:19
+
+from django.db import migrations, models
+
+
+# A statement-level trigger reads the deleted rows from the transition table
+# of the statement, so a bulk delete writes its tombstones with one INSERT.
+# Tombstones are stamped with the start of the statement, like tasks are
+# stamped with the time they are saved, rather than the start of the
+# transaction.
+TOMBSTONE_TRIGGER_SQL = """
+CREATE FUNCTION tasks_task_tombstone_delete() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO tasks_tasktombstone AS tombstones (task_id, deleted_at)
+    SELECT id, statement_timestamp()
+    FROM old_rows
+    ORDER BY id
+    ON CONFLICT (task_id) DO UPDATE SET deleted_at = EXCLUDED.deleted_at;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER task_tombstone_delete
+AFTER DELETE ON tasks_task
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION tasks_task_tombstone_delete();
+"""
+
+DROP_TOMBSTONE_TRIGGER_SQL = """
+DROP TRIGGER task_tombstone_delete ON tasks_task;
+DROP FUNCTION tasks_task_tombstone_delete();
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0006_task_updated_at_id_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskTombstone",
+            fields=[
+                ("task_id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("deleted_at", models.DateTimeField()),
+            ],
+            options={
+                "ordering": ["deleted_at", "task_id"],
+                "indexes": [
+                    models.Index(
+                        fields=["deleted_at", "task_id"],
+                        name="task_tombstone_deleted_at_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.RunSQL(TOMBSTONE_TRIGGER_SQL, DROP_TOMBSTONE_TRIGGER_SQL),
+    ]
@@ -0,0 +1,87 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:40
+
+from django.db import migrations
+
+
+# Sends the tasks written by each statement on the tasks_task channel, read
+# by tasks.events. Notifications are delivered when the transaction commits.
+# A payload holds at most 8000 bytes, so the rows are sent by chunks of 40,
+# each with the filterable fields of the task: as written for an INSERT, as
+# they were before for an UPDATE or a DELETE.
+NOTIFY_TRIGGER_SQL = """
+CREATE FUNCTION tasks_task_notify() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM pg_notify(
+            'tasks_task',
+            json_build_object('op', TG_OP, 'rows', json_agg(task ORDER BY id))::text
+        )
+        FROM (
+            SELECT
+                id,
+                json_build_object(
+                    'id', id,
+                    'completed', completed,
+                    'created_at', created_at,
+                    'updated_at', updated_at
+                ) AS task,
+                (row_number() OVER (ORDER BY id) - 1) / 40 AS chunk
+            FROM new_rows
+        ) AS tasks
+        GROUP BY chunk;
+    ELSE
+        PERFORM pg_notify(
+            'tasks_task',
+            json_build_object('op', TG_OP, 'rows', json_agg(task ORDER BY id))::text
+        )
+        FROM (
+            SELECT
+                id,
+                json_build_object(
+                    'id', id,
+                    'completed', completed,
+                    'created_at', created_at,
+                    'updated_at', updated_at
+                ) AS task,
+                (row_number() OVER (ORDER BY id) - 1) / 40 AS chunk
+            FROM old_rows
+        ) AS tasks
+        GROUP BY chunk;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER task_notify_insert
+AFTER INSERT ON tasks_task
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION tasks_task_notify();
+
+CREATE TRIGGER task_notify_update
+AFTER UPDATE ON tasks_task
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION tasks_task_notify();
+
+CREATE TRIGGER task_notify_delete
+AFTER DELETE ON tasks_task
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION tasks_task_notify();
+"""
+
+DROP_NOTIFY_TRIGGER_SQL = """
+DROP TRIGGER task_notify_delete ON tasks_task;
+DROP TRIGGER task_notify_update ON tasks_task;
+DROP TRIGGER task_notify_insert ON tasks_task;
+DROP FUNCTION tasks_task_notify();
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0007_task_tombstone"),
+    ]
+
+    operations = [
+        migrations.RunSQL(NOTIFY_TRIGGER_SQL, DROP_NOTIFY_TRIGGER_SQL),
+    ]
@@ -0,0 +1,121 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:10
+
+from django.db import migrations
+
+
+# A statement writing more than 1000 tasks, e.g. an import or a bulk update,
+# sends a single RESYNC notification instead of a notification per 40 rows,
+# each of which every listening process would load and fan out. Clients then
+# reload their tasks. The payload is the same for every statement so that
+# PostgreSQL folds the RESYNC notifications of a transaction into one.
+NOTIFY_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION tasks_task_notify() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    written bigint;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT count(*) INTO written FROM new_rows;
+    ELSE
+        SELECT count(*) INTO written FROM old_rows;
+    END IF;
+    IF written > 1000 THEN
+        PERFORM pg_notify('tasks_task', json_build_object('op', 'RESYNC')::text);
+    ELSIF TG_OP = 'INSERT' THEN
+        PERFORM pg_notify(
+            'tasks_task',
+            json_build_object('op', TG_OP, 'rows', json_agg(task ORDER BY id))::text
+        )
+        FROM (
+            SELECT
+                id,
+                json_build_object(
+                    'id', id,
+                    'completed', completed,
+                    'created_at', created_at,
+                    'updated_at', updated_at
+                ) AS task,
+                (row_number() OVER (ORDER BY id) - 1) / 40 AS chunk
+            FROM new_rows
+        ) AS tasks
+        GROUP BY chunk;
+    ELSE
+        PERFORM pg_notify(
+            'tasks_task',
+            json_build_object('op', TG_OP, 'rows', json_agg(task ORDER BY id))::text
+        )
+        FROM (
+            SELECT
+                id,
+                json_build_object(
+                    'id', id,
+                    'completed', completed,
+                    'created_at', created_at,
+                    'updated_at', updated_at
+                ) AS task,
+                (row_number() OVER (ORDER BY id) - 1) / 40 AS chunk
+            FROM old_rows
+        ) AS tasks
+        GROUP BY chunk;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+"""
+
+# The function as created by 0008_task_notify.
+REVERSE_NOTIFY_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION tasks_task_notify() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM pg_notify(
+            'tasks_task',
+            json_build_object('op', TG_OP, 'rows', json_agg(task ORDER BY id))::text
+        )
+        FROM (
+            SELECT
+                id,
+                json_build_object(
+                    'id', id,
+                    'completed', completed,
+                    'created_at', created_at,
+                    'updated_at', updated_at
+                ) AS task,
+                (row_number() OVER (ORDER BY id) - 1) / 40 AS chunk
+            FROM new_rows
+        ) AS tasks
+        GROUP BY chunk;
+    ELSE
+        PERFORM pg_notify(
+            'tasks_task',
+            json_build_object('op', TG_OP, 'rows', json_agg(task ORDER BY id))::text
+        )
+        FROM (
+            SELECT
+                id,
+                json_build_object(
+                    'id', id,
+                    'completed', completed,
+                    'created_at', created_at,
+                    'updated_at', updated_at
+                ) AS task,
+                (row_number() OVER (ORDER BY id) - 1) / 40 AS chunk
+            FROM old_rows
+        ) AS tasks
+        GROUP BY chunk;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0009_job"),
+    ]
+
+    operations = [
+        migrations.RunSQL(NOTIFY_FUNCTION_SQL, REVERSE_NOTIFY_FUNCTION_SQL),
+    ]
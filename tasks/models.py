@@ -1,6 +1,117 @@
 """This module defines the Task model for the application."""
 
+from asgiref import sync
+from django.contrib.postgres import indexes as postgres_indexes
+from django.contrib.postgres import search as postgres_search
+from django.core import exceptions as django_exceptions
+from django.db import connections
 from django.db import models
+from django.db import transaction
+from django.db.models import signals as model_signals
+from django.db.models import sql
+from django.utils import timezone
+
+from tasks import signals as tasks_signals
+
+# Text search configuration used to build and query the task search vector.
+SEARCH_CONFIG = "english"
+
+
+class TaskQuerySet(models.QuerySet):
+    """QuerySet for the Task model.
+
+    Bulk writes, which skip Model.save() and its signals, send
+    `post_bulk_save` so that receivers can react to them.
+    """
+
+    def update_returning(self, **values) -> list:
+        """Update the tasks with one UPDATE ... RETURNING statement.
+
+        Only the given columns are written, along with `updated_at`. The
+        updated rows are read back by the same statement and `post_save` is
+        sent for each of them, like Model.save() would (`pre_save` is not, the
+        tasks are not loaded before the write).
+
+        Returns:
+            list[Task]: The updated tasks, without their generated columns.
+        """
+        if self.query.is_sliced:
+            raise TypeError("Cannot update a query once a slice has been taken.")
+        self._for_write = True
+        # QuerySet.update() does not apply `auto_now`.
+        values.setdefault("updated_at", timezone.now())
+        query = self.query.chain(sql.UpdateQuery)
+        assert isinstance(query, sql.UpdateQuery)
+        query.add_update_values(values)
+        query.clear_select_clause()
+        connection = connections[self.db]
+        try:
+            update_sql, params = query.get_compiler(self.db).as_sql()
+        except django_exceptions.EmptyResultSet:
+            return []
+        # Generated columns are only used in WHERE clauses, see TaskManager.
+        columns = [
+            (field.attname, field.column)
+            for field in self.model._meta.concrete_fields
+            if field.column is not None and not field.generated
+        ]
+        returning = ", ".join(
+            connection.ops.quote_name(column) for _, column in columns
+        )
+        with (
+            transaction.mark_for_rollback_on_error(using=self.db),
+            connection.cursor() as cursor,
+        ):
+            cursor.execute(f"{update_sql} RETURNING {returning}", params)
+            rows = cursor.fetchall()
+        field_names = [attname for attname, _ in columns]
+        tasks = [self.model.from_db(self.db, field_names, row) for row in rows]
+        for task in tasks:
+            model_signals.post_save.send(
+                sender=self.model,
+                instance=task,
+                created=False,
+                update_fields=frozenset(values),
+                raw=False,
+                using=self.db,
+            )
+        return tasks
+
+    update_returning.alters_data = True  # type: ignore[attr-defined]
+
+    async def aupdate_returning(self, **values) -> list:
+        """Asynchronous version of `update_returning()`."""
+        return await sync.sync_to_async(self.update_returning)(**values)
+
+    aupdate_returning.alters_data = True  # type: ignore[attr-defined]
+
+    def bulk_create(self, objs, *args, **kwargs) -> list:
+        """Insert the tasks and send `post_bulk_save`."""
+        objs = super().bulk_create(objs, *args, **kwargs)
+        tasks_signals.post_bulk_save.send(
+            sender=self.model, instances=objs, created=True
+        )
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs) -> int:
+        """Update the tasks and send `post_bulk_save`."""
+        objs = list(objs)
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        tasks_signals.post_bulk_save.send(
+            sender=self.model, instances=objs, created=False
+        )
+        return rows
+
+
+_TaskManagerBase = models.Manager.from_queryset(TaskQuerySet)
+
+
+class TaskManager(_TaskManagerBase):
+    """Manager for the Task model."""
+
+    def get_queryset(self) -> models.QuerySet:
+        """Return tasks without their search vector, which is only used in WHERE clauses."""
+        return super().get_queryset().defer("search_vector")
 
 
 class Task(models.Model):
@@ -13,6 +124,8 @@ class Task(models.Model):
         completed (bool): Indicates if the task is completed.
         created_at (datetime): Timestamp when the task was created.
         updated_at (datetime): Timestamp when the task was last updated.
+        search_vector (str): Full-text search document over the title and description,
+            maintained by the database.
     """
 
     title = models.CharField(max_length=255)
@@ -23,6 +136,18 @@ class Task(models.Model):
     completed = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    search_vector = models.GeneratedField(
+        expression=(
+            postgres_search.SearchVector("title", weight="A", config=SEARCH_CONFIG)
+            + postgres_search.SearchVector(
+                "description", weight="B", config=SEARCH_CONFIG
+            )
+        ),
+        output_field=postgres_search.SearchVectorField(),
+        db_persist=True,
+    )
+
+    objects = TaskManager()
 
     def __str__(self) -> str:
         """
@@ -33,4 +158,152 @@ class Task(models.Model):
     class Meta:
         """Metaclass for Task model."""
 
-        ordering = ["-created_at"]
+        ordering = ["-created_at", "-id"]
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="task_created_at_id_idx"),
+            # Serves the "open tasks, newest first" listing.
+            models.Index(
+                fields=["-created_at", "-id"],
+                condition=models.Q(completed=False),
+                name="task_open_created_at_id_idx",
+            ),
+            # Serves the change feed, ordered by (updated_at, id), and the
+            # updated_at filters.
+            models.Index(fields=["updated_at", "id"], name="task_updated_at_id_idx"),
+            postgres_indexes.GinIndex(
+                fields=["search_vector"], name="task_search_vector_idx"
+            ),
+        ]
+
+
+class TaskDailyCount(models.Model):
+    """
+    Number of tasks created on a day, by completion status.
+    The rows are maintained by database triggers on the task table, in the
+    transaction of every statement writing tasks, bulk writes and COPY included.
+    Attributes:
+        day (date): The UTC day the tasks were created on.
+        completed (bool): The completion status of the tasks.
+        count (int): The number of tasks.
+    """
+
+    day = models.DateField()
+    completed = models.BooleanField()
+    count = models.BigIntegerField(default=0)
+
+    def __str__(self) -> str:
+        """
+        String representation of the TaskDailyCount instance.
+        """
+        return f"{self.day} completed={self.completed}: {self.count}"
+
+    class Meta:
+        """Metaclass for TaskDailyCount model."""
+
+        ordering = ["day", "completed"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "completed"], name="task_daily_count_day_completed_uniq"
+            ),
+        ]
+
+
+class TaskTombstone(models.Model):
+    """
+    Marks a deleted task, so that the change feed reports its deletion to syncing clients.
+    The rows are written by a database trigger on the task table, for every
+    statement deleting tasks, and purged after TASKS_TOMBSTONE_RETENTION_DAYS.
+    Attributes:
+        task_id (int): The id of the deleted task.
+        deleted_at (datetime): Timestamp when the task was deleted.
+    """
+
+    task_id = models.BigIntegerField(primary_key=True)
+    deleted_at = models.DateTimeField()
+
+    def __str__(self) -> str:
+        """
+        String representation of the TaskTombstone instance.
+        """
+        return f"Task {self.task_id} deleted at {self.deleted_at}"
+
+    class Meta:
+        """Metaclass for TaskTombstone model."""
+
+        ordering = ["deleted_at", "task_id"]
+        indexes = [
+            models.Index(
+                fields=["deleted_at", "task_id"], name="task_tombstone_deleted_at_idx"
+            ),
+        ]
+
+
+class Job(models.Model):
+    """
+    Background job running a heavy operation on tasks, see tasks.jobs.
+    Jobs are queued by the API and run by the workers of `manage.py run_task_workers`.
+    Attributes:
+        kind (str): The operation the job runs.
+        params (dict): The parameters of the operation.
+        status (str): Whether the job is queued, running, succeeded or failed.
+        progress (int): The number of items processed so far.
+        total (int): The number of items to process, once known.
+        result (dict): What the operation returned, once it succeeded.
+        error (str): Why the job failed.
+        attempts (int): The number of times a worker claimed the job.
+        locked_until (datetime): When the worker running the job is deemed lost
+            if it has not reported progress, letting another worker claim it.
+        created_at (datetime): Timestamp when the job was queued.
+        started_at (datetime): Timestamp when a worker last claimed the job.
+        finished_at (datetime): Timestamp when the job succeeded or failed.
+    """
+
+    class Kind(models.TextChoices):
+        """Operations run by jobs."""
+
+        BULK_DELETE = "bulk_delete", "Bulk delete"
+        EXPORT = "export", "Export"
+        REBUILD_STATS = "rebuild_stats", "Rebuild statistics"
+
+    class Status(models.TextChoices):
+        """Stages of the life of a job."""
+
+        QUEUED = "queued", "Queued"
+        RUNNING = "running", "Running"
+        SUCCEEDED = "succeeded", "Succeeded"
+        FAILED = "failed", "Failed"
+
+    kind = models.CharField(max_length=32, choices=Kind.choices)
+    params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(
+        max_length=16, choices=Status.choices, default=Status.QUEUED
+    )
+    progress = models.BigIntegerField(default=0)
+    total = models.BigIntegerField(null=True, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self) -> str:
+        """
+        String representation of the Job instance.
+        """
+        return f"{self.kind} job {self.pk} ({self.status})"
+
+    class Meta:
+        """Metaclass for Job model."""
+
+        ordering = ["-created_at", "-id"]
+        indexes = [
+            # Serves the workers claiming the oldest pending job, and stays as
+            # small as the queue since finished jobs leave it.
+            models.Index(
+                fields=["created_at", "id"],
+                condition=models.Q(status__in=["queued", "running"]),
+                name="job_pending_created_at_id_idx",
+            ),
+        ]
@@ -0,0 +1,94 @@
+"""This module contains the OpenAPI annotations of the Task API views.
+
+The annotations are applied by `annotate_views()` when the schema is
+generated, see `task_manager.openapi`, rather than by decorators on the view
+sets: `extend_schema` loads the whole schema machinery of drf_spectacular,
+which workers serving the API only never use.
+"""
+
+import functools
+
+from drf_spectacular import types as spectacular_types
+from drf_spectacular import utils as spectacular_utils
+from rest_framework import status
+
+from tasks import renderers as tasks_renderers
+from tasks import serializers as tasks_serializers
+from tasks import views as tasks_views
+
+FIELDS_PARAMETER = spectacular_utils.OpenApiParameter(
+    name="fields",
+    type=str,
+    location=spectacular_utils.OpenApiParameter.QUERY,
+    description="Comma-separated fields to return, e.g. `id,title,completed`.",
+)
+
+SINCE_PARAMETER = spectacular_utils.OpenApiParameter(
+    name="since",
+    type=str,
+    location=spectacular_utils.OpenApiParameter.QUERY,
+    description="The `cursor` of the last page read, omit it to read all the tasks.",
+)
+
+PAGE_SIZE_PARAMETER = spectacular_utils.OpenApiParameter(
+    name="page_size",
+    type=int,
+    location=spectacular_utils.OpenApiParameter.QUERY,
+    description="Number of changes to return.",
+)
+
+PAGE_PARAMETER = spectacular_utils.OpenApiParameter(
+    name="page",
+    type=int,
+    location=spectacular_utils.OpenApiParameter.QUERY,
+    description=(
+        "Page number. Switches to page-number pagination, whose responses add "
+        "the total `count` and whether it is `count_estimated`."
+    ),
+)
+
+
+@functools.cache
+def annotate_views() -> None:
+    """Attach the OpenAPI annotations to the view sets, once per process."""
+    spectacular_utils.extend_schema_view(
+        list=spectacular_utils.extend_schema(
+            parameters=[FIELDS_PARAMETER, PAGE_PARAMETER]
+        ),
+        retrieve=spectacular_utils.extend_schema(parameters=[FIELDS_PARAMETER]),
+        export=spectacular_utils.extend_schema(
+            parameters=[FIELDS_PARAMETER],
+            filters=True,
+            responses={
+                (
+                    200,
+                    tasks_renderers.TaskNDJSONRenderer.media_type,
+                ): tasks_serializers.TaskSerializer,
+                (
+                    200,
+                    tasks_renderers.TaskCSVRenderer.media_type,
+                ): spectacular_types.OpenApiTypes.STR,
+            },
+        ),
+        stats=spectacular_utils.extend_schema(
+            filters=False, responses=tasks_serializers.TaskStatsSerializer
+        ),
+        changes=spectacular_utils.extend_schema(
+            filters=False,
+            parameters=[SINCE_PARAMETER, PAGE_SIZE_PARAMETER],
+            responses=tasks_serializers.TaskChangesSerializer,
+        ),
+    )(tasks_views.TaskViewSet)
+    spectacular_utils.extend_schema_view(
+        create=spectacular_utils.extend_schema(
+            responses={status.HTTP_202_ACCEPTED: tasks_serializers.JobSerializer}
+        ),
+        download=spectacular_utils.extend_schema(
+            responses={
+                (
+                    200,
+                    "application/octet-stream",
+                ): spectacular_types.OpenApiTypes.BINARY
+            }
+        ),
+    )(tasks_views.JobViewSet)
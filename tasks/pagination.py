@@ -0,0 +1,483 @@
+"""This module contains the pagination classes for the Task API."""
+
+import base64
+import binascii
+import dataclasses
+import datetime
+import functools
+import json
+from collections import abc
+from typing import Any
+
+from django.conf import settings
+from django.core import paginator as django_paginator
+from django.db import connections
+from django.db import models
+from rest_framework import pagination
+from rest_framework import response as drf_response
+from rest_framework.utils import urls as drf_urls
+
+from tasks import exceptions as tasks_exceptions
+
+
+@dataclasses.dataclass(frozen=True)
+class Cursor:
+    """A position in the (-created_at, -id) keyset of tasks.
+
+    Attributes:
+        created_at (datetime.datetime): The creation time of the row at the position.
+        id (int): The id of the row at the position.
+        reverse (bool): Whether the page is read backwards from the position.
+        rank (float | None): The search rank of the row, when paginating search results.
+    """
+
+    created_at: datetime.datetime
+    id: int
+    reverse: bool = False
+    rank: float | None = None
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    """Encode a cursor into an opaque url-safe token."""
+    values: list = [cursor.created_at.isoformat(), cursor.id, int(cursor.reverse)]
+    if cursor.rank is not None:
+        values.append(cursor.rank)
+    raw = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Cursor:
+    """Decode a token produced by `encode_cursor`.
+
+    Raises:
+        InvalidCursorException: If the token is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        created_at, task_id, reverse, *rank = json.loads(raw)
+        cursor = Cursor(
+            created_at=datetime.datetime.fromisoformat(created_at),
+            id=int(task_id),
+            reverse=bool(reverse),
+            rank=float(*rank) if rank else None,
+        )
+    except (binascii.Error, ValueError, TypeError):
+        raise tasks_exceptions.InvalidCursorException()
+    if cursor.created_at.tzinfo is None:
+        raise tasks_exceptions.InvalidCursorException()
+    return cursor
+
+
+def estimate_count(queryset: models.QuerySet) -> int:
+    """Return the number of rows the query planner expects a queryset to return.
+
+    Planning the query costs a fraction of a millisecond whatever the size
+    of the table. The planner scales `pg_class.reltuples` to the current
+    size of the table, then applies the selectivity of the filters.
+    """
+    plan = json.loads(queryset.order_by().explain(format="json"))
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_rows(queryset: models.QuerySet) -> tuple[int, bool]:
+    """Count the rows of a queryset, estimating the count of large ones.
+
+    Querysets the planner expects to return fewer rows than the
+    `TASKS_COUNT_ESTIMATE_THRESHOLD` setting, e.g. most filtered ones, are
+    counted exactly. Larger ones report the planner's estimate instead of
+    scanning their rows.
+
+    Returns:
+        tuple[int, bool]: The row count and whether it is estimated.
+    """
+    if connections[queryset.db].vendor == "postgresql":
+        estimate = estimate_count(queryset)
+        if estimate >= settings.TASKS_COUNT_ESTIMATE_THRESHOLD:
+            return estimate, True
+    return queryset.count(), False
+
+
+class EstimatedCountPaginator(django_paginator.Paginator):
+    """Django paginator counting large querysets with `count_rows()`.
+
+    Used by the admin changelist. `count_estimated` tells whether `count`,
+    and so the number of pages, is an estimate.
+    """
+
+    count_estimated = False
+
+    @functools.cached_property
+    def count(self) -> int:
+        """Return the exact or estimated number of rows."""
+        if not isinstance(self.object_list, models.QuerySet):
+            return len(self.object_list)
+        count, self.count_estimated = count_rows(self.object_list)
+        return count
+
+
+class BaseTaskPagination(pagination.BasePagination):
+    """Base class of the paginations of task listings.
+
+    A page is read in two steps, so that views can fetch its rows in their
+    own way, e.g. with the async ORM: `get_request_page_queryset()` returns
+    the queryset of the page plus one look-ahead row, `paginate_rows()`
+    turns the fetched rows into the page.
+    """
+
+    page_size = 50
+    max_page_size = 500
+    page_size_query_param = "page_size"
+    ordering: tuple[str, ...] = ("-created_at", "-id")
+
+    def get_page_size(self, request) -> int:
+        """Return the page size requested by the client, bounded by max_page_size."""
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def paginate_queryset(self, queryset, request, view=None) -> list:
+        """Return the rows of the requested page."""
+        page_queryset = self.get_request_page_queryset(queryset, request)
+        return self.paginate_rows(list(page_queryset))
+
+    def get_request_page_queryset(
+        self, queryset: models.QuerySet, request
+    ) -> models.QuerySet:
+        """Return the queryset of the page requested, for a later `paginate_rows`."""
+        raise NotImplementedError
+
+    def paginate_rows(self, rows: abc.Sequence) -> list:
+        """Trim the look-ahead row off a fetched page and return the page."""
+        raise NotImplementedError
+
+    def get_etag_variant(self, rows: abc.Sequence) -> str:
+        """Return what the ETag of a page covers besides its rows.
+
+        Args:
+            rows (Sequence): The fetched rows of the page, look-ahead row included.
+        """
+        return ""
+
+
+class TaskCursorPagination(BaseTaskPagination):
+    """Keyset pagination over tasks ordered by (-created_at, -id).
+
+    Pages are fetched with a range condition on the composite
+    (created_at, id) index instead of an OFFSET, so reading a page costs
+    the same no matter how deep the client has paged. Search results,
+    annotated with a `rank`, are ordered by (-rank, -created_at, -id).
+    """
+
+    cursor_query_param = "cursor"
+
+    def get_cursor(self, request) -> Cursor | None:
+        """Return the cursor given in the query string, if any."""
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        return decode_cursor(token)
+
+    def get_page_queryset(
+        self, queryset: models.QuerySet, cursor: Cursor | None, page_size: int
+    ) -> models.QuerySet:
+        """Return the queryset of the page after the cursor, plus one look-ahead row.
+
+        The redundant `created_at` bound lets the database start the index
+        scan at the cursor, the OR only breaks ties on equal timestamps.
+
+        Raises:
+            InvalidCursorException: If the cursor was not issued for this kind of listing.
+        """
+        ranked = "rank" in queryset.query.annotations
+        if cursor is not None and ranked is (cursor.rank is None):
+            raise tasks_exceptions.InvalidCursorException()
+        if ranked:
+            return self.get_ranked_page_queryset(queryset, cursor, page_size)
+        if cursor is None:
+            return queryset.order_by(*self.ordering)[: page_size + 1]
+        if cursor.reverse:
+            queryset = queryset.filter(
+                models.Q(created_at__gt=cursor.created_at) | models.Q(id__gt=cursor.id),
+                created_at__gte=cursor.created_at,
+            ).order_by("created_at", "id")
+        else:
+            queryset = queryset.filter(
+                models.Q(created_at__lt=cursor.created_at) | models.Q(id__lt=cursor.id),
+                created_at__lte=cursor.created_at,
+            ).order_by(*self.ordering)
+        return queryset[: page_size + 1]
+
+    def get_ranked_page_queryset(
+        self, queryset: models.QuerySet, cursor: Cursor | None, page_size: int
+    ) -> models.QuerySet:
+        """Return the page after the cursor of search results ordered by rank."""
+        ordering: tuple[str, ...] = ("-rank", *self.ordering)
+        if cursor is None:
+            return queryset.order_by(*ordering)[: page_size + 1]
+        if cursor.reverse:
+            ordering = tuple(field.lstrip("-") for field in ordering)
+            lookup = "gt"
+        else:
+            lookup = "lt"
+        queryset = queryset.filter(
+            models.Q(**{f"rank__{lookup}": cursor.rank})
+            | models.Q(rank=cursor.rank, **{f"created_at__{lookup}": cursor.created_at})
+            | models.Q(
+                rank=cursor.rank,
+                created_at=cursor.created_at,
+                **{f"id__{lookup}": cursor.id},
+            )
+        ).order_by(*ordering)
+        return queryset[: page_size + 1]
+
+    def get_position(self, row: Any) -> tuple[datetime.datetime, int, float | None]:
+        """Return the (created_at, id, rank) keyset position of a row."""
+        return row.created_at, row.id, getattr(row, "rank", None)
+
+    def get_cursor_at(self, row: Any, reverse: bool = False) -> Cursor:
+        """Return the cursor pointing at a row."""
+        created_at, task_id, rank = self.get_position(row)
+        return Cursor(created_at, task_id, reverse=reverse, rank=rank)
+
+    def get_request_page_queryset(
+        self, queryset: models.QuerySet, request
+    ) -> models.QuerySet:
+        """Return the queryset of the page requested, for a later `paginate_rows`."""
+        self.request = request
+        self.cursor = self.get_cursor(request)
+        self.page_size = self.get_page_size(request)
+        return self.get_page_queryset(queryset, self.cursor, self.page_size)
+
+    def paginate_rows(self, rows: abc.Sequence) -> list:
+        """Trim the look-ahead row off a fetched page and compute its neighbours."""
+        has_more = len(rows) > self.page_size
+        rows = list(rows[: self.page_size])
+        self.next_cursor: Cursor | None = None
+        self.previous_cursor: Cursor | None = None
+
+        if self.cursor is not None and self.cursor.reverse:
+            rows.reverse()
+            if rows:
+                self.next_cursor = self.get_cursor_at(rows[-1])
+                if has_more:
+                    self.previous_cursor = self.get_cursor_at(rows[0], reverse=True)
+            return rows
+
+        if rows:
+            if has_more:
+                self.next_cursor = self.get_cursor_at(rows[-1])
+            if self.cursor is not None:
+                self.previous_cursor = self.get_cursor_at(rows[0], reverse=True)
+        return rows
+
+    def get_link(self, cursor: Cursor | None) -> str | None:
+        """Return the absolute url of the page at the given cursor."""
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return drf_urls.replace_query_param(
+            url, self.cursor_query_param, encode_cursor(cursor)
+        )
+
+    def get_next_link(self) -> str | None:
+        """Return the url of the next page."""
+        return self.get_link(self.next_cursor)
+
+    def get_previous_link(self) -> str | None:
+        """Return the url of the previous page."""
+        return self.get_link(self.previous_cursor)
+
+    def get_paginated_response(self, data) -> drf_response.Response:
+        """Wrap the page data with the links to its neighbours."""
+        return drf_response.Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        """Describe the paginated response for the OpenAPI schema."""
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view) -> list[dict]:
+        """Describe the pagination query parameters for the OpenAPI schema."""
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+        ]
+
+
+class TaskPageNumberPagination(BaseTaskPagination):
+    """Page-number pagination over tasks, for clients that jump to a page.
+
+    Pages are read with an OFFSET, so deep pages cost more than with
+    `TaskCursorPagination`. The total `count` comes from `count_rows()`:
+    above `TASKS_COUNT_ESTIMATE_THRESHOLD` rows it is the planner's
+    estimate, flagged by `count_estimated`, instead of a COUNT(*) that
+    reads the whole table on every page.
+    """
+
+    page_query_param = "page"
+
+    def get_page_number(self, request) -> int:
+        """Return the page number given in the query string.
+
+        Raises:
+            InvalidPageException: If the page number is not a positive integer.
+        """
+        try:
+            number = int(request.query_params.get(self.page_query_param, 1))
+        except ValueError:
+            number = 0
+        if number < 1:
+            raise tasks_exceptions.InvalidPageException()
+        return number
+
+    def get_request_page_queryset(
+        self, queryset: models.QuerySet, request
+    ) -> models.QuerySet:
+        """Return the queryset of the page requested, plus one look-ahead row."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.page_number = self.get_page_number(request)
+        self.queryset = queryset
+        self.count: int | None = None
+        self.count_estimated = False
+        ordering = self.ordering
+        if "rank" in queryset.query.annotations:
+            ordering = ("-rank", *ordering)
+        offset = (self.page_number - 1) * self.page_size
+        return queryset.order_by(*ordering)[offset : offset + self.page_size + 1]
+
+    def count_page(self, rows: abc.Sequence) -> None:
+        """Set the total `count` of rows given the fetched rows of the page.
+
+        A page without a next one tells the exact count, the other pages
+        count the queryset with `count_rows()`. Runs synchronous queries.
+        """
+        seen = (self.page_number - 1) * self.page_size + len(rows)
+        if len(rows) <= self.page_size:
+            self.count, self.count_estimated = seen, False
+            return
+        self.count, self.count_estimated = count_rows(self.queryset)
+        # An estimate lower than the rows already seen is known to be wrong.
+        self.count = max(self.count, seen)
+
+    def get_etag_variant(self, rows: abc.Sequence) -> str:
+        """Return the count and the links of the page, which the ETag covers.
+
+        The count changes with the rows of the other pages, which the rows of
+        the page do not tell. Counts the rows, see `count_page()`.
+        """
+        if self.count is None:
+            self.count_page(rows)
+        estimated = "~" if self.count_estimated else ""
+        has_next = len(rows) > self.page_size
+        return (
+            f"count={self.count}{estimated};"
+            f"next={int(has_next)};previous={int(self.page_number > 1)}"
+        )
+
+    def paginate_rows(self, rows: abc.Sequence) -> list:
+        """Trim the look-ahead row off a fetched page and count the rows.
+
+        Raises:
+            InvalidPageException: If the page is past the last one.
+        """
+        if not rows and self.page_number > 1:
+            raise tasks_exceptions.InvalidPageException()
+        if self.count is None:
+            self.count_page(rows)
+        self.has_next = len(rows) > self.page_size
+        return list(rows[: self.page_size])
+
+    def get_next_link(self) -> str | None:
+        """Return the url of the next page."""
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return drf_urls.replace_query_param(
+            url, self.page_query_param, self.page_number + 1
+        )
+
+    def get_previous_link(self) -> str | None:
+        """Return the url of the previous page."""
+        if self.page_number == 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page_number == 2:
+            return drf_urls.remove_query_param(url, self.page_query_param)
+        return drf_urls.replace_query_param(
+            url, self.page_query_param, self.page_number - 1
+        )
+
+    def get_paginated_response(self, data) -> drf_response.Response:
+        """Wrap the page data with the row count and the links to its neighbours."""
+        return drf_response.Response(
+            {
+                "count": self.count,
+                "count_estimated": self.count_estimated,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        """Describe the paginated response for the OpenAPI schema."""
+        return {
+            "type": "object",
+            "required": ["count", "count_estimated", "results"],
+            "properties": {
+                "count": {"type": "integer"},
+                "count_estimated": {"type": "boolean"},
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view) -> list[dict]:
+        """Describe the pagination query parameters for the OpenAPI schema."""
+        return [
+            {
+                "name": self.page_query_param,
+                "required": False,
+                "in": "query",
+                "description": "A page number within the paginated result set.",
+                "schema": {"type": "integer"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+        ]
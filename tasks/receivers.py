@@ -0,0 +1,37 @@
+"""This module contains the signal receivers of the tasks application.
+
+It is imported by `TasksConfig.ready()` so that the receivers get connected.
+"""
+
+from django import dispatch
+from django.db import transaction
+from django.db.models import signals as model_signals
+
+from tasks import cache as tasks_cache
+from tasks import models as tasks_models
+from tasks import signals as tasks_signals
+
+
+def _invalidate_cached_tasks(task_ids: list[int]) -> None:
+    """Drop cached tasks now and again once the transaction commits.
+
+    The second pass drops entries cached by readers that saw the previous
+    row between the write and the commit.
+    """
+    tasks_cache.task_cache.invalidate(task_ids)
+    transaction.on_commit(lambda: tasks_cache.task_cache.invalidate(task_ids))
+
+
+@dispatch.receiver(model_signals.post_save, sender=tasks_models.Task)
+@dispatch.receiver(model_signals.post_delete, sender=tasks_models.Task)
+def invalidate_cached_task(sender, instance: tasks_models.Task, **kwargs) -> None:
+    """Drop the cached task after it is saved or deleted."""
+    _invalidate_cached_tasks([instance.pk])
+
+
+@dispatch.receiver(tasks_signals.post_bulk_save, sender=tasks_models.Task)
+def invalidate_cached_tasks(
+    sender, instances: list[tasks_models.Task], **kwargs
+) -> None:
+    """Drop the cached tasks after a bulk write."""
+    _invalidate_cached_tasks([instance.pk for instance in instances])
@@ -0,0 +1,147 @@
+"""This module contains the renderers of the Task API."""
+
+import csv
+import datetime
+from collections import abc
+
+import orjson
+from rest_framework import renderers
+from rest_framework.utils import encoders
+
+from task_manager import timing
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+def _dumps(data) -> bytes:
+    """Encode data like `JSONRenderer` does, with orjson.
+
+    Raises:
+        JSONEncodeError: If some data cannot be encoded by orjson.
+    """
+    ret = orjson.dumps(data, default=encoders.JSONEncoder().default, option=_OPTIONS)
+    # Like JSONRenderer, escape the separators that are invalid in JavaScript.
+    return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+
+
+class TaskJSONRenderer(renderers.JSONRenderer):
+    """JSON renderer encoding with orjson.
+
+    The output is byte for byte the one of `JSONRenderer` for the payloads of
+    the Task API, which hold no floats. Datetimes left in the data are
+    formatted the way `DateTimeField` formats them, so rows can be rendered
+    without serializing their timestamps one by one.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None) -> bytes:
+        """Render the data into compact JSON, timed as the `render` phase of the request."""
+        if data is None:
+            return b""
+        with timing.measure("render"):
+            indent = self.get_indent(accepted_media_type, renderer_context or {})
+            if indent is not None or not self.compact or self.ensure_ascii:
+                return super().render(data, accepted_media_type, renderer_context)
+            try:
+                return _dumps(data)
+            except orjson.JSONEncodeError:
+                return super().render(data, accepted_media_type, renderer_context)
+
+
+class TaskStreamRenderer(renderers.BaseRenderer):
+    """Base class of the renderers streaming task representations one by one.
+
+    Views hand an iterator of representations to `render_stream()` and send
+    the chunks it yields in a `StreamingHttpResponse`.
+    """
+
+    charset = "utf-8"
+
+    def render_stream(
+        self, items: abc.Iterable[dict], fields: abc.Sequence[str]
+    ) -> abc.Iterator[bytes]:
+        """Yield the encoded representations.
+
+        Args:
+            items (Iterable[dict]): The task representations.
+            fields (Sequence[str]): The fields of each representation, in order.
+        """
+        raise NotImplementedError
+
+    def render(self, data, accepted_media_type=None, renderer_context=None) -> bytes:
+        """Render a list of task representations at once."""
+        if not data:
+            return b""
+        return b"".join(self.render_stream(data, tuple(data[0])))
+
+
+class TaskNDJSONRenderer(TaskStreamRenderer):
+    """Renders tasks as newline-delimited JSON, one task per line."""
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+    def render_stream(
+        self, items: abc.Iterable[dict], fields: abc.Sequence[str]
+    ) -> abc.Iterator[bytes]:
+        """Yield one JSON line per task."""
+        for item in items:
+            yield _dumps(item) + b"\n"
+
+
+class _Line:
+    """File-like object handing back what `csv.writer` writes to it."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+class TaskCSVRenderer(TaskStreamRenderer):
+    """Renders tasks as CSV, with a header line naming the fields."""
+
+    media_type = "text/csv"
+    format = "csv"
+
+    def format_value(self, value):
+        """Format a value like its JSON representation."""
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        if isinstance(value, datetime.datetime):
+            value = value.isoformat()
+            if value.endswith("+00:00"):
+                value = value[:-6] + "Z"
+        return value
+
+    def render_stream(
+        self, items: abc.Iterable[dict], fields: abc.Sequence[str]
+    ) -> abc.Iterator[bytes]:
+        """Yield the header line, then one line per task."""
+        writer = csv.writer(_Line())
+        yield writer.writerow(fields).encode()
+        for item in items:
+            yield writer.writerow(
+                [self.format_value(item[field]) for field in fields]
+            ).encode()
+
+
+class TaskEventStreamRenderer(renderers.BaseRenderer):
+    """Renders task events in the text/event-stream format of Server-Sent Events.
+
+    For more information, see:
+    https://html.spec.whatwg.org/multipage/server-sent-events.html
+    """
+
+    media_type = "text/event-stream"
+    format = "event-stream"
+    charset = "utf-8"
+
+    def render_event(self, name: str, data) -> bytes:
+        """Render one event, its data encoded as JSON on a single line."""
+        return b"event: " + name.encode() + b"\ndata: " + _dumps(data) + b"\n\n"
+
+    def render_comment(self, text: str) -> bytes:
+        """Render a comment line, ignored by clients, e.g. to keep the stream alive."""
+        return b": " + text.encode() + b"\n\n"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None) -> bytes:
+        """Render the data as a single `message` event."""
+        return self.render_event("message", data)
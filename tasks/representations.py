@@ -0,0 +1,85 @@
+"""This module builds the representation of tasks straight from database rows.
+
+`TaskSerializer` creates a `Task` instance per row and runs the
+`to_representation()` of each field. List responses rendered as JSON skip
+both: rows are read with `values_list()` and zipped with the output keys,
+and their datetimes are formatted in bulk by `TaskJSONRenderer`.
+"""
+
+from collections import abc
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+from rest_framework import ISO_8601
+from rest_framework import settings as drf_settings
+
+from task_manager import timing
+from tasks import serializers as tasks_serializers
+
+
+def is_supported() -> bool:
+    """Return whether rows render like `TaskSerializer` with the current settings.
+
+    `DateTimeField` converts datetimes to the current time zone and honours
+    `DATETIME_FORMAT`; rows are only used when both leave UTC ISO 8601 output.
+    """
+    return drf_settings.api_settings.DATETIME_FORMAT == ISO_8601 and (
+        not settings.USE_TZ or timezone.get_current_timezone_name() == "UTC"
+    )
+
+
+class TaskRowRepresentation:
+    """Builds the `TaskSerializer` representation of tasks from `values_list()` rows.
+
+    Args:
+        fields (Sequence[str], optional): The fields to represent, in order.
+            Defaults to all the fields of `TaskSerializer`.
+        extra (Iterable[str], optional): Other columns to read, e.g. the ones
+            needed to paginate the rows. They are left out of the representation.
+    """
+
+    def __init__(
+        self, fields: abc.Sequence[str] | None = None, extra: abc.Iterable[str] = ()
+    ):
+        self.fields = tuple(fields or tasks_serializers.TaskSerializer.Meta.fields)
+        # The output keys come first so that zip() stops before the extra columns.
+        self.columns = (
+            *self.fields,
+            *dict.fromkeys(column for column in extra if column not in self.fields),
+        )
+
+    def get_rows(self, queryset: models.QuerySet) -> models.QuerySet:
+        """Return the queryset of named rows holding the columns to read."""
+        return queryset.values_list(*self.columns, named=True)
+
+    def to_representation(self, rows: abc.Iterable[tuple]) -> list[dict]:
+        """Return the representation of each row, timed as the `serialize` phase."""
+        keys = self.fields
+        with timing.measure("serialize"):
+            return [dict(zip(keys, row)) for row in rows]
+
+    def iterator(
+        self, queryset: models.QuerySet, chunk_size: int
+    ) -> abc.Iterator[dict]:
+        """Yield the representation of each task, reading the rows through a
+        server-side cursor `chunk_size` rows at a time."""
+        keys = self.fields
+        for row in self.get_rows(queryset).iterator(chunk_size=chunk_size):
+            yield dict(zip(keys, row))
+
+
+def iter_representations(
+    queryset: models.QuerySet, fields: abc.Sequence[str], chunk_size: int
+) -> abc.Iterator[dict]:
+    """Yield the `TaskSerializer` representation of each task of a queryset.
+
+    Rows are read through a server-side cursor `chunk_size` rows at a time,
+    and represented straight from rows when `is_supported()`.
+    """
+    if is_supported():
+        return TaskRowRepresentation(fields).iterator(queryset, chunk_size)
+    return (
+        tasks_serializers.TaskSerializer(task, fields=fields).data
+        for task in queryset.iterator(chunk_size=chunk_size)
+    )
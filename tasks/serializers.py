@@ -1,13 +1,278 @@
 """This module contains the serializers for the Task model."""
 
+import functools
+from collections import abc
+
+from django.utils import timezone
 from rest_framework import serializers
+
+from task_manager import timing
+from tasks import filters as tasks_filters
 from tasks import models as tasks_models
 
+# Maximum number of items accepted by a bulk request.
+BULK_MAX_ITEMS = 1000
+
+
+class TimedSerializerMixin(serializers.BaseSerializer):
+    """Times validation and representation as the `serialize` phase of the request.
+
+    For more information, see `task_manager.timing`.
+    """
+
+    def is_valid(self, *args, **kwargs) -> bool:
+        with timing.measure("serialize"):
+            return super().is_valid(*args, **kwargs)
+
+    @property
+    def data(self):
+        with timing.measure("serialize"):
+            return super().data
+
+
+class TaskListSerializer(TimedSerializerMixin, serializers.ListSerializer):
+    """List serializer writing a batch of tasks with a single query.
+
+    For more information, see:
+    https://www.django-rest-framework.org/api-guide/serializers/#customizing-listserializer-behavior
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("max_length", BULK_MAX_ITEMS)
+        super().__init__(*args, **kwargs)
+
+    @functools.cached_property
+    def instances_by_id(self) -> dict[int, tasks_models.Task]:
+        """Map the ids of the tasks being updated to the tasks."""
+        return {task.id: task for task in self.instance or ()}
+
+    def validate(self, attrs: list[dict]) -> list[dict]:
+        """Reject batches updating the same task twice."""
+        if self.instance is not None:
+            ids = [item["id"] for item in attrs]
+            if len(ids) != len(set(ids)):
+                raise serializers.ValidationError("Each id may appear only once.")
+        return attrs
+
+    def create(self, validated_data: list[dict]) -> list[tasks_models.Task]:
+        """Insert all the tasks with one INSERT statement."""
+        return tasks_models.Task.objects.bulk_create(
+            [tasks_models.Task(**attrs) for attrs in validated_data]
+        )
+
+    def update(
+        self, instance: list[tasks_models.Task], validated_data: list[dict]
+    ) -> list[tasks_models.Task]:
+        """Update the tasks matching the `id` of each item with one UPDATE statement."""
+        updated_at = timezone.now()
+        fields = {"updated_at"}
+        tasks = []
+        for attrs in validated_data:
+            task = self.instances_by_id[attrs.pop("id")]
+            for field, value in attrs.items():
+                setattr(task, field, value)
+                fields.add(field)
+            # bulk_update() does not apply `auto_now`.
+            task.updated_at = updated_at
+            tasks.append(task)
+        tasks_models.Task.objects.bulk_update(tasks, sorted(fields))
+        return tasks
 
-class TaskSerializer(serializers.ModelSerializer):
-    """Serializer for the Task model."""
+
+class TaskSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """Serializer for the Task model.
+
+    Args:
+        fields (Collection[str], optional): Restricts the representation to
+            these fields, e.g. the sparse fieldset asked by a client.
+    """
+
+    def __init__(self, *args, fields: abc.Collection[str] | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
 
     class Meta:
         model = tasks_models.Task
-        fields = "__all__"
+        fields = ("id", "title", "description", "completed", "created_at", "updated_at")
         read_only_fields = ("id", "created_at", "updated_at")
+        list_serializer_class = TaskListSerializer
+
+
+class TaskBulkUpdateSerializer(TaskSerializer):
+    """Serializer for one item of a bulk update, identified by its `id`."""
+
+    id = serializers.IntegerField(min_value=1)
+
+    def validate_id(self, value: int) -> int:
+        """Check that the task to update exists."""
+        parent = self.parent
+        assert isinstance(parent, TaskListSerializer)
+        if value not in parent.instances_by_id:
+            raise serializers.ValidationError(f"Task with id={value} not found.")
+        return value
+
+    def validate(self, attrs: dict) -> dict:
+        """Require the `id` even though bulk updates are partial."""
+        if "id" not in attrs:
+            raise serializers.ValidationError({"id": ["This field is required."]})
+        return attrs
+
+
+class TaskBulkDestroySerializer(TimedSerializerMixin, serializers.Serializer):
+    """Serializer for the ids of a bulk delete."""
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=BULK_MAX_ITEMS,
+    )
+
+
+class TaskDayStatsSerializer(serializers.Serializer):
+    """Serializer for the number of tasks created on a day."""
+
+    day = serializers.DateField()
+    created = serializers.IntegerField()
+    completed = serializers.IntegerField(
+        help_text="Tasks created on the day that are completed now."
+    )
+
+
+class TaskStatsSerializer(TimedSerializerMixin, serializers.Serializer):
+    """Serializer for the task statistics."""
+
+    total = serializers.IntegerField()
+    completed = serializers.IntegerField()
+    open = serializers.IntegerField()
+    created_per_day = TaskDayStatsSerializer(many=True)
+
+
+class TaskChangeSerializer(serializers.Serializer):
+    """Serializer for a task written or deleted, see `tasks.changes.Change`."""
+
+    id = serializers.IntegerField()
+    deleted = serializers.BooleanField()
+    changed_at = serializers.DateTimeField()
+    task = TaskSerializer(
+        allow_null=True, help_text="The task as written, null when it was deleted."
+    )
+
+
+class TaskChangesSerializer(TimedSerializerMixin, serializers.Serializer):
+    """Serializer for a page of the change feed."""
+
+    changes = TaskChangeSerializer(many=True)
+    cursor = serializers.CharField(
+        allow_null=True,
+        help_text="Position after the changes, to send as `since` on the next call.",
+    )
+    has_more = serializers.BooleanField(
+        help_text="Whether more changes follow, to read right away."
+    )
+
+
+class TaskFiltersField(serializers.DictField):
+    """The list filters of tasks, as given in a query string, e.g. `{"completed": "false"}`."""
+
+    child = serializers.CharField()
+
+    def to_internal_value(self, data) -> dict:
+        """Check the filters the way `TaskFilterBackend` parses them."""
+        data = super().to_internal_value(data)
+        unknown = set(data).difference(tasks_filters.TaskFilterBackend.filter_fields)
+        if unknown:
+            raise serializers.ValidationError(
+                f"Unknown filters: {', '.join(sorted(unknown))}."
+            )
+        tasks_filters.TaskFilterBackend().parse_filters(data)
+        return data
+
+
+class BulkDeleteJobParamsSerializer(serializers.Serializer):
+    """Serializer for the parameters of a `bulk_delete` job."""
+
+    filters = TaskFiltersField(help_text="The list filters of the tasks to delete.")
+
+    def validate_filters(self, value: dict) -> dict:
+        """Require a filter, so that no job deletes all the tasks by mistake."""
+        if not value:
+            raise serializers.ValidationError("Give at least one filter.")
+        return value
+
+
+class ExportJobParamsSerializer(serializers.Serializer):
+    """Serializer for the parameters of an `export` job."""
+
+    format = serializers.ChoiceField(choices=["ndjson", "csv"], default="ndjson")
+    # Declared fields are popped from the class, `fields` keeps its meaning.
+    fields = serializers.ListField(  # type: ignore[assignment]
+        child=serializers.ChoiceField(choices=TaskSerializer.Meta.fields),
+        allow_empty=False,
+        required=False,
+        help_text="The fields to export, all of them when omitted.",
+    )
+    filters = TaskFiltersField(
+        default=dict, help_text="The list filters of the tasks to export."
+    )
+
+    def validate_fields(self, value: list[str]) -> list[str]:
+        """Order the fields the way `TaskSerializer` does."""
+        return [name for name in TaskSerializer.Meta.fields if name in value]
+
+
+class RebuildStatsJobParamsSerializer(serializers.Serializer):
+    """Serializer for the parameters of a `rebuild_stats` job, which takes none."""
+
+
+class JobSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """Serializer for the background jobs, see `tasks.jobs`.
+
+    The `params` of a job are validated by the serializer of its kind.
+    """
+
+    params_serializer_classes: dict[str, type[serializers.Serializer]] = {
+        tasks_models.Job.Kind.BULK_DELETE: BulkDeleteJobParamsSerializer,
+        tasks_models.Job.Kind.EXPORT: ExportJobParamsSerializer,
+        tasks_models.Job.Kind.REBUILD_STATS: RebuildStatsJobParamsSerializer,
+    }
+
+    class Meta:
+        model = tasks_models.Job
+        fields = (
+            "id",
+            "kind",
+            "params",
+            "status",
+            "progress",
+            "total",
+            "result",
+            "error",
+            "attempts",
+            "created_at",
+            "started_at",
+            "finished_at",
+        )
+        read_only_fields = (
+            "id",
+            "status",
+            "progress",
+            "total",
+            "result",
+            "error",
+            "attempts",
+            "created_at",
+            "started_at",
+            "finished_at",
+        )
+
+    def validate(self, attrs: dict) -> dict:
+        """Validate the `params` of the job with the serializer of its kind."""
+        params = self.params_serializer_classes[attrs["kind"]](
+            data=attrs.get("params", {})
+        )
+        if not params.is_valid():
+            raise serializers.ValidationError({"params": params.errors})
+        attrs["params"] = dict(params.validated_data)
+        return attrs
@@ -0,0 +1,8 @@
+"""This module defines the signals sent by the tasks application."""
+
+from django import dispatch
+
+# Sent after tasks were written without going through Model.save(), e.g. by
+# QuerySet.bulk_create() or QuerySet.bulk_update(). Receivers get the written
+# `instances` and whether they were `created`.
+post_bulk_save = dispatch.Signal()
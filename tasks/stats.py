@@ -0,0 +1,62 @@
+"""This module contains the task statistics read from the daily task counts.
+
+`TaskDailyCount` rows are kept up to date by database triggers (see the
+`0005_task_daily_count` migration), so statistics are computed from a few
+rows per day instead of a scan of the task table.
+"""
+
+from django.db import connections
+from django.db import router
+from django.db import transaction
+
+from tasks import models as tasks_models
+
+# Recomputes the daily counts from the task table. The SHARE lock blocks
+# writes to tasks, and the triggers they fire, until the rebuild commits.
+REBUILD_SQL = """
+LOCK TABLE tasks_task IN SHARE MODE;
+DELETE FROM tasks_taskdailycount;
+INSERT INTO tasks_taskdailycount (day, completed, count)
+SELECT (created_at AT TIME ZONE 'UTC')::date, completed, count(*)
+FROM tasks_task
+GROUP BY 1, 2;
+"""
+
+
+def task_stats() -> dict:
+    """Return the task totals by completion status and the tasks created per day.
+
+    Returns:
+        dict: The `total`, `completed` and `open` task counts, and the
+            `created_per_day` histogram, oldest day first.
+    """
+    totals = {False: 0, True: 0}
+    days: dict = {}
+    counts = tasks_models.TaskDailyCount.objects.filter(count__gt=0).values_list(
+        "day", "completed", "count"
+    )
+    for day, completed, count in counts:
+        totals[completed] += count
+        created = days.setdefault(day, {"day": day, "created": 0, "completed": 0})
+        created["created"] += count
+        if completed:
+            created["completed"] += count
+    return {
+        "total": totals[False] + totals[True],
+        "completed": totals[True],
+        "open": totals[False],
+        "created_per_day": list(days.values()),
+    }
+
+
+def rebuild_daily_counts() -> int:
+    """Recompute the daily task counts from scratch.
+
+    Returns:
+        int: The number of daily count rows written.
+    """
+    using = router.db_for_write(tasks_models.TaskDailyCount)
+    with transaction.atomic(using=using):
+        with connections[using].cursor() as cursor:
+            cursor.execute(REBUILD_SQL)
+        return tasks_models.TaskDailyCount.objects.using(using).count()
@@ -0,0 +1,81 @@
+"""This file is used to define common fixtures for the tests of the tasks application."""
+
+import os
+import subprocess
+import sys
+import time
+from collections import abc
+
+import pytest
+from django import db
+from django.conf import settings as django_settings
+from django.core import cache as django_cache
+
+from tasks import cache as tasks_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Start every test with empty caches."""
+    for cache in django_cache.caches.all():
+        cache.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def no_cache_listener(settings):
+    """Keep the task cache listener to the tests asking for it.
+
+    It would clear the cache behind the back of the other tests.
+    """
+    settings.TASKS_CACHE_LISTEN = False
+
+
+@pytest.fixture
+def cache_listener(settings) -> abc.Iterator[tasks_cache.TaskCacheListener]:
+    """Listen for the task writes of other processes, as a server process does."""
+    settings.TASKS_CACHE_LISTEN = True
+    listener = tasks_cache.task_cache.listener
+    listener.start()
+    assert listener.ready.wait(5)
+    yield listener
+    listener.stop()
+
+
+def _call_command_elsewhere(*args: str) -> str:
+    result = subprocess.run(
+        [sys.executable, "manage.py", *args],
+        cwd=django_settings.BASE_DIR,
+        env=os.environ | {"POSTGRES_DB": db.connection.settings_dict["NAME"]},
+        capture_output=True,
+        text=True,
+        timeout=60,
+        check=False,
+    )
+    assert result.returncode == 0, result.stderr
+    return result.stdout
+
+
+@pytest.fixture
+def call_command_elsewhere(transactional_db) -> abc.Callable[..., str]:
+    """Return a function running a management command in a process of its own.
+
+    The command runs on the test database and sees only the committed data,
+    hence the transactional database. The function returns its output.
+    """
+    return _call_command_elsewhere
+
+
+def _wait_until(condition: abc.Callable[[], bool], timeout: float = 5) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@pytest.fixture
+def wait_until() -> abc.Callable[..., bool]:
+    """Return a function telling whether a condition became true within a timeout."""
+    return _wait_until
@@ -0,0 +1,39 @@
+"""Unit tests for the admin module."""
+
+import pytest
+from django.contrib import admin
+from django.urls import reverse
+
+from tasks import admin as task_admin
+from tasks import models as task_models
+
+
+@pytest.mark.django_db
+def testTaskAdminGetSearchResults_whenTermGiven_searchesFullTextIndex(rf) -> None:
+    task = task_models.Task.objects.create(
+        title="Quarterly report", description="Send it to finance."
+    )
+    task_models.Task.objects.create(title="Laundry", description="Whites only.")
+    model_admin = task_admin.TaskAdmin(task_models.Task, admin.site)
+
+    queryset, may_have_duplicates = model_admin.get_search_results(
+        rf.get("/"), task_models.Task.objects.all(), "reports finance"
+    )
+
+    assert list(queryset) == [task]
+    assert may_have_duplicates is False
+    assert "@@" in str(queryset.query)
+
+
+@pytest.mark.django_db
+def testTaskAdminChangelist_whenCountEstimated_saysSo(admin_client, settings) -> None:
+    task_models.Task.objects.create(title="Task", description="")
+
+    settings.TASKS_COUNT_ESTIMATE_THRESHOLD = 10**9
+    exact = admin_client.get(reverse("admin:tasks_task_changelist"))
+    settings.TASKS_COUNT_ESTIMATE_THRESHOLD = 0
+    estimated = admin_client.get(reverse("admin:tasks_task_changelist"))
+
+    assert exact.status_code == estimated.status_code == 200
+    assert "About" not in exact.content.decode()
+    assert "About" in estimated.content.decode()
@@ -0,0 +1,272 @@
+"""Unit tests for the async_views module."""
+
+import json
+
+import pytest
+from asgiref import sync
+from django import test
+from django import urls
+from rest_framework import permissions
+from rest_framework import status
+from rest_framework import throttling
+
+from tasks import async_views as task_async_views
+from tasks import models as task_models
+from tasks import views as task_views
+
+ASGI_URLCONF = "task_manager.asgi_urls"
+
+
+@pytest.fixture
+def async_request(settings):
+    """Send a request to the async views, as served over ASGI."""
+
+    def send(method: str, path: str, **kwargs):
+        urlconf = settings.ROOT_URLCONF
+        settings.ROOT_URLCONF = ASGI_URLCONF
+        try:
+            client = test.AsyncClient()
+            return sync.async_to_sync(getattr(client, method))(path, **kwargs)
+        finally:
+            settings.ROOT_URLCONF = urlconf
+
+    return send
+
+
+def testAsgiUrls_whenCrudPathResolved_returnsAsyncViews() -> None:
+    list_match = urls.resolve("/api/v1/tasks", urlconf=ASGI_URLCONF)
+    detail_match = urls.resolve("/api/v1/tasks/1", urlconf=ASGI_URLCONF)
+    export_match = urls.resolve("/api/v1/tasks/export", urlconf=ASGI_URLCONF)
+
+    assert (
+        getattr(list_match.func, "view_class", None)
+        is task_async_views.TaskAsyncListView
+    )
+    assert (
+        getattr(detail_match.func, "view_class", None)
+        is task_async_views.TaskAsyncDetailView
+    )
+    assert export_match.url_name == "task-export"
+
+
+@pytest.mark.django_db
+def testAsyncList_whenTasksExist_returnsSameBytesAsSyncList(
+    client, async_request
+) -> None:
+    for index in range(3):
+        task_models.Task.objects.create(title=f"Task {index}", description="")
+    params = {"page_size": 2, "completed": "false", "fields": "id,title"}
+
+    sync_response = client.get("/api/v1/tasks", params)
+    async_response = async_request("get", "/api/v1/tasks", data=params)
+
+    assert async_response.status_code == status.HTTP_200_OK
+    assert async_response.content == sync_response.content
+    assert async_response["ETag"] == sync_response["ETag"]
+    assert async_response["Content-Type"] == sync_response["Content-Type"]
+
+
+@pytest.mark.django_db
+def testAsyncList_whenPageUnchanged_returnsNotModified(client, async_request) -> None:
+    task_models.Task.objects.create(title="Task", description="")
+    etag = client.get("/api/v1/tasks")["ETag"]
+
+    response = async_request("get", "/api/v1/tasks", headers={"If-None-Match": etag})
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+@pytest.mark.django_db
+def testAsyncList_whenPageNumberPageUnchanged_returnsNotModified(
+    client, async_request
+) -> None:
+    for i in range(3):
+        task_models.Task.objects.create(title=f"Task {i}", description="")
+    params = {"page": 1, "page_size": 2}
+    etag = client.get("/api/v1/tasks", params)["ETag"]
+
+    response = async_request(
+        "get", "/api/v1/tasks", data=params, headers={"If-None-Match": etag}
+    )
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+@pytest.mark.django_db
+def testAsyncCreate_whenValidDataProvided_createsTask(async_request) -> None:
+    response = async_request(
+        "post",
+        "/api/v1/tasks",
+        data={"title": "New Task", "description": "Description"},
+        content_type="application/json",
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    task = task_models.Task.objects.get()
+    assert json.loads(response.content)["id"] == task.id
+    assert task.title == "New Task"
+
+
+@pytest.mark.django_db
+def testAsyncCreate_whenDataNotValid_returnsSameErrorAsSyncCreate(
+    client, async_request
+) -> None:
+    data = {"title": "x" * 256}
+
+    sync_response = client.post(
+        "/api/v1/tasks", data=data, content_type="application/json"
+    )
+    async_response = async_request(
+        "post", "/api/v1/tasks", data=data, content_type="application/json"
+    )
+
+    assert async_response.status_code == status.HTTP_400_BAD_REQUEST
+    assert async_response.content == sync_response.content
+
+
+@pytest.mark.django_db
+def testAsyncRetrieve_whenTaskCached_returnsSameBytesAsSyncRetrieve(
+    client, async_request
+) -> None:
+    task = task_models.Task.objects.create(title="Task", description="Description")
+
+    miss = async_request("get", f"/api/v1/tasks/{task.id}")
+    hit = client.get(f"/api/v1/tasks/{task.id}")
+
+    assert miss["X-Cache"] == "MISS"
+    assert hit["X-Cache"] == "HIT"
+    assert miss.content == hit.content
+    assert miss["ETag"] == hit["ETag"]
+
+
+@pytest.mark.django_db
+def testAsyncRetrieve_whenTaskMissing_returnsTaskNotFound(
+    client, async_request
+) -> None:
+    async_response = async_request("get", "/api/v1/tasks/999")
+    sync_response = client.get("/api/v1/tasks/999")
+
+    assert async_response.status_code == status.HTTP_404_NOT_FOUND
+    assert json.loads(async_response.content)["error_code"] == "task_not_found"
+    assert async_response.content == sync_response.content
+
+
+@pytest.mark.django_db
+def testAsyncRetrieve_whenFilterExcludesTask_returnsTaskAndCachesNoMiss(
+    async_request,
+) -> None:
+    task = task_models.Task.objects.create(title="Task", description="")
+
+    filtered_response = async_request(
+        "get", f"/api/v1/tasks/{task.id}", data={"completed": "true"}
+    )
+    response = async_request("delete", f"/api/v1/tasks/{task.id}")
+
+    assert filtered_response.status_code == status.HTTP_200_OK
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+
+@pytest.mark.django_db
+def testAsyncUpdate_whenPartialDataProvided_updatesTask(async_request) -> None:
+    task = task_models.Task.objects.create(title="Task", description="Description")
+
+    response = async_request(
+        "patch",
+        f"/api/v1/tasks/{task.id}",
+        data={"completed": True},
+        content_type="application/json",
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert json.loads(response.content)["completed"] is True
+    task.refresh_from_db()
+    assert task.completed is True
+    assert task.updated_at > task.created_at
+
+
+@pytest.mark.django_db
+def testAsyncDelete_whenTaskExists_deletesTask(async_request) -> None:
+    task = task_models.Task.objects.create(title="Task", description="Description")
+
+    response = async_request("delete", f"/api/v1/tasks/{task.id}")
+    missing_response = async_request("delete", f"/api/v1/tasks/{task.id}")
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert not task_models.Task.objects.exists()
+    assert missing_response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def testAsyncView_whenMethodNotAllowed_returnsSameErrorAsSyncView(
+    client, async_request
+) -> None:
+    sync_response = client.put("/api/v1/tasks")
+    async_response = async_request("put", "/api/v1/tasks")
+
+    assert async_response.status_code == sync_response.status_code
+    assert async_response.content == sync_response.content
+
+
+class DenyAllThrottle(throttling.BaseThrottle):
+    def allow_request(self, request, view) -> bool:
+        return False
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "attribute, value",
+    [
+        ("permission_classes", [permissions.IsAuthenticated]),
+        ("throttle_classes", [DenyAllThrottle]),
+    ],
+)
+def testAsyncView_whenViewSetChecksFail_returnsSameErrorAsSyncView(
+    client, async_request, monkeypatch, attribute, value
+) -> None:
+    task = task_models.Task.objects.create(title="Task", description="D")
+    monkeypatch.setattr(task_views.TaskViewSet, attribute, value)
+
+    for path in ("/api/v1/tasks", f"/api/v1/tasks/{task.id}"):
+        sync_response = client.get(path)
+        async_response = async_request("get", path)
+
+        assert sync_response.status_code != status.HTTP_200_OK
+        assert async_response.status_code == sync_response.status_code
+        assert async_response.content == sync_response.content
+
+
+@pytest.mark.django_db
+def testAsyncList_whenPageNumberGiven_returnsSameBytesAsSyncList(
+    client, async_request, settings
+) -> None:
+    settings.TASKS_COUNT_ESTIMATE_THRESHOLD = 0
+    for index in range(3):
+        task_models.Task.objects.create(title=f"Task {index}", description="")
+    params = {"page": 1, "page_size": 2}
+
+    sync_response = client.get("/api/v1/tasks", params)
+    async_response = async_request("get", "/api/v1/tasks", data=params)
+
+    assert async_response.status_code == status.HTTP_200_OK
+    assert async_response.json()["count_estimated"] is True
+    assert async_response.content == sync_response.content
+
+
+@pytest.mark.django_db
+def testAsgiExport_whenTasksExist_streamsAsyncIteratorWithSyncBody(
+    client, async_request
+) -> None:
+    task_models.Task.objects.create(title="Task 1", description="D")
+    task_models.Task.objects.create(title="Task 2", description="D")
+
+    async def read(response) -> bytes:
+        return b"".join([chunk async for chunk in response.streaming_content])
+
+    response = async_request("get", "/api/v1/tasks/export", data={"format": "csv"})
+    sync_response = client.get("/api/v1/tasks/export", {"format": "csv"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.is_async
+    assert sync.async_to_sync(read)(response) == b"".join(
+        sync_response.streaming_content
+    )
@@ -0,0 +1,90 @@
+"""Unit tests for the benchmark module."""
+
+import pytest
+
+from tasks import benchmark as task_benchmark
+from tasks import models as task_models
+
+
+def testSummarize_whenDurationsGiven_returnsNearestRankPercentiles() -> None:
+    durations = [index / 1000 for index in range(100, 0, -1)]
+
+    summary = task_benchmark.summarize(durations, elapsed=2.0)
+
+    assert summary["requests"] == 100
+    assert (summary["p50_ms"], summary["p90_ms"], summary["p99_ms"]) == (50, 90, 99)
+    assert summary["max_ms"] == 100
+    assert summary["mean_ms"] == 50.5
+    assert summary["throughput_rps"] == 50
+
+
+def testCompare_whenSlowerThanTolerated_reportsRegression() -> None:
+    baseline = {"1000": {"list": {"p50_ms": 10, "p90_ms": 20}}}
+    results = {
+        "1000": {
+            "list": {"p50_ms": 11.9, "p90_ms": 30},
+            "search": {"p50_ms": 99, "p90_ms": 99},
+        }
+    }
+
+    regressions = task_benchmark.compare(results, baseline, max_regression=0.2)
+
+    assert regressions == ["list on 1000 tasks: p90_ms 20 -> 30"]
+
+
+@pytest.mark.django_db(transaction=True)
+def testSeedTasks_whenSeededInSteps_seedsSameTasksAsAtOnce() -> None:
+    def seeded() -> list[tuple]:
+        return list(
+            task_models.Task.objects.order_by("created_at").values_list(
+                "title", "description", "completed", "created_at"
+            )
+        )
+
+    assert task_benchmark.seed_tasks(20) == 20
+    assert task_benchmark.seed_tasks(50) == 30
+    in_steps = seeded()
+    task_benchmark.seed_tasks(10)
+    task_benchmark.seed_tasks(50)
+
+    assert seeded() == in_steps
+    assert len(in_steps) == 50
+    assert sum(not completed for _, _, completed, _ in in_steps) == 5
+
+
+@pytest.mark.django_db(transaction=True)
+def testBenchmarkRun_whenTableSeeded_timesEveryScenarioAndRestoresTable(
+    settings,
+) -> None:
+    settings.SERVER_TIMING_SAMPLE_RATE = 0
+    task_benchmark.seed_tasks(60)
+
+    results = task_benchmark.Benchmark(requests=3, export_requests=1).run()
+
+    assert set(results) == {
+        "list",
+        "list_filtered",
+        "search",
+        "retrieve",
+        "create",
+        "update",
+        "delete",
+        "export",
+        "page_serializer",
+        "page_rows",
+    }
+    assert results["list"]["requests"] == 3
+    assert results["export"]["requests"] == 1
+    assert task_models.Task.objects.count() == 60
+
+
+@pytest.mark.django_db(transaction=True)
+def testBenchmarkSampleIds_whenTableHasGaps_returnsIdsOfExistingTasks() -> None:
+    task_benchmark.seed_tasks(30)
+    task_models.Task.objects.filter(id__gt=5, id__lte=25).delete()
+
+    ids = task_benchmark.Benchmark(requests=1).sample_ids(50)
+
+    assert len(ids) == 50
+    assert set(ids) <= set(task_models.Task.objects.values_list("id", flat=True))
+    assert len(set(ids)) > 1
@@ -0,0 +1,173 @@
+"""Unit tests for the cache module."""
+
+import datetime
+from unittest import mock
+
+import pytest
+from asgiref import sync
+from django.urls import reverse
+
+from tasks import cache as task_cache
+from tasks import models as task_models
+
+UPDATED_AT = datetime.datetime(2025, 4, 20, tzinfo=datetime.UTC)
+
+
+def testTaskCacheGet_whenEntryCached_countsHitsAndMisses() -> None:
+    cache = task_cache.TaskCache()
+
+    assert cache.get(1) is None
+    cache.set(1, UPDATED_AT, {"id": 1})
+
+    assert cache.get(1) == (UPDATED_AT, {"id": 1})
+    assert cache.stats() == {"hits": 1, "misses": 1, "missing_hits": 0}
+
+
+def testTaskCacheInvalidate_whenEntriesCached_dropsThem() -> None:
+    cache = task_cache.TaskCache()
+    cache.set(1, UPDATED_AT, {"id": 1})
+    cache.set(2, UPDATED_AT, {"id": 2})
+
+    cache.invalidate([1])
+
+    assert cache.get(1) is None
+    assert cache.get(2) is not None
+
+
+def testTaskCache_whenFull_evictsLeastRecentlyUsedEntry(settings) -> None:
+    cache = task_cache.TaskCache()
+    max_entries = settings.CACHES["tasks"]["OPTIONS"]["MAX_ENTRIES"]
+    for task_id in range(max_entries):
+        cache.set(task_id, UPDATED_AT, {"id": task_id})
+    cache.get(0)
+
+    cache.set(max_entries, UPDATED_AT, {"id": max_entries})
+
+    assert cache.get(0) is not None
+    assert cache.get(1) is None
+    assert cache.get(2) is not None
+
+
+@pytest.mark.django_db
+def testTaskSave_whenTaskCached_invalidatesEntry() -> None:
+    task = task_models.Task.objects.create(title="Task 1", description="")
+    task_cache.task_cache.set(task.id, task.updated_at, {"id": task.id})
+
+    task.save()
+
+    assert task_cache.task_cache.get(task.id) is None
+
+
+def testTaskCacheGetMissing_whenIdKnownMissing_returnsPayload() -> None:
+    cache = task_cache.TaskCache()
+    cache.set(1, UPDATED_AT, {"id": 1})
+    cache.set_missing(2, {"error_code": "task_not_found"})
+
+    assert cache.get_missing(1) is None
+    assert cache.get_missing(2) == {"error_code": "task_not_found"}
+    assert cache.get_missing(3) is None
+    assert cache.missing_hits == 1
+
+
+@pytest.mark.django_db
+def testTaskCreate_whenIdKnownMissing_invalidatesEntry() -> None:
+    task_cache.task_cache.set_missing(10**6, {"error_code": "task_not_found"})
+
+    task_models.Task.objects.create(id=10**6, title="Task", description="")
+
+    assert task_cache.task_cache.get_missing(10**6) is None
+
+
+@pytest.mark.django_db
+def testTaskBulkCreate_whenIdKnownMissing_invalidatesEntry() -> None:
+    task_cache.task_cache.set_missing(10**6, {"error_code": "task_not_found"})
+
+    task_models.Task.objects.bulk_create(
+        [task_models.Task(id=10**6, title="Task", description="")]
+    )
+
+    assert task_cache.task_cache.get_missing(10**6) is None
+
+
+def testTaskCacheSet_whenReadFromReplica_expiresAfterStickinessWindow(
+    settings,
+) -> None:
+    settings.DATABASE_REPLICAS = ["replica_1"]
+    settings.DATABASE_REPLICA_STICKINESS = 5
+    cache = task_cache.TaskCache()
+
+    with mock.patch.object(cache.cache, "set") as cache_set:
+        cache.set(1, UPDATED_AT, {"id": 1}, using="replica_1")
+        cache.set(2, UPDATED_AT, {"id": 2}, using="default")
+        cache.set_missing(3, {"error_code": "task_not_found"}, using="replica_1")
+
+    assert [call.args[2] for call in cache_set.call_args_list] == [
+        5,
+        cache.cache.default_timeout,
+        5,
+    ]
+
+
+@pytest.mark.usefixtures("cache_listener")
+def testTaskCache_whenTasksWrittenByAnotherProcess_dropsTheirEntries(
+    client, call_command_elsewhere, wait_until
+) -> None:
+    renamed, deleted = task_models.Task.objects.bulk_create(
+        [task_models.Task(title=f"Task {i}", description="D") for i in range(2)]
+    )
+    renamed_url = reverse("task-detail", args=[renamed.id])
+    deleted_url = reverse("task-detail", args=[deleted.id])
+    for url in (renamed_url, deleted_url):
+        client.get(url)
+        assert client.get(url)["X-Cache"] == "HIT"
+
+    call_command_elsewhere(
+        "shell",
+        "-c",
+        "from tasks.models import Task; "
+        f"Task.objects.filter(pk={renamed.id}).update(title='Renamed'); "
+        f"Task.objects.filter(pk={deleted.id}).delete()",
+    )
+
+    assert wait_until(lambda: client.get(renamed_url).json()["title"] == "Renamed")
+    assert wait_until(lambda: client.get(deleted_url).status_code == 404)
+
+
+def testTaskCacheListener_whenManyTasksWritten_clearsCache() -> None:
+    cache = task_cache.TaskCache()
+    cache.set(1, UPDATED_AT, {"id": 1})
+    cache.set(2, UPDATED_AT, {"id": 2})
+
+    cache.listener.handle('{"op": "UPDATE", "rows": [{"id": 1}]}')
+    assert cache.get(1) is None
+    assert cache.get(2) is not None
+    cache.listener.handle('{"op": "RESYNC"}')
+
+    assert cache.get(2) is None
+
+
+@pytest.mark.parametrize(
+    "backend",
+    [
+        "django.core.cache.backends.locmem.LocMemCache",
+        "django.core.cache.backends.filebased.FileBasedCache",
+    ],
+)
+def testTaskCacheAget_whenEntriesSetAsync_returnsThem(
+    settings, tmp_path, backend
+) -> None:
+    settings.CACHES = settings.CACHES | {
+        "tasks": {"BACKEND": backend, "LOCATION": str(tmp_path)}
+    }
+    cache = task_cache.TaskCache()
+
+    async def scenario() -> tuple:
+        await cache.aset(1, UPDATED_AT, {"id": 1})
+        await cache.aset_missing(2, {"error_code": "task_not_found"})
+        return await cache.aget(1), await cache.aget_missing(2)
+
+    assert sync.async_to_sync(scenario)() == (
+        (UPDATED_AT, {"id": 1}),
+        {"error_code": "task_not_found"},
+    )
+    assert cache.stats() == {"hits": 1, "misses": 0, "missing_hits": 1}
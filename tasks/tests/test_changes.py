@@ -0,0 +1,196 @@
+"""Unit tests for the change feed of tasks and the tombstones behind it."""
+
+import datetime
+import io
+import threading
+
+import pytest
+from django import db
+from django.core import management
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks import changes as task_changes
+from tasks import models as task_models
+
+
+@pytest.fixture(autouse=True)
+def no_settle_delay(settings):
+    settings.TASKS_CHANGES_SETTLE_SECONDS = 0
+
+
+def read_changes(client, **params) -> dict:
+    response = client.get(reverse("task-changes"), params)
+    assert response.status_code == 200
+    return response.json()
+
+
+def testEncodeChangeCursor_whenDecoded_returnsSameCursor() -> None:
+    cursor = task_changes.ChangeCursor(
+        changed_at=datetime.datetime(2025, 4, 20, 10, 19, 36, 142755, datetime.UTC),
+        id=42,
+    )
+
+    token = task_changes.encode_change_cursor(cursor)
+
+    assert task_changes.decode_change_cursor(token) == cursor
+
+
+@pytest.mark.django_db
+def testTombstones_whenTasksDeleted_recordsEachDeletedTask() -> None:
+    tasks = task_models.Task.objects.bulk_create(
+        [task_models.Task(title=f"Task {i}", description="D") for i in range(3)]
+    )
+
+    task_models.Task.objects.filter(pk__in=[tasks[0].pk, tasks[1].pk]).delete()
+
+    assert sorted(
+        task_models.TaskTombstone.objects.values_list("task_id", flat=True)
+    ) == sorted([tasks[0].pk, tasks[1].pk])
+
+
+@pytest.mark.django_db
+def testChanges_whenTasksWrittenAndDeleted_returnsThemOldestFirst(client) -> None:
+    deleted = task_models.Task.objects.create(title="Deleted", description="D")
+    updated = task_models.Task.objects.create(title="Updated", description="D")
+    deleted_id = deleted.id
+    deleted.delete()
+    updated.title = "Renamed"
+    updated.save()
+
+    body = read_changes(client)
+
+    assert [(change["id"], change["deleted"]) for change in body["changes"]] == [
+        (deleted_id, True),
+        (updated.id, False),
+    ]
+    assert body["changes"][0]["task"] is None
+    assert body["changes"][1]["task"]["title"] == "Renamed"
+    assert body["has_more"] is False
+
+
+@pytest.mark.django_db
+def testChanges_whenSinceGiven_returnsOnlyLaterChanges(client) -> None:
+    ids = [
+        task_models.Task.objects.create(title=f"Task {i}", description="D").id
+        for i in range(3)
+    ]
+
+    first = read_changes(client, page_size=2)
+    second = read_changes(client, since=first["cursor"], page_size=2)
+    task_models.Task.objects.filter(pk=ids[0]).delete()
+    third = read_changes(client, since=second["cursor"])
+    fourth = read_changes(client, since=third["cursor"])
+
+    assert [change["id"] for change in first["changes"]] == ids[:2]
+    assert first["has_more"] is True
+    assert [change["id"] for change in second["changes"]] == [ids[2]]
+    assert second["has_more"] is False
+    assert [(change["id"], change["deleted"]) for change in third["changes"]] == [
+        (ids[0], True)
+    ]
+    assert fourth == {"changes": [], "cursor": third["cursor"], "has_more": False}
+
+
+@pytest.mark.django_db
+def testChanges_whenChangeIsRecent_waitsForItToSettle(client, settings) -> None:
+    settings.TASKS_CHANGES_SETTLE_SECONDS = 60
+    task_models.Task.objects.create(title="Task", description="D")
+
+    body = read_changes(client)
+
+    assert body == {"changes": [], "cursor": None, "has_more": False}
+
+
+@pytest.mark.django_db
+def testChanges_whenTasksImportedAfterCursor_returnsThem(client, tmp_path) -> None:
+    task_models.Task.objects.create(title="Task", description="D")
+    cursor = read_changes(client)["cursor"]
+    path = tmp_path / "tasks.csv"
+    path.write_text(
+        "title,description,completed,created_at,updated_at\n"
+        "Old,D,false,2024-01-02T03:04:05+00:00,2024-01-02T03:04:05+00:00\n"
+    )
+
+    management.call_command("import_tasks", str(path), stdout=io.StringIO())
+    body = read_changes(client, since=cursor)
+
+    assert [change["task"]["title"] for change in body["changes"]] == ["Old"]
+
+
+@pytest.mark.django_db(transaction=True)
+def testChanges_whenWritingTransactionStillOpen_waitsForItToCommit(client) -> None:
+    fast = task_models.Task.objects.create(title="Fast", description="D")
+    is_written = threading.Event()
+    release = threading.Event()
+
+    def write() -> None:
+        try:
+            with db.transaction.atomic():
+                task_models.Task.objects.create(title="Slow", description="D")
+                is_written.set()
+                release.wait(5)
+        finally:
+            db.connection.close()
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    try:
+        assert is_written.wait(5)
+        # Renaming leaves the daily counters the open transaction locks alone.
+        fast.title = "Renamed"
+        fast.save()
+        during = read_changes(client)
+    finally:
+        release.set()
+        writer.join()
+    after = read_changes(client)
+
+    assert during == {"changes": [], "cursor": None, "has_more": False}
+    assert [change["task"]["title"] for change in after["changes"]] == [
+        "Slow",
+        "Renamed",
+    ]
+
+
+@pytest.mark.django_db
+def testChanges_whenCursorOlderThanRetention_returnsGone(client) -> None:
+    cursor = task_changes.ChangeCursor(
+        timezone.now() - datetime.timedelta(days=365), id=1
+    )
+
+    response = client.get(
+        reverse("task-changes"), {"since": task_changes.encode_change_cursor(cursor)}
+    )
+
+    assert response.status_code == 410
+    assert response.json()["error_code"] == "changes_cursor_expired"
+
+
+@pytest.mark.django_db
+def testChanges_whenCursorMalformed_returnsInvalidCursor(client) -> None:
+    response = client.get(reverse("task-changes"), {"since": "not-a-cursor"})
+
+    assert response.status_code == 400
+    assert response.json()["error_code"] == "invalid_cursor"
+
+
+@pytest.mark.django_db
+def testPurgeTaskTombstones_whenTombstonesExpired_deletesOnlyThem() -> None:
+    now = timezone.now()
+    task_models.TaskTombstone.objects.bulk_create(
+        [
+            task_models.TaskTombstone(
+                task_id=1, deleted_at=now - datetime.timedelta(days=31)
+            ),
+            task_models.TaskTombstone(task_id=2, deleted_at=now),
+        ]
+    )
+    stdout = io.StringIO()
+
+    management.call_command("purge_task_tombstones", stdout=stdout)
+
+    assert "Purged 1 task tombstones" in stdout.getvalue()
+    assert list(
+        task_models.TaskTombstone.objects.values_list("task_id", flat=True)
+    ) == [2]
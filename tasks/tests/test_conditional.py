@@ -0,0 +1,26 @@
+"""Unit tests for the conditional module."""
+
+import datetime
+
+from tasks import conditional as task_conditional
+
+UPDATED_AT = datetime.datetime(2025, 4, 20, 10, 19, 36, 142755, datetime.UTC)
+
+
+def testTaskEtag_whenUpdatedAtChanges_returnsDifferentTag() -> None:
+    etag = task_conditional.task_etag(1, UPDATED_AT, "json")
+
+    assert etag == '"1-1745144376142755-json"'
+    assert etag != task_conditional.task_etag(
+        1, UPDATED_AT + datetime.timedelta(microseconds=1), "json"
+    )
+    assert etag != task_conditional.task_etag(1, UPDATED_AT, "api")
+
+
+def testPageEtag_whenRowLeavesPage_returnsDifferentTag() -> None:
+    later = UPDATED_AT + datetime.timedelta(seconds=1)
+    etag = task_conditional.page_etag([(1, UPDATED_AT), (2, later)], "json")
+
+    # Same count and latest timestamp, but another row.
+    assert etag != task_conditional.page_etag([(3, UPDATED_AT), (2, later)], "json")
+    assert etag == task_conditional.page_etag([(1, UPDATED_AT), (2, later)], "json")
@@ -0,0 +1,139 @@
+"""Unit tests for the live events of tasks and their Server-Sent Events stream."""
+
+import asyncio
+import datetime
+
+import pytest
+from asgiref import sync
+from django import test
+
+from tasks import async_views as task_async_views
+from tasks import events as task_events
+from tasks import models as task_models
+
+NOW = datetime.datetime(2025, 4, 20, 10, 0, tzinfo=datetime.UTC)
+
+
+async def next_message(subscription: task_events.Subscription) -> bytes:
+    return await asyncio.wait_for(subscription.get(), timeout=5)
+
+
+def testEventMatches_whenTaskLeavesFilter_matchesOnItsStateBefore() -> None:
+    event = task_events.Event(
+        b"",
+        before={"completed": False, "created_at": NOW, "updated_at": NOW},
+        after={"completed": True, "created_at": NOW, "updated_at": NOW},
+    )
+
+    assert event.matches({"completed": False})
+    assert event.matches({"completed": True, "created_at__gte": NOW})
+    assert not event.matches({"created_at__lte": NOW - datetime.timedelta(days=1)})
+
+
+def testSubscriptionPut_whenQueueFull_replacesBacklogWithResync() -> None:
+    subscription = task_events.Subscription({}, size=2)
+
+    for message in (b"1", b"2", b"3"):
+        subscription.put(message)
+
+    assert subscription.queue.qsize() == 1
+    assert subscription.queue.get_nowait() == task_events.RESYNC
+
+
+@pytest.mark.django_db(transaction=True)
+def testBroker_whenTasksWritten_publishesMatchingEventsOnce() -> None:
+    create = sync.sync_to_async(task_models.Task.objects.create)
+
+    async def scenario() -> list[bytes]:
+        broker = task_events.TaskEventBroker()
+        async with (
+            broker.subscribe({"completed": False}) as open_tasks,
+            broker.subscribe({}) as all_tasks,
+        ):
+            task = await create(title="Open", description="D")
+            await create(title="Done", description="D", completed=True)
+            await task_models.Task.objects.filter(pk=task.pk).aupdate(completed=True)
+            await create(title="Last", description="D")
+            messages = [await next_message(open_tasks) for _ in range(3)]
+            messages.append(await next_message(all_tasks))
+        assert broker.listener is None
+        return messages
+
+    messages = sync.async_to_sync(scenario)()
+
+    assert messages[0].startswith(b'event: create\ndata: {"id":')
+    assert b'"title":"Open"' in messages[0]
+    assert messages[1].startswith(b"event: update\n")
+    assert b'"completed":true' in messages[1]
+    assert b'"title":"Last"' in messages[2]
+    assert b'"title":"Open"' in messages[3]
+
+
+@pytest.mark.django_db(transaction=True)
+def testBroker_whenStatementWritesManyTasks_publishesSingleResync() -> None:
+    bulk_create = sync.sync_to_async(task_models.Task.objects.bulk_create)
+    create = sync.sync_to_async(task_models.Task.objects.create)
+
+    async def scenario() -> list[bytes]:
+        broker = task_events.TaskEventBroker()
+        async with broker.subscribe({}) as subscription:
+            await bulk_create(
+                [
+                    task_models.Task(title=f"Task {i}", description="D")
+                    for i in range(1001)
+                ]
+            )
+            await create(title="Last", description="D")
+            return [await next_message(subscription) for _ in range(2)]
+
+    messages = sync.async_to_sync(scenario)()
+
+    assert messages[0] == task_events.RESYNC
+    assert b'"title":"Last"' in messages[1]
+
+
+@pytest.mark.django_db(transaction=True)
+def testEventStream_whenTaskDeleted_streamsDeleteEvent() -> None:
+    task = task_models.Task.objects.create(title="Task", description="D")
+    view = task_async_views.TaskEventStreamView()
+
+    async def scenario() -> list[bytes]:
+        stream = view.stream({})
+        try:
+            chunks = [await anext(stream)]
+            await task_models.Task.objects.filter(pk=task.pk).adelete()
+            chunks.append(await asyncio.wait_for(anext(stream), timeout=5))
+        finally:
+            await stream.aclose()
+        return chunks
+
+    chunks = sync.async_to_sync(scenario)()
+
+    assert chunks == [
+        b": connected\n\n",
+        f'event: delete\ndata: {{"id":{task.id}}}\n\n'.encode(),
+    ]
+    assert not task_events.broker.subscriptions
+
+
+def testEventStream_whenFilterInvalid_returnsValidationError() -> None:
+    view = task_async_views.TaskEventStreamView.as_view()
+    request = test.AsyncRequestFactory().get(
+        "/api/v1/tasks/events", {"completed": "maybe"}
+    )
+
+    response = sync.async_to_sync(view)(request)
+
+    assert response.status_code == 400
+    assert response["Content-Type"] == "application/json"
+
+
+def testEventStream_whenOpened_disablesCachingAndBuffering() -> None:
+    view = task_async_views.TaskEventStreamView.as_view()
+    request = test.AsyncRequestFactory().get("/api/v1/tasks/events")
+
+    response = sync.async_to_sync(view)(request)
+
+    assert response["Content-Type"] == "text/event-stream; charset=utf-8"
+    assert response["Cache-Control"] == "no-cache"
+    assert response["X-Accel-Buffering"] == "no"
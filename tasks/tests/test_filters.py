@@ -0,0 +1,81 @@
+"""Unit tests for the filters module."""
+
+import datetime
+
+import pytest
+from rest_framework import exceptions as rest_framework_exceptions
+from rest_framework import request as drf_request
+from rest_framework import test as drf_test
+
+from tasks import filters as task_filters
+from tasks import models as task_models
+
+
+def _request(**params) -> drf_request.Request:
+    return drf_request.Request(drf_test.APIRequestFactory().get("/", params))
+
+
+@pytest.mark.django_db
+def testFilterQueryset_whenCompletedGiven_returnsMatchingTasks() -> None:
+    open_task = task_models.Task.objects.create(title="Open", description="")
+    task_models.Task.objects.create(title="Done", description="", completed=True)
+
+    queryset = task_filters.TaskFilterBackend().filter_queryset(
+        _request(completed="false"), task_models.Task.objects.all(), None
+    )
+
+    assert list(queryset) == [open_task]
+
+
+@pytest.mark.django_db
+def testFilterQueryset_whenUpdatedAtRangeGiven_returnsTasksInRange() -> None:
+    old_task = task_models.Task.objects.create(title="Old", description="")
+    new_task = task_models.Task.objects.create(title="New", description="")
+    task_models.Task.objects.filter(id=old_task.id).update(
+        updated_at=datetime.datetime(2025, 1, 1, tzinfo=datetime.UTC)
+    )
+
+    queryset = task_filters.TaskFilterBackend().filter_queryset(
+        _request(updated_at__gte="2025-06-01T00:00:00Z"),
+        task_models.Task.objects.all(),
+        None,
+    )
+
+    assert list(queryset) == [new_task]
+
+
+def testGetFilters_whenValuesAreInvalid_raisesValidationError() -> None:
+    with pytest.raises(rest_framework_exceptions.ValidationError) as exc_info:
+        task_filters.TaskFilterBackend().get_filters(
+            _request(completed="maybe", created_at__lte="yesterday")
+        )
+
+    assert set(exc_info.value.detail) == {"completed", "created_at__lte"}
+
+
+@pytest.mark.django_db
+def testSearchFilterQueryset_whenTermsGiven_returnsMatchesRankedByRelevance() -> None:
+    in_description = task_models.Task.objects.create(
+        title="Groceries", description="Buy milk and bread."
+    )
+    in_title = task_models.Task.objects.create(
+        title="Milk the cows", description="Before sunrise."
+    )
+    task_models.Task.objects.create(title="Laundry", description="Whites only.")
+
+    queryset = task_filters.TaskSearchBackend().filter_queryset(
+        _request(q="milk"), task_models.Task.objects.all(), None
+    )
+
+    assert list(queryset) == [in_title, in_description]
+
+
+@pytest.mark.django_db
+def testSearchFilterQueryset_whenNoTermsGiven_returnsQuerysetUnchanged() -> None:
+    queryset = task_models.Task.objects.all()
+
+    filtered = task_filters.TaskSearchBackend().filter_queryset(
+        _request(q="  "), queryset, None
+    )
+
+    assert filtered is queryset
@@ -0,0 +1,128 @@
+"""Unit tests for the import_tasks management command."""
+
+import datetime
+import io
+
+import pytest
+from django.core import management
+from django.core.management import base
+from django.urls import reverse
+
+from tasks import models as task_models
+
+CREATED_AT = datetime.datetime(2024, 1, 2, 3, 4, 5, 678901, datetime.UTC)
+
+
+def import_tasks(path, *args) -> str:
+    stdout = io.StringIO()
+    management.call_command("import_tasks", str(path), *args, stdout=stdout)
+    return stdout.getvalue()
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize("options", [(), ("--no-copy",)])
+def testImportTasks_whenCsvValid_importsTasksWithTheirCreationTime(
+    tmp_path, options
+) -> None:
+    path = tmp_path / "tasks.csv"
+    path.write_text(
+        "title,description,completed,created_at\n"
+        f'Old,"With, comma",true,{CREATED_AT.isoformat()}\n'
+        "New,Description,,\n"
+    )
+
+    output = import_tasks(path, "--chunk-size", "1", *options)
+
+    assert "Imported 2 tasks" in output
+    old, new = task_models.Task.objects.order_by("created_at")
+    assert (old.title, old.description, old.completed) == ("Old", "With, comma", True)
+    assert old.created_at == CREATED_AT
+    assert old.updated_at > CREATED_AT
+    assert (new.title, new.completed) == ("New", False)
+    assert new.created_at > CREATED_AT
+    assert task_models.Task.objects.filter(search_vector="comma").get() == old
+
+
+@pytest.mark.django_db(transaction=True)
+def testImportTasks_whenNdjsonValid_importsTasks(tmp_path) -> None:
+    path = tmp_path / "tasks.ndjson"
+    path.write_text(
+        '{"id": 7, "title": "Imported", "description": "From NDJSON", "completed": true}\n'
+    )
+
+    import_tasks(path)
+
+    task = task_models.Task.objects.get()
+    assert (task.title, task.description, task.completed) == (
+        "Imported",
+        "From NDJSON",
+        True,
+    )
+
+
+def cache_missing_ids(client, count: int) -> list[str]:
+    last = task_models.Task.objects.create(title="Last", description="D")
+    urls = [reverse("task-detail", args=[last.id + i]) for i in range(1, count + 1)]
+    for url in urls:
+        client.get(url)
+        assert client.get(url)["X-Cache"] == "HIT"
+    return urls
+
+
+@pytest.mark.django_db(transaction=True)
+def testImportTasks_whenSharedCacheKnowsIdsMissing_invalidatesCachedMisses(
+    client, settings, tmp_path
+) -> None:
+    settings.CACHES = settings.CACHES | {
+        "tasks": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": str(tmp_path / "cache"),
+        }
+    }
+    urls = cache_missing_ids(client, 2)
+    path = tmp_path / "tasks.ndjson"
+    path.write_text(
+        '{"title": "First", "description": "D"}\n{"title": "Second", "description": "D"}\n'
+    )
+
+    import_tasks(path, "--chunk-size", "1")
+
+    assert [client.get(url).status_code for url in urls] == [200, 200]
+
+
+@pytest.mark.usefixtures("cache_listener")
+def testImportTasks_whenRunByAnotherProcess_dropsMissesCachedByServer(
+    client, tmp_path, call_command_elsewhere, wait_until
+) -> None:
+    urls = cache_missing_ids(client, 2)
+    path = tmp_path / "tasks.ndjson"
+    path.write_text(
+        '{"title": "First", "description": "D"}\n{"title": "Second", "description": "D"}\n'
+    )
+
+    call_command_elsewhere("import_tasks", str(path), "--chunk-size", "1")
+
+    assert wait_until(
+        lambda: [client.get(url).status_code for url in urls] == [200, 200]
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def testImportTasks_whenSomeTaskNotValid_importsNothing(tmp_path) -> None:
+    path = tmp_path / "tasks.ndjson"
+    path.write_text(
+        '{"title": "Valid", "description": "Description"}\n'
+        + '{"title": "'
+        + "x" * 256
+        + '", "description": "Description"}\n'
+    )
+
+    with pytest.raises(base.CommandError, match="Task 2: {'title'"):
+        import_tasks(path, "--chunk-size", "1")
+
+    assert not task_models.Task.objects.exists()
+
+
+def testImportTasks_whenFormatUnknown_raisesCommandError(tmp_path) -> None:
+    with pytest.raises(base.CommandError, match="--format"):
+        import_tasks(tmp_path / "tasks.txt")
@@ -0,0 +1,277 @@
+"""Unit tests for the background jobs and their API."""
+
+import datetime
+import threading
+
+import pytest
+from asgiref import sync
+from django import db
+from django import http
+from django import test
+from django.core.files import base
+from django.core.files import storage
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks import jobs as task_jobs
+from tasks import models as task_models
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+
+def queue(kind: str, **params) -> task_models.Job:
+    return task_models.Job.objects.create(kind=kind, params=params)
+
+
+def run_all() -> int:
+    # Workers close the connections left in a transaction, so tests running
+    # them need transaction=True.
+    return task_jobs.run_worker(threading.Event(), poll_interval=0, burst=True)
+
+
+@pytest.mark.django_db
+def testClaimJob_whenJobsQueued_claimsOldestFirst() -> None:
+    first = queue("rebuild_stats")
+    second = queue("rebuild_stats")
+
+    claimed = [task_jobs.claim_job(), task_jobs.claim_job(), task_jobs.claim_job()]
+
+    assert [job.pk if job else None for job in claimed] == [first.pk, second.pk, None]
+    first.refresh_from_db()
+    assert first.status == "running"
+    assert first.attempts == 1
+    assert first.locked_until is not None
+    assert first.locked_until > timezone.now()
+
+
+@pytest.mark.django_db(transaction=True)
+def testClaimJob_whenJobLockedByAnotherWorker_skipsIt() -> None:
+    locked = queue("rebuild_stats")
+    free = queue("rebuild_stats")
+    is_locked = threading.Event()
+    release = threading.Event()
+
+    def lock() -> None:
+        try:
+            with db.transaction.atomic():
+                task_models.Job.objects.select_for_update().get(pk=locked.pk)
+                is_locked.set()
+                release.wait(5)
+        finally:
+            db.connection.close()
+
+    worker = threading.Thread(target=lock)
+    worker.start()
+    try:
+        assert is_locked.wait(5)
+        claimed = task_jobs.claim_job()
+    finally:
+        release.set()
+        worker.join()
+
+    assert claimed is not None
+    assert claimed.pk == free.pk
+
+
+@pytest.mark.django_db
+def testClaimJob_whenLeaseExpired_claimsJobAgainThenFailsIt(settings) -> None:
+    settings.TASKS_JOBS_MAX_ATTEMPTS = 2
+    expired = timezone.now() - datetime.timedelta(seconds=1)
+    job = task_models.Job.objects.create(
+        kind="rebuild_stats", status="running", attempts=1, locked_until=expired
+    )
+
+    reclaimed = task_jobs.claim_job()
+    task_models.Job.objects.filter(pk=job.pk).update(locked_until=expired)
+    lost = task_jobs.claim_job()
+
+    assert reclaimed is not None
+    assert reclaimed.attempts == 2
+    assert lost is None
+    job.refresh_from_db()
+    assert job.status == "failed"
+    assert job.error == "The workers running the job were lost."
+
+
+@pytest.mark.django_db
+def testReportProgress_whenJobClaimedByAnotherWorker_raisesJobLost() -> None:
+    queue("rebuild_stats")
+    job = task_jobs.claim_job()
+    assert job is not None
+    task_models.Job.objects.filter(pk=job.pk).update(attempts=2)
+
+    with pytest.raises(task_jobs.JobLostError):
+        task_jobs.report_progress(job, 1)
+
+
+@pytest.mark.django_db(transaction=True)
+def testBulkDeleteJob_whenRun_deletesMatchingTasksInBatches(monkeypatch) -> None:
+    monkeypatch.setattr(task_jobs, "DELETE_BATCH_SIZE", 2)
+    task_models.Task.objects.bulk_create(
+        [
+            task_models.Task(title=f"Task {i}", description="D", completed=i < 5)
+            for i in range(7)
+        ]
+    )
+    job = queue("bulk_delete", filters={"completed": "true"})
+
+    assert run_all() == 1
+
+    job.refresh_from_db()
+    assert job.status == "succeeded"
+    assert (job.progress, job.total) == (5, 5)
+    assert job.result == {"deleted": 5}
+    assert job.finished_at is not None
+    assert not task_models.Task.objects.filter(completed=True).exists()
+    assert task_models.Task.objects.count() == 2
+
+
+@pytest.mark.usefixtures("cache_listener")
+def testBulkDeleteJob_whenRunByWorkerProcess_serverStopsServingDeletedTasks(
+    client, call_command_elsewhere, wait_until
+) -> None:
+    task = task_models.Task.objects.create(
+        title="Done", description="D", completed=True
+    )
+    url = reverse("task-detail", args=[task.id])
+    client.get(url)
+    assert client.get(url)["X-Cache"] == "HIT"
+    queue("bulk_delete", filters={"completed": "true"})
+
+    call_command_elsewhere(
+        "shell",
+        "-c",
+        "import threading; from tasks import jobs; "
+        "jobs.run_worker(threading.Event(), poll_interval=0, burst=True)",
+    )
+
+    assert not task_models.Task.objects.exists()
+    assert wait_until(lambda: client.get(url).status_code == 404)
+
+
+@pytest.mark.django_db(transaction=True)
+def testExportJob_whenRun_writesFileToDownload(client) -> None:
+    task = task_models.Task.objects.create(title="Exported", description="D")
+    task_models.Task.objects.create(title="Done", description="D", completed=True)
+    job = queue(
+        "export", format="csv", fields=["id", "title"], filters={"completed": "false"}
+    )
+
+    run_all()
+    response = client.get(reverse("job-download", args=[job.pk]))
+
+    job.refresh_from_db()
+    assert job.status == "succeeded"
+    assert job.result == {
+        "file": f"exports/tasks-{job.pk}.csv",
+        "format": "csv",
+        "rows": 1,
+    }
+    assert response.status_code == 200
+    assert response["Content-Type"] == "text/csv; charset=utf-8"
+    assert 'filename="tasks.csv"' in response["Content-Disposition"]
+    assert b"".join(response.streaming_content) == (
+        f"id,title\r\n{task.id},Exported\r\n".encode()
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def testRunJob_whenHandlerFails_recordsError(monkeypatch) -> None:
+    def fail(job):
+        raise RuntimeError("Disk full.")
+
+    monkeypatch.setitem(task_jobs._handlers, "rebuild_stats", fail)
+    job = queue("rebuild_stats")
+
+    run_all()
+
+    job.refresh_from_db()
+    assert job.status == "failed"
+    assert job.error == "Disk full."
+    assert job.locked_until is None
+
+
+@pytest.mark.django_db
+def testCreateJob_whenValid_queuesJobAndReturnsAccepted(client) -> None:
+    response = client.post(
+        reverse("job-list"),
+        {"kind": "export", "params": {"filters": {"completed": "false"}}},
+        content_type="application/json",
+    )
+
+    assert response.status_code == 202
+    body = response.json()
+    assert body["status"] == "queued"
+    assert body["params"] == {"format": "ndjson", "filters": {"completed": "false"}}
+    assert response["Location"].endswith(reverse("job-detail", args=[body["id"]]))
+    assert client.get(response["Location"]).json()["id"] == body["id"]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "params",
+    [
+        {},
+        {"filters": {}},
+        {"filters": {"completed": "maybe"}},
+        {"filters": {"title": "Task"}},
+    ],
+)
+def testCreateJob_whenBulkDeleteFiltersInvalid_returnsValidationError(
+    client, params
+) -> None:
+    response = client.post(
+        reverse("job-list"),
+        {"kind": "bulk_delete", "params": params},
+        content_type="application/json",
+    )
+
+    assert response.status_code == 400
+    assert not task_models.Job.objects.exists()
+
+
+@pytest.mark.django_db
+def testRetrieveJob_whenMissing_returnsJobNotFound(client) -> None:
+    response = client.get(reverse("job-detail", args=[999]))
+
+    assert response.status_code == 404
+    assert response.json()["error_code"] == "job_not_found"
+
+
+@pytest.mark.django_db
+def testDownloadJob_whenJobNotFinished_returnsConflict(client) -> None:
+    job = queue("export")
+
+    response = client.get(reverse("job-download", args=[job.pk]))
+
+    assert response.status_code == 409
+    assert response.json()["error_code"] == "job_result_unavailable"
+
+
+@pytest.mark.django_db
+def testDownloadJob_whenServedOverAsgi_streamsAsyncIterator(settings) -> None:
+    name = storage.default_storage.save(
+        "exports/tasks.csv", base.ContentFile(b"id\r\n1\r\n")
+    )
+    job = task_models.Job.objects.create(
+        kind="export",
+        status="succeeded",
+        result={"file": name, "format": "csv", "rows": 1},
+    )
+    settings.ROOT_URLCONF = "task_manager.asgi_urls"
+
+    async def download() -> tuple:
+        response = await test.AsyncClient().get(f"/api/v1/jobs/{job.pk}/download")
+        assert isinstance(response, http.StreamingHttpResponse)
+        body = b"".join([chunk async for chunk in response.streaming_content])
+        return response, body
+
+    response, body = sync.async_to_sync(download)()
+
+    assert response.status_code == 200
+    assert response.is_async
+    assert response["Content-Length"] == "7"
+    assert body == b"id\r\n1\r\n"
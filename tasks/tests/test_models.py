@@ -1,6 +1,8 @@
 """Unit tests for the models module."""
 
 import pytest
+from django.db.models import signals as model_signals
+
 from tasks import models as task_models
 
 
@@ -58,3 +60,30 @@ def testTaskOrdering_whenMultipleTasksCreated_ordersByCreatedAtDesc() -> None:
 
     assert tasks[0] == task2
     assert tasks[1] == task1
+
+
+@pytest.mark.django_db
+def testTaskUpdateReturning_whenTasksMatch_returnsUpdatedTasksAndSendsPostSave() -> (
+    None
+):
+    """Test that update_returning() reads the updated rows back and sends post_save."""
+
+    task = task_models.Task.objects.create(title="Task", description="Desc")
+    received = []
+
+    def receiver(sender, instance, created, update_fields, **kwargs) -> None:
+        received.append((instance.pk, created, update_fields))
+
+    model_signals.post_save.connect(receiver, sender=task_models.Task)
+    try:
+        tasks = task_models.Task.objects.filter(pk=task.pk).update_returning(
+            completed=True
+        )
+        missing = task_models.Task.objects.filter(pk=0).update_returning(completed=True)
+    finally:
+        model_signals.post_save.disconnect(receiver, sender=task_models.Task)
+
+    assert [(t.pk, t.title, t.completed) for t in tasks] == [(task.pk, "Task", True)]
+    assert tasks[0].updated_at > task.updated_at
+    assert missing == []
+    assert received == [(task.pk, False, frozenset({"completed", "updated_at"}))]
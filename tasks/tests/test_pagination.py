@@ -0,0 +1,229 @@
+"""Unit tests for the pagination module."""
+
+import datetime
+import itertools
+
+import pytest
+from rest_framework import request as drf_request
+from rest_framework import test as drf_test
+
+from tasks import exceptions as tasks_exceptions
+from tasks import filters as task_filters
+from tasks import models as task_models
+from tasks import pagination as task_pagination
+
+
+def _request(path: str = "/api/v1/tasks", **params) -> drf_request.Request:
+    return drf_request.Request(drf_test.APIRequestFactory().get(path, params))
+
+
+def testEncodeCursor_whenDecoded_returnsSameCursor() -> None:
+    cursor = task_pagination.Cursor(
+        created_at=datetime.datetime(2025, 4, 20, 10, 19, 36, 142755, datetime.UTC),
+        id=42,
+        reverse=True,
+    )
+
+    token = task_pagination.encode_cursor(cursor)
+
+    assert "=" not in token
+    assert task_pagination.decode_cursor(token) == cursor
+
+
+@pytest.mark.parametrize("token", ["not-a-cursor", "W10", "WyIyMDI1IiwxLDBd"])
+def testDecodeCursor_whenTokenIsMalformed_raisesInvalidCursor(token: str) -> None:
+    with pytest.raises(tasks_exceptions.InvalidCursorException):
+        task_pagination.decode_cursor(token)
+
+
+@pytest.mark.django_db
+def testPaginateQueryset_whenWalkingForwardAndBack_visitsEveryTaskOnce() -> None:
+    created_at = datetime.datetime(2025, 4, 20, tzinfo=datetime.UTC)
+    tasks = [
+        task_models.Task.objects.create(title=f"Task {i}", description="")
+        for i in range(7)
+    ]
+    # Equal timestamps must be ordered by id so that no row is skipped.
+    task_models.Task.objects.update(created_at=created_at)
+    expected_ids = [task.id for task in reversed(tasks)]
+    paginator = task_pagination.TaskCursorPagination()
+    queryset = task_models.Task.objects.all()
+
+    seen_ids: list[int] = []
+    request = _request(page_size=3)
+    pages = []
+    while True:
+        page = paginator.paginate_queryset(queryset, request)
+        pages.append([task.id for task in page])
+        seen_ids.extend(task.id for task in page)
+        if paginator.next_cursor is None:
+            break
+        request = _request(
+            page_size=3, cursor=task_pagination.encode_cursor(paginator.next_cursor)
+        )
+
+    assert seen_ids == expected_ids
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert paginator.previous_cursor is not None
+
+    request = _request(
+        page_size=3, cursor=task_pagination.encode_cursor(paginator.previous_cursor)
+    )
+    previous_page = paginator.paginate_queryset(queryset, request)
+
+    assert [task.id for task in previous_page] == pages[1]
+    assert paginator.previous_cursor is not None
+
+
+@pytest.mark.django_db
+def testPaginateQueryset_whenPageSizeExceedsMaximum_capsPageSize() -> None:
+    paginator = task_pagination.TaskCursorPagination()
+
+    paginator.paginate_queryset(
+        task_models.Task.objects.all(), _request(page_size=10**6)
+    )
+
+    assert paginator.page_size == paginator.max_page_size
+
+
+@pytest.mark.django_db
+def testPaginateQueryset_whenSearchResultsRanked_walksPagesByRank() -> None:
+    for i in range(5):
+        task_models.Task.objects.create(
+            title="report " * (i + 1), description=f"Task {i}"
+        )
+    queryset = task_filters.TaskSearchBackend().filter_queryset(
+        _request(q="report"), task_models.Task.objects.all(), None
+    )
+    expected_ids = list(queryset.values_list("id", flat=True))
+    paginator = task_pagination.TaskCursorPagination()
+
+    first_page = paginator.paginate_queryset(
+        queryset, _request(q="report", page_size=3)
+    )
+    assert paginator.next_cursor is not None
+    assert paginator.next_cursor.rank is not None
+    second_page = paginator.paginate_queryset(
+        queryset,
+        _request(
+            q="report",
+            page_size=3,
+            cursor=task_pagination.encode_cursor(paginator.next_cursor),
+        ),
+    )
+
+    assert [task.id for task in first_page + second_page] == expected_ids
+
+
+@pytest.mark.django_db
+def testPaginateQueryset_whenCursorKindDoesNotMatchListing_raisesInvalidCursor() -> (
+    None
+):
+    cursor = task_pagination.Cursor(
+        created_at=datetime.datetime(2025, 4, 20, tzinfo=datetime.UTC), id=1, rank=0.5
+    )
+
+    with pytest.raises(tasks_exceptions.InvalidCursorException):
+        task_pagination.TaskCursorPagination().paginate_queryset(
+            task_models.Task.objects.all(),
+            _request(cursor=task_pagination.encode_cursor(cursor)),
+        )
+
+
+@pytest.mark.django_db
+def testCountRows_whenEstimateBelowThreshold_countsExactly(settings) -> None:
+    settings.TASKS_COUNT_ESTIMATE_THRESHOLD = 10**9
+    for index in range(3):
+        task_models.Task.objects.create(title=f"Task {index}", description="")
+
+    assert task_pagination.count_rows(task_models.Task.objects.all()) == (3, False)
+
+
+@pytest.mark.django_db
+def testCountRows_whenEstimateAboveThreshold_returnsPlannerEstimate(
+    settings, django_assert_num_queries
+) -> None:
+    settings.TASKS_COUNT_ESTIMATE_THRESHOLD = 0
+
+    with django_assert_num_queries(1) as captured:
+        count, estimated = task_pagination.count_rows(
+            task_models.Task.objects.filter(completed=False)
+        )
+
+    assert estimated is True
+    assert count >= 0
+    assert captured.captured_queries[0]["sql"].startswith("EXPLAIN")
+
+
+@pytest.mark.django_db
+def testPageNumberPagination_whenWalkingPages_visitsEveryTaskOnce(settings) -> None:
+    settings.TASKS_COUNT_ESTIMATE_THRESHOLD = 10**9
+    tasks = [
+        task_models.Task.objects.create(title=f"Task {i}", description="")
+        for i in range(5)
+    ]
+    paginator = task_pagination.TaskPageNumberPagination()
+    queryset = task_models.Task.objects.all()
+
+    pages = []
+    for number in (1, 2, 3):
+        page = paginator.paginate_queryset(queryset, _request(page=number, page_size=2))
+        pages.append([task.id for task in page])
+        assert (paginator.count, paginator.count_estimated) == (5, False)
+
+    assert list(itertools.chain.from_iterable(pages)) == [
+        task.id for task in reversed(tasks)
+    ]
+    assert paginator.get_next_link() is None
+    assert paginator.get_previous_link() == (
+        "http://testserver/api/v1/tasks?page=2&page_size=2"
+    )
+
+
+@pytest.mark.django_db
+def testPageNumberPagination_whenCountEstimated_neverReportsFewerRowsThanSeen(
+    settings, monkeypatch
+) -> None:
+    settings.TASKS_COUNT_ESTIMATE_THRESHOLD = 0
+    monkeypatch.setattr(task_pagination, "estimate_count", lambda queryset: 1)
+    for index in range(5):
+        task_models.Task.objects.create(title=f"Task {index}", description="")
+    paginator = task_pagination.TaskPageNumberPagination()
+
+    paginator.paginate_queryset(
+        task_models.Task.objects.all(), _request(page=2, page_size=2)
+    )
+
+    assert (paginator.count, paginator.count_estimated) == (5, True)
+    assert paginator.get_previous_link() == (
+        "http://testserver/api/v1/tasks?page_size=2"
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("page", ["0", "abc", "3"])
+def testPageNumberPagination_whenPageNotInListing_raisesInvalidPage(page) -> None:
+    task_models.Task.objects.create(title="Task", description="")
+    paginator = task_pagination.TaskPageNumberPagination()
+
+    with pytest.raises(tasks_exceptions.InvalidPageException):
+        paginator.paginate_queryset(task_models.Task.objects.all(), _request(page=page))
+
+
+@pytest.mark.django_db
+def testEstimatedCountPaginator_whenAboveThreshold_flagsEstimatedCount(
+    settings,
+) -> None:
+    task_models.Task.objects.create(title="Task", description="")
+    queryset = task_models.Task.objects.all()
+
+    settings.TASKS_COUNT_ESTIMATE_THRESHOLD = 10**9
+    exact = task_pagination.EstimatedCountPaginator(queryset, 10)
+    exact_count = exact.count
+    settings.TASKS_COUNT_ESTIMATE_THRESHOLD = 0
+    estimated = task_pagination.EstimatedCountPaginator(queryset, 10)
+    estimated_count = estimated.count
+
+    assert (exact_count, exact.count_estimated) == (1, False)
+    assert estimated_count >= 0
+    assert estimated.count_estimated is True
@@ -0,0 +1,28 @@
+"""Unit tests for the renderers module."""
+
+from django.utils import translation
+from rest_framework import renderers
+
+from tasks import renderers as task_renderers
+
+
+def testTaskJSONRenderer_whenErrorPayloadRendered_matchesJSONRenderer() -> None:
+    data = {
+        "error_code": "bulk_operation_failed",
+        "metadata": {
+            0: {"title": [translation.gettext_lazy("This field is required.")]}
+        },
+    }
+
+    assert task_renderers.TaskJSONRenderer().render(
+        data
+    ) == renderers.JSONRenderer().render(data)
+
+
+def testTaskJSONRenderer_whenIndentRequested_matchesJSONRenderer() -> None:
+    data = {"results": [{"id": 1}]}
+    media_type = "application/json; indent=2"
+
+    assert task_renderers.TaskJSONRenderer().render(
+        data, media_type
+    ) == renderers.JSONRenderer().render(data, media_type)
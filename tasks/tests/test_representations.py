@@ -0,0 +1,61 @@
+"""Unit tests for the representations module."""
+
+import datetime
+
+import pytest
+from rest_framework import renderers
+
+from tasks import models as task_models
+from tasks import renderers as task_renderers
+from tasks import representations as task_representations
+from tasks import serializers as task_serializers
+
+CREATED_AT = datetime.datetime(2025, 4, 20, 10, 19, 36, 142755, datetime.UTC)
+
+
+@pytest.fixture
+def tasks() -> list[task_models.Task]:
+    task_models.Task.objects.bulk_create(
+        [
+            task_models.Task(title="Plain", description="", created_at=CREATED_AT),
+            task_models.Task(
+                title='Quotes " and \\ backslashes',
+                description="Ünïcödé, emoji 😀, line\nbreaks\tand \x01 controls",
+                completed=True,
+                created_at=CREATED_AT.replace(microsecond=0),
+            ),
+            task_models.Task(title="Separators   and  ", description="</script>"),
+        ]
+    )
+    return list(task_models.Task.objects.all())
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("fields", [None, ("id", "title"), ("completed", "created_at")])
+def testToRepresentation_whenRendered_matchesTaskSerializerBytes(tasks, fields) -> None:
+    representation = task_representations.TaskRowRepresentation(
+        fields, extra=["id", "updated_at"]
+    )
+    rows = representation.get_rows(task_models.Task.objects.all())
+
+    fast = task_renderers.TaskJSONRenderer().render(
+        {"results": representation.to_representation(rows)}
+    )
+    slow = renderers.JSONRenderer().render(
+        {
+            "results": task_serializers.TaskSerializer(
+                tasks, many=True, fields=fields
+            ).data
+        }
+    )
+
+    assert fast == slow
+
+
+@pytest.mark.django_db
+def testIsSupported_whenTimeZoneIsNotUtc_returnsFalse(settings) -> None:
+    assert task_representations.is_supported()
+
+    settings.TIME_ZONE = "Europe/Paris"
+
+    assert not task_representations.is_supported()
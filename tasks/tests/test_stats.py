@@ -0,0 +1,130 @@
+"""Unit tests for the task statistics and the daily task counts behind them."""
+
+import datetime
+import io
+
+import pytest
+from django.core import management
+from django.urls import reverse
+
+from tasks import models as task_models
+from tasks import stats as task_stats
+
+DAY = datetime.datetime(2024, 1, 2, 23, 30, tzinfo=datetime.UTC)
+NEXT_DAY = DAY + datetime.timedelta(hours=1)
+
+
+def daily_counts() -> dict:
+    return {
+        (count.day.isoformat(), count.completed): count.count
+        for count in task_models.TaskDailyCount.objects.filter(count__gt=0)
+    }
+
+
+def create_task(created_at: datetime.datetime, completed: bool = False):
+    task = task_models.Task.objects.create(
+        title="Task", description="Description", completed=completed
+    )
+    task_models.Task.objects.filter(pk=task.pk).update(created_at=created_at)
+    return task
+
+
+@pytest.mark.django_db
+def testDailyCounts_whenTasksCreated_countsThemByUtcDay() -> None:
+    create_task(DAY)
+    create_task(NEXT_DAY, completed=True)
+    task_models.Task.objects.bulk_create(
+        [
+            task_models.Task(title="Bulk", description="", created_at=DAY)
+            for _ in range(3)
+        ]
+    )
+    task_models.Task.objects.filter(title="Bulk").update(created_at=DAY)
+
+    assert daily_counts() == {
+        ("2024-01-02", False): 4,
+        ("2024-01-03", True): 1,
+    }
+
+
+@pytest.mark.django_db
+def testDailyCounts_whenTasksUpdatedAndDeleted_movesAndRemovesCounts() -> None:
+    first = create_task(DAY)
+    create_task(DAY)
+    create_task(NEXT_DAY)
+
+    first.completed = True
+    first.save()
+    task_models.Task.objects.filter(created_at=NEXT_DAY).update(completed=True)
+    task_models.Task.objects.filter(pk=first.pk).delete()
+
+    assert daily_counts() == {
+        ("2024-01-02", False): 1,
+        ("2024-01-03", True): 1,
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+def testDailyCounts_whenTasksImportedWithCopy_countsThem(tmp_path) -> None:
+    path = tmp_path / "tasks.csv"
+    path.write_text(
+        "title,description,completed,created_at\n"
+        f"One,D,true,{DAY.isoformat()}\n"
+        f"Two,D,false,{DAY.isoformat()}\n"
+    )
+
+    management.call_command("import_tasks", str(path), stdout=io.StringIO())
+
+    assert daily_counts() == {
+        ("2024-01-02", False): 1,
+        ("2024-01-02", True): 1,
+    }
+
+
+@pytest.mark.django_db
+def testRebuildTaskStats_whenCountsAreWrong_recomputesThem() -> None:
+    create_task(DAY)
+    create_task(DAY, completed=True)
+    task_models.TaskDailyCount.objects.all().delete()
+    task_models.TaskDailyCount.objects.create(
+        day=NEXT_DAY.date(), completed=False, count=5
+    )
+    stdout = io.StringIO()
+
+    management.call_command("rebuild_task_stats", stdout=stdout)
+
+    assert "Rebuilt 2 daily task counts" in stdout.getvalue()
+    assert daily_counts() == {
+        ("2024-01-02", False): 1,
+        ("2024-01-02", True): 1,
+    }
+
+
+@pytest.mark.django_db
+def testTaskStats_whenNoTasks_returnsZeros() -> None:
+    assert task_stats.task_stats() == {
+        "total": 0,
+        "completed": 0,
+        "open": 0,
+        "created_per_day": [],
+    }
+
+
+@pytest.mark.django_db
+def testStatsEndpoint_whenTasksExist_returnsTotalsAndHistogram(client) -> None:
+    create_task(NEXT_DAY)
+    create_task(DAY, completed=True)
+    create_task(DAY)
+
+    response = client.get(reverse("task-stats"))
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "total": 3,
+        "completed": 1,
+        "open": 2,
+        "created_per_day": [
+            {"day": "2024-01-02", "created": 2, "completed": 1},
+            {"day": "2024-01-03", "created": 1, "completed": 0},
+        ],
+    }
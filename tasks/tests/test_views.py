@@ -6,7 +6,10 @@ import pytest
 from django.urls import reverse
 from rest_framework import status
 
+from task_manager import middleware
+from tasks import cache as task_cache
 from tasks import models as task_models
+from tasks import serializers as task_serializers
 
 
 @pytest.mark.django_db
@@ -52,6 +55,32 @@ def testTaskViewSetUpdate_whenValidDataProvided_updatesTask(client) -> None:
     assert task.completed is True
 
 
+@pytest.mark.django_db
+def testTaskViewSetPartialUpdate_whenFieldGiven_writesItWithSingleQuery(
+    client, django_assert_num_queries
+) -> None:
+    task = task_models.Task.objects.create(title="Task 1", description="Desc 1")
+
+    with django_assert_num_queries(1) as captured:
+        response = client.patch(
+            reverse("task-detail", args=[task.id]),
+            data=json.dumps({"completed": True}),
+            content_type="application/json",
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    sql = captured.captured_queries[0]["sql"]
+    assert sql.startswith("UPDATE") and "RETURNING" in sql
+    assert '"title"' not in sql.split("RETURNING")[0]
+    body = json.loads(response.content)
+    updated = task_models.Task.objects.get(pk=task.id)
+    assert body["completed"] is True
+    assert body["title"] == "Task 1"
+    assert updated.completed is True
+    assert updated.updated_at > task.updated_at
+    assert body["updated_at"] == updated.updated_at.isoformat().replace("+00:00", "Z")
+
+
 @pytest.mark.django_db
 def testTaskViewSetDelete_whenTaskExists_deletesTask(client) -> None:
     task = task_models.Task.objects.create(
@@ -187,3 +216,599 @@ def testDeleteTask_whenTaskDoesNotExist_returnsTaskNotFound(client) -> None:
         "message": "Task with id=999 not found.",
         "metadata": None,
     }
+
+
+@pytest.mark.django_db
+def testTaskViewSetList_whenMoreTasksThanPageSize_returnsFirstPageWithNextLink(
+    client,
+) -> None:
+    tasks = [
+        task_models.Task.objects.create(title=f"Task {i}", description="")
+        for i in range(3)
+    ]
+
+    response = client.get(reverse("task-list"), {"page_size": 2})
+
+    assert response.status_code == status.HTTP_200_OK
+    content = json.loads(response.content)
+    assert [task["id"] for task in content["results"]] == [tasks[2].id, tasks[1].id]
+    assert content["previous"] is None
+    assert content["next"] is not None
+
+    response = client.get(content["next"])
+
+    content = json.loads(response.content)
+    assert [task["id"] for task in content["results"]] == [tasks[0].id]
+    assert content["next"] is None
+    assert content["previous"] is not None
+
+
+@pytest.mark.django_db
+def testTaskViewSetList_whenCursorIsInvalid_returnsBadRequest(client) -> None:
+    response = client.get(reverse("task-list"), {"cursor": "garbage"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert json.loads(response.content) == {
+        "error_code": "invalid_cursor",
+        "http_status_code": 400,
+        "message": "Given cursor is not valid.",
+        "metadata": None,
+    }
+
+
+@pytest.mark.django_db
+def testTaskViewSetBulkCreate_whenAllItemsValid_createsTasks(
+    client, django_assert_max_num_queries
+) -> None:
+    data = [
+        {"title": f"Task {i}", "description": f"Description {i}"} for i in range(50)
+    ]
+
+    with django_assert_max_num_queries(3):
+        response = client.post(
+            reverse("task-bulk"), data=json.dumps(data), content_type="application/json"
+        )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    content = json.loads(response.content)
+    assert [task["title"] for task in content] == [item["title"] for item in data]
+    assert all(task["id"] is not None for task in content)
+    assert task_models.Task.objects.count() == 50
+
+
+@pytest.mark.django_db
+def testTaskViewSetBulkCreate_whenSomeItemsInvalid_reportsErrorsPerItem(
+    client,
+) -> None:
+    data = [
+        {"title": "Task 1", "description": "Description 1"},
+        {"description": "Description 2"},
+        {"title": "Task 3", "description": "Description 3", "completed": "maybe"},
+    ]
+
+    response = client.post(
+        reverse("task-bulk"), data=json.dumps(data), content_type="application/json"
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert json.loads(response.content) == {
+        "error_code": "bulk_operation_failed",
+        "message": "Some items of the batch cannot be processed.",
+        "http_status_code": 400,
+        "metadata": {
+            "1": {
+                "error_code": "validation_error",
+                "message": "Given data is not valid.",
+                "http_status_code": 400,
+                "metadata": {"title": ["This field is required."]},
+            },
+            "2": {
+                "error_code": "validation_error",
+                "message": "Given data is not valid.",
+                "http_status_code": 400,
+                "metadata": {"completed": ["Must be a valid boolean."]},
+            },
+        },
+    }
+    assert task_models.Task.objects.count() == 0
+
+
+@pytest.mark.django_db
+def testTaskViewSetBulkCreate_whenBodyIsNotAList_returnsBadRequest(client) -> None:
+    response = client.post(
+        reverse("task-bulk"),
+        data=json.dumps({"title": "Task 1"}),
+        content_type="application/json",
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert json.loads(response.content)["error_code"] == "validation_error"
+
+
+@pytest.mark.django_db
+def testTaskViewSetBulkUpdate_whenAllItemsValid_updatesOnlyGivenFields(
+    client,
+) -> None:
+    task1 = task_models.Task.objects.create(title="Task 1", description="Desc 1")
+    task2 = task_models.Task.objects.create(title="Task 2", description="Desc 2")
+    data = [{"id": task1.id, "completed": True}, {"id": task2.id, "title": "New 2"}]
+
+    response = client.patch(
+        reverse("task-bulk"), data=json.dumps(data), content_type="application/json"
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    task1_updated_at = task1.updated_at
+    task1.refresh_from_db()
+    task2.refresh_from_db()
+    assert task1.completed is True
+    assert task1.title == "Task 1"
+    assert task1.updated_at > task1_updated_at
+    assert task2.title == "New 2"
+    assert task2.description == "Desc 2"
+
+
+@pytest.mark.django_db
+def testTaskViewSetBulkUpdate_whenIdGivenAsString_updatesTask(client) -> None:
+    task = task_models.Task.objects.create(title="Task 1", description="Desc 1")
+    data = [{"id": str(task.id), "title": "New 1"}]
+
+    response = client.patch(
+        reverse("task-bulk"), data=json.dumps(data), content_type="application/json"
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    task.refresh_from_db()
+    assert task.title == "New 1"
+
+
+@pytest.mark.django_db
+def testTaskViewSetBulkUpdate_whenTaskDoesNotExist_reportsItemAndUpdatesNothing(
+    client,
+) -> None:
+    task = task_models.Task.objects.create(title="Task 1", description="Desc 1")
+    data = [{"id": task.id, "completed": True}, {"id": 999, "completed": True}]
+
+    response = client.patch(
+        reverse("task-bulk"), data=json.dumps(data), content_type="application/json"
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    content = json.loads(response.content)
+    assert list(content["metadata"]) == ["1"]
+    assert content["metadata"]["1"]["metadata"] == {
+        "id": ["Task with id=999 not found."]
+    }
+    task.refresh_from_db()
+    assert task.completed is False
+
+
+@pytest.mark.django_db
+def testTaskViewSetBulkDestroy_whenAllTasksExist_deletesTasks(client) -> None:
+    tasks = [
+        task_models.Task.objects.create(title=f"Task {i}", description="")
+        for i in range(3)
+    ]
+
+    response = client.delete(
+        reverse("task-bulk"),
+        data=json.dumps({"ids": [tasks[0].id, tasks[2].id]}),
+        content_type="application/json",
+    )
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert list(task_models.Task.objects.values_list("id", flat=True)) == [tasks[1].id]
+
+
+@pytest.mark.django_db
+def testTaskViewSetBulkDestroy_whenTaskDoesNotExist_reportsItemAndDeletesNothing(
+    client,
+) -> None:
+    task = task_models.Task.objects.create(title="Task 1", description="")
+
+    response = client.delete(
+        reverse("task-bulk"),
+        data=json.dumps({"ids": [task.id, 999]}),
+        content_type="application/json",
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert json.loads(response.content)["metadata"] == {
+        "1": {
+            "error_code": "task_not_found",
+            "message": "Task with id=999 not found.",
+            "http_status_code": 404,
+            "metadata": None,
+        }
+    }
+    assert task_models.Task.objects.count() == 1
+
+
+@pytest.mark.django_db
+def testTaskViewSetList_whenCompletedFilterGiven_returnsOnlyMatchingTasks(
+    client,
+) -> None:
+    open_task = task_models.Task.objects.create(title="Open", description="")
+    task_models.Task.objects.create(title="Done", description="", completed=True)
+
+    response = client.get(reverse("task-list"), {"completed": "false"})
+
+    assert response.status_code == status.HTTP_200_OK
+    content = json.loads(response.content)
+    assert [task["id"] for task in content["results"]] == [open_task.id]
+
+
+@pytest.mark.django_db
+def testTaskViewSetList_whenFilterIsInvalid_returnsBadRequest(client) -> None:
+    response = client.get(reverse("task-list"), {"created_at__gte": "yesterday"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert json.loads(response.content)["error_code"] == "validation_error"
+
+
+@pytest.mark.django_db
+def testTaskViewSetList_whenSearchTermsGiven_returnsRankedMatches(client) -> None:
+    task = task_models.Task.objects.create(
+        title="Renew passport", description="Book an appointment."
+    )
+    task_models.Task.objects.create(title="Laundry", description="Whites only.")
+
+    response = client.get(reverse("task-list"), {"q": "passport"})
+
+    assert response.status_code == status.HTTP_200_OK
+    content = json.loads(response.content)
+    assert [item["id"] for item in content["results"]] == [task.id]
+    assert "rank" not in content["results"][0]
+    assert "search_vector" not in content["results"][0]
+
+
+@pytest.mark.django_db
+def testGetTaskById_whenEtagMatches_returnsNotModifiedAfterOneQuery(
+    client, django_assert_num_queries
+) -> None:
+    task = task_models.Task.objects.create(title="Task 1", description="Desc 1")
+    response = client.get(reverse("task-detail", args=[task.id]))
+    etag = response["ETag"]
+    task_cache.task_cache.invalidate([task.id])
+
+    with django_assert_num_queries(1):
+        response = client.get(
+            reverse("task-detail", args=[task.id]), HTTP_IF_NONE_MATCH=etag
+        )
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+    assert response["ETag"] == etag
+
+
+@pytest.mark.django_db
+def testGetTaskById_whenTaskChangedSinceEtag_returnsTask(client) -> None:
+    task = task_models.Task.objects.create(title="Task 1", description="Desc 1")
+    etag = client.get(reverse("task-detail", args=[task.id]))["ETag"]
+    task.title = "Task 1 renamed"
+    task.save()
+
+    response = client.get(
+        reverse("task-detail", args=[task.id]), HTTP_IF_NONE_MATCH=etag
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert json.loads(response.content)["title"] == "Task 1 renamed"
+    assert response["ETag"] != etag
+
+
+@pytest.mark.django_db
+def testGetTaskById_whenNotModifiedSince_returnsNotModified(client) -> None:
+    task = task_models.Task.objects.create(title="Task 1", description="Desc 1")
+    last_modified = client.get(reverse("task-detail", args=[task.id]))["Last-Modified"]
+
+    response = client.get(
+        reverse("task-detail", args=[task.id]), HTTP_IF_MODIFIED_SINCE=last_modified
+    )
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+@pytest.mark.django_db
+def testGetTaskById_whenConditionalAndTaskDoesNotExist_returnsTaskNotFound(
+    client,
+) -> None:
+    response = client.get(reverse("task-detail", args=[999]), HTTP_IF_NONE_MATCH='"x"')
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert json.loads(response.content)["error_code"] == "task_not_found"
+
+
+@pytest.mark.django_db
+def testTaskViewSetList_whenEtagMatches_returnsNotModifiedAfterOneQuery(
+    client, django_assert_num_queries
+) -> None:
+    for i in range(3):
+        task_models.Task.objects.create(title=f"Task {i}", description="")
+    etag = client.get(reverse("task-list"))["ETag"]
+
+    with django_assert_num_queries(1):
+        response = client.get(reverse("task-list"), HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+@pytest.mark.django_db
+def testTaskViewSetList_whenTaskOfAnotherPageDeletedSinceEtag_returnsNewCount(
+    client,
+) -> None:
+    tasks = [
+        task_models.Task.objects.create(title=f"Task {i}", description="")
+        for i in range(4)
+    ]
+    params = {"page": 1, "page_size": 2}
+    etag = client.get(reverse("task-list"), params)["ETag"]
+    tasks[0].delete()
+
+    response = client.get(reverse("task-list"), params, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert json.loads(response.content)["count"] == 3
+
+
+@pytest.mark.django_db
+def testTaskViewSetList_whenTaskDeletedSinceEtag_returnsPage(client) -> None:
+    tasks = [
+        task_models.Task.objects.create(title=f"Task {i}", description="")
+        for i in range(4)
+    ]
+    etag = client.get(reverse("task-list"), {"page_size": 2})["ETag"]
+    tasks[2].delete()
+
+    response = client.get(
+        reverse("task-list"), {"page_size": 2}, HTTP_IF_NONE_MATCH=etag
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    content = json.loads(response.content)
+    assert [task["id"] for task in content["results"]] == [tasks[3].id, tasks[1].id]
+
+
+@pytest.mark.django_db
+def testGetTaskById_whenTaskCached_returnsTaskWithoutQuery(
+    client, django_assert_num_queries
+) -> None:
+    task = task_models.Task.objects.create(title="Task 1", description="Desc 1")
+    first_response = client.get(reverse("task-detail", args=[task.id]))
+
+    with django_assert_num_queries(0):
+        response = client.get(reverse("task-detail", args=[task.id]))
+
+    assert first_response["X-Cache"] == "MISS"
+    assert response["X-Cache"] == "HIT"
+    assert response.content == first_response.content
+    assert response["ETag"] == first_response["ETag"]
+
+
+@pytest.mark.django_db
+def testGetTaskById_whenCachedTaskUpdated_returnsFreshTask(client) -> None:
+    task = task_models.Task.objects.create(title="Task 1", description="Desc 1")
+    client.get(reverse("task-detail", args=[task.id]))
+
+    client.put(
+        reverse("task-detail", args=[task.id]),
+        data=json.dumps({"title": "Renamed", "description": "Desc 1"}),
+        content_type="application/json",
+    )
+    response = client.get(reverse("task-detail", args=[task.id]))
+
+    assert response["X-Cache"] == "MISS"
+    assert json.loads(response.content)["title"] == "Renamed"
+
+
+@pytest.mark.django_db
+def testUpdateTask_whenTaskDoesNotExistAndDataInvalid_returnsTaskNotFound(
+    client,
+) -> None:
+    response = client.patch(
+        reverse("task-detail", args=[999]),
+        data=json.dumps({"completed": "maybe"}),
+        content_type="application/json",
+    )
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert json.loads(response.content)["error_code"] == "task_not_found"
+
+
+@pytest.mark.django_db
+def testGetTaskById_whenCachedTaskBulkUpdated_returnsFreshTask(client) -> None:
+    task = task_models.Task.objects.create(title="Task 1", description="Desc 1")
+    client.get(reverse("task-detail", args=[task.id]))
+
+    client.patch(
+        reverse("task-bulk"),
+        data=json.dumps([{"id": task.id, "completed": True}]),
+        content_type="application/json",
+    )
+    response = client.get(reverse("task-detail", args=[task.id]))
+
+    assert json.loads(response.content)["completed"] is True
+
+
+@pytest.mark.django_db
+def testGetTaskById_whenCachedTaskBulkDeleted_returnsTaskNotFound(client) -> None:
+    task = task_models.Task.objects.create(title="Task 1", description="Desc 1")
+    client.get(reverse("task-detail", args=[task.id]))
+
+    client.delete(
+        reverse("task-bulk"),
+        data=json.dumps({"ids": [task.id]}),
+        content_type="application/json",
+    )
+    response = client.get(reverse("task-detail", args=[task.id]))
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def testGetTaskById_whenClientPinnedToPrimary_bypassesStaleCachedEntries(
+    client, settings
+) -> None:
+    settings.DATABASE_REPLICAS = ["replica_1"]
+    task = task_models.Task.objects.create(title="Fresh", description="D")
+    task_cache.task_cache.set(task.id, task.updated_at, {"title": "Stale"})
+    created = task_models.Task.objects.create(
+        id=task.id + 1, title="Created", description="D"
+    )
+    task_cache.task_cache.set_missing(created.id, {"error_code": "task_not_found"})
+    client.cookies[middleware.STICKY_COOKIE] = "1"
+
+    response = client.get(reverse("task-detail", args=[task.id]))
+    created_response = client.get(reverse("task-detail", args=[created.id]))
+
+    assert response["X-Cache"] == "MISS"
+    assert json.loads(response.content)["title"] == "Fresh"
+    assert created_response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def testGetTaskById_whenIdKnownMissing_returnsTaskNotFoundWithoutQuery(
+    client, django_assert_num_queries
+) -> None:
+    first_response = client.get(reverse("task-detail", args=[999]))
+
+    with django_assert_num_queries(0):
+        response = client.get(reverse("task-detail", args=[999]))
+    with django_assert_num_queries(0):
+        delete_response = client.delete(reverse("task-detail", args=[999]))
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.content == first_response.content
+    assert response["X-Cache"] == "HIT"
+    assert delete_response.status_code == status.HTTP_404_NOT_FOUND
+    assert delete_response.content == first_response.content
+
+
+@pytest.mark.django_db
+def testGetTaskById_whenIdKnownMissingThenCreated_returnsTask(client) -> None:
+    client.get(reverse("task-detail", args=[10**6]))
+    task_models.Task.objects.create(id=10**6, title="Task", description="")
+
+    response = client.get(reverse("task-detail", args=[10**6]))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert json.loads(response.content)["title"] == "Task"
+
+
+@pytest.mark.django_db
+def testGetTaskById_whenFilterExcludesTask_returnsTaskAndCachesNoMiss(client) -> None:
+    task = task_models.Task.objects.create(title="Task", description="")
+    url = reverse("task-detail", args=[task.id])
+
+    filtered_response = client.get(url, {"completed": "true"})
+    patch_response = client.patch(
+        f"{url}?q=zzz", {"title": "Renamed"}, content_type="application/json"
+    )
+    response = client.get(url)
+
+    assert filtered_response.status_code == status.HTTP_200_OK
+    assert patch_response.status_code == status.HTTP_200_OK
+    assert response.status_code == status.HTTP_200_OK
+    assert json.loads(response.content)["title"] == "Renamed"
+
+
+@pytest.mark.django_db
+def testGetTasks_whenFieldsRequested_returnsAndSelectsOnlyThoseFields(
+    client, django_assert_num_queries
+) -> None:
+    task_models.Task.objects.create(title="Task", description="Long description")
+
+    with django_assert_num_queries(1) as context:
+        response = client.get(reverse("task-list"), {"fields": "title,id"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert json.loads(response.content)["results"] == [
+        {"id": task_models.Task.objects.get().id, "title": "Task"}
+    ]
+    assert '"description"' not in context.captured_queries[0]["sql"]
+
+
+@pytest.mark.django_db
+def testGetTasks_whenUnknownFieldRequested_returnsBadRequest(client) -> None:
+    response = client.get(reverse("task-list"), {"fields": "title,secret"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "secret" in response.content.decode()
+
+
+@pytest.mark.django_db
+def testGetTaskById_whenFieldsRequested_returnsFieldsWithOwnETag(client) -> None:
+    task = task_models.Task.objects.create(title="Task", description="Description")
+    url = reverse("task-detail", args=[task.id])
+
+    sparse_miss = client.get(url, {"fields": "completed"})
+    full_response = client.get(url)
+    sparse_hit = client.get(url, {"fields": "completed"})
+
+    assert sparse_miss["X-Cache"] == "MISS"
+    assert full_response["X-Cache"] == "MISS"
+    assert sparse_hit["X-Cache"] == "HIT"
+    assert json.loads(sparse_miss.content) == {"completed": False}
+    assert sparse_hit.content == sparse_miss.content
+    assert sparse_hit["ETag"] == sparse_miss["ETag"] != full_response["ETag"]
+
+
+@pytest.mark.django_db
+def testGetTasks_whenRenderedAsJsonOrApi_returnsSameTasks(client) -> None:
+    task_models.Task.objects.create(title="Task", description="Description")
+
+    response = client.get(reverse("task-list"))
+    api_response = client.get(reverse("task-list"), {"format": "api"})
+
+    assert api_response.status_code == status.HTTP_200_OK
+    assert (
+        json.loads(response.content)["results"]
+        == api_response.data["results"]
+        == task_serializers.TaskSerializer(
+            task_models.Task.objects.all(), many=True
+        ).data
+    )
+
+
+@pytest.mark.django_db
+def testExportTasks_whenFormatIsNdjson_streamsOneTaskPerLine(client) -> None:
+    task_models.Task.objects.create(title="Open", description="")
+    task_models.Task.objects.create(title="Done", description="", completed=True)
+
+    response = client.get(
+        reverse("task-export"), {"format": "ndjson", "completed": "false"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.streaming
+    assert response["Content-Type"] == "application/x-ndjson; charset=utf-8"
+    lines = b"".join(response.streaming_content).splitlines()
+    assert [json.loads(line) for line in lines] == task_serializers.TaskSerializer(
+        task_models.Task.objects.filter(completed=False), many=True
+    ).data
+
+
+@pytest.mark.django_db
+def testExportTasks_whenFormatIsCsv_streamsHeaderAndRows(client) -> None:
+    task = task_models.Task.objects.create(title='Say "hi", then', description="")
+
+    response = client.get(
+        reverse("task-export"), {"format": "csv", "fields": "id,title,completed"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Disposition"] == 'attachment; filename="tasks.csv"'
+    assert b"".join(response.streaming_content).decode() == (
+        f'id,title,completed\r\n{task.id},"Say ""hi"", then",false\r\n'
+    )
+
+
+@pytest.mark.django_db
+def testExportTasks_whenFilterNotValid_returnsJsonError(client) -> None:
+    response = client.get(
+        reverse("task-export"), {"format": "csv", "created_at__gte": "yesterday"}
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response["Content-Type"] == "application/json"
+    assert "created_at__gte" in json.loads(response.content)["metadata"]
@@ -6,6 +6,7 @@ from tasks import views as tasks_views
 
 router = rest_routers.DefaultRouter()
 router.register(r"tasks", tasks_views.TaskViewSet)
+router.register(r"jobs", tasks_views.JobViewSet)
 
 urlpatterns = [
     path("", include(router.urls)),
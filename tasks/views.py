@@ -1,11 +1,150 @@
 """This module contains the view sets for the Task API."""
 
+import datetime
+from collections import abc
+
+from asgiref import sync
 from django import http as django_http
+from django.core.files import storage
+from django.core.handlers import asgi
+from django.db import models
+from django.db import router
+from django.db import transaction
+from django.utils import cache as cache_utils
+from django.utils import http as http_utils
+from rest_framework import decorators
+from rest_framework import renderers
+from rest_framework import exceptions as drf_exceptions
+from rest_framework import mixins
+from rest_framework import response as drf_response
+from rest_framework import reverse as drf_reverse
+from rest_framework import serializers as drf_serializers
+from rest_framework import status
 from rest_framework import viewsets
 
+from task_manager import exceptions_handler
+from tasks import cache as tasks_cache
+from tasks import changes as tasks_changes
+from tasks import conditional as tasks_conditional
 from tasks import exceptions as tasks_exceptions
+from tasks import filters as tasks_filters
+from tasks import jobs as tasks_jobs
 from tasks import models as tasks_models
+from tasks import pagination as tasks_pagination
+from tasks import renderers as tasks_renderers
+from tasks import representations as tasks_representations
 from tasks import serializers as tasks_serializers
+from tasks import stats as tasks_stats
+
+
+def _bulk_update_ids(data) -> list[int]:
+    """Return the ids of the items of a bulk update, read like its `id` field does.
+
+    The ids that do not convert are left out, the validation reports them.
+    """
+    if not isinstance(data, list):
+        return []
+    field = drf_serializers.IntegerField()
+    ids = []
+    for item in data:
+        if not isinstance(item, dict) or "id" not in item:
+            continue
+        try:
+            ids.append(field.to_internal_value(item["id"]))
+        except drf_exceptions.ValidationError:
+            continue
+    return ids
+
+
+def _validate_bulk(serializer: drf_serializers.BaseSerializer) -> None:
+    """Validate a bulk serializer, reporting the errors of each failing item.
+
+    Raises:
+        BulkOperationException: If some items are not valid.
+        ValidationError: If the batch itself is not valid.
+    """
+    if serializer.is_valid():
+        return
+    errors: dict = (
+        {index: item for index, item in enumerate(serializer.errors) if item}
+        if isinstance(serializer.errors, list)
+        else dict(serializer.errors)
+    )
+    if not all(isinstance(index, int) for index in errors):
+        raise drf_exceptions.ValidationError(errors)
+    raise tasks_exceptions.BulkOperationException(
+        {
+            index: exceptions_handler.APIErrorPayload(
+                error_code="validation_error",
+                message="Given data is not valid.",
+                http_status_code=status.HTTP_400_BAD_REQUEST,
+                metadata=item_errors,
+            ).to_dict()
+            for index, item_errors in errors.items()
+        }
+    )
+
+
+# Size in bytes of the chunks of streamed bodies.
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _buffered(
+    chunks: abc.Iterable[bytes], size: int = STREAM_CHUNK_SIZE
+) -> abc.Iterator[bytes]:
+    """Join small chunks of a streamed body into chunks of about `size` bytes."""
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += chunk
+        if len(buffer) >= size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+async def _iterate_in_thread(chunks: abc.Iterator[bytes]) -> abc.AsyncIterator[bytes]:
+    """Yield the chunks of a sync iterator, read one at a time in a thread.
+
+    Thread-sensitive calls run on the thread of the request, where the view
+    ran and opened its database cursor.
+    """
+    next_chunk = sync.sync_to_async(lambda: next(chunks, None))
+    try:
+        while (chunk := await next_chunk()) is not None:
+            yield chunk
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            await sync.sync_to_async(close)()
+
+
+def _streamed(
+    request, chunks: abc.Iterator[bytes]
+) -> abc.Iterator[bytes] | abc.AsyncIterator[bytes]:
+    """Return the chunks of a streamed body in the form the server reads best.
+
+    Over ASGI, Django reads a sync iterator whole into memory before sending
+    it, so the chunks are handed over as an async iterator instead.
+    """
+    if isinstance(getattr(request, "_request", request), asgi.ASGIRequest):
+        return _iterate_in_thread(chunks)
+    return chunks
+
+
+def _conditional_response(
+    request, etag: str, last_modified: int | None = None
+) -> drf_response.Response | None:
+    """Return the bodiless 304 (or 412) answer to a conditional request, if any."""
+    response = cache_utils.get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is None:
+        return None
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_utils.http_date(last_modified)
+    return drf_response.Response(status=response.status_code, headers=headers)
 
 
 class TaskViewSet(viewsets.ModelViewSet):
@@ -16,10 +155,545 @@ class TaskViewSet(viewsets.ModelViewSet):
 
     queryset = tasks_models.Task.objects.all()
     serializer_class = tasks_serializers.TaskSerializer
+    pagination_class = tasks_pagination.TaskCursorPagination
+    page_number_pagination_class = tasks_pagination.TaskPageNumberPagination
+    renderer_classes = [
+        tasks_renderers.TaskJSONRenderer,
+        renderers.BrowsableAPIRenderer,
+    ]
+    filter_backends = [tasks_filters.TaskFilterBackend, tasks_filters.TaskSearchBackend]
+    fields_param = "fields"
+    # Rows fetched per round trip of the server-side cursor of exports.
+    export_chunk_size = 2000
+
+    @property
+    def paginator(self) -> tasks_pagination.BaseTaskPagination:
+        """Return the page-number paginator when `?page=` is given, the cursor one otherwise."""
+        if not hasattr(self, "_paginator"):
+            paginator_class: type[tasks_pagination.BaseTaskPagination] = (
+                self.pagination_class
+            )
+            page_query_param = self.page_number_pagination_class.page_query_param
+            if self.request is not None and page_query_param in self.request.GET:
+                paginator_class = self.page_number_pagination_class
+            self._paginator = paginator_class()
+        return self._paginator
+
+    def get_serializer_class(self) -> type[drf_serializers.BaseSerializer]:
+        """Return the serializer class of the current action."""
+        if self.action == "bulk_update":
+            return tasks_serializers.TaskBulkUpdateSerializer
+        if self.action == "bulk_destroy":
+            return tasks_serializers.TaskBulkDestroySerializer
+        return super().get_serializer_class()
+
+    def get_requested_fields(self) -> tuple[str, ...] | None:
+        """Return the sparse fieldset asked with `?fields=` by read actions.
+
+        Raises:
+            ValidationError: If some requested fields do not exist.
+        """
+        if self.request is None or self.action not in ("list", "retrieve", "export"):
+            return None
+        value = self.request.query_params.get(self.fields_param)
+        if value is None:
+            return None
+        requested = {name.strip() for name in value.split(",") if name.strip()}
+        available = tasks_serializers.TaskSerializer.Meta.fields
+        unknown = requested.difference(available)
+        if unknown:
+            raise drf_exceptions.ValidationError(
+                {self.fields_param: [f"Unknown fields: {', '.join(sorted(unknown))}."]}
+            )
+        if not requested:
+            raise drf_exceptions.ValidationError(
+                {self.fields_param: ["Pick at least one field."]}
+            )
+        return tuple(name for name in available if name in requested)
+
+    def get_queryset(self) -> models.QuerySet:
+        """Return the tasks, loading only the columns of the requested fields."""
+        queryset = super().get_queryset()
+        fields = self.get_requested_fields()
+        if fields is not None:
+            # The cursor and the validators read these columns of every row.
+            queryset = queryset.only(*{*fields, "id", "created_at", "updated_at"})
+        return queryset
+
+    def get_serializer(self, *args, **kwargs) -> drf_serializers.BaseSerializer:
+        """Return a serializer restricted to the requested fields, if any."""
+        fields = self.get_requested_fields()
+        if fields is not None:
+            kwargs.setdefault("fields", fields)
+        return super().get_serializer(*args, **kwargs)
+
+    def get_representation_variant(self) -> str:
+        """Return the key telling apart the representations of the same tasks."""
+        variant = self.request.accepted_renderer.format
+        fields = self.get_requested_fields()
+        if fields is not None:
+            variant = f"{variant};{','.join(fields)}"
+        return variant
+
+    def get_row_representation(
+        self, page_queryset: models.QuerySet
+    ) -> tasks_representations.TaskRowRepresentation | None:
+        """Return the row representation of a page, when its rendering allows one."""
+        if (
+            not isinstance(
+                self.request.accepted_renderer, tasks_renderers.TaskJSONRenderer
+            )
+            or not tasks_representations.is_supported()
+        ):
+            return None
+        # The cursor and the validators read these columns of every row.
+        extra = ["id", "created_at", "updated_at"]
+        if "rank" in page_queryset.query.annotations:
+            extra.append("rank")
+        return tasks_representations.TaskRowRepresentation(
+            self.get_requested_fields(), extra
+        )
+
+    def list(self, request, *args, **kwargs) -> drf_response.Response:
+        """List a page of tasks, answering 304 when the client's copy is current.
+
+        Pages rendered by `TaskJSONRenderer` are built from rows rather than
+        serialized task by task, see `tasks.representations`.
+        """
+        page_queryset = self.get_page_queryset()
+        if tasks_conditional.is_conditional(request):
+            not_modified = self.get_page_not_modified(
+                list(page_queryset.values_list("id", "updated_at"))
+            )
+            if not_modified is not None:
+                return not_modified
+
+        representation = self.get_row_representation(page_queryset)
+        rows = list(
+            page_queryset
+            if representation is None
+            else representation.get_rows(page_queryset)
+        )
+        return self.get_page_response(rows, representation)
+
+    def get_page_queryset(self) -> models.QuerySet:
+        """Return the queryset of the requested page of the filtered tasks."""
+        paginator = self.paginator
+        assert isinstance(paginator, tasks_pagination.BaseTaskPagination)
+        return paginator.get_request_page_queryset(
+            self.filter_queryset(self.get_queryset()), self.request
+        )
+
+    def get_page_etag(self, versions: abc.Sequence[tuple]) -> str:
+        """Return the ETag of a page.
+
+        Args:
+            versions (Sequence[tuple]): The (id, updated_at) of each fetched
+                row of the page, look-ahead row included.
+        """
+        paginator = self.paginator
+        assert isinstance(paginator, tasks_pagination.BaseTaskPagination)
+        variant = self.get_representation_variant()
+        page_variant = paginator.get_etag_variant(versions)
+        if page_variant:
+            variant = f"{variant};{page_variant}"
+        return tasks_conditional.page_etag(versions, variant)
+
+    def get_page_not_modified(
+        self, versions: abc.Sequence[tuple]
+    ) -> drf_response.Response | None:
+        """Return the 304 answer to a conditional list request, if the page is unchanged.
+
+        Args:
+            versions (Sequence[tuple]): The (id, updated_at) of each row of the page.
+        """
+        return _conditional_response(self.request, self.get_page_etag(versions))
+
+    def get_page_response(
+        self,
+        rows: abc.Sequence,
+        representation: tasks_representations.TaskRowRepresentation | None,
+    ) -> drf_response.Response:
+        """Return the response listing the fetched rows of a page.
+
+        Args:
+            rows (Sequence): The tasks, or the rows of the representation, of the page.
+            representation (TaskRowRepresentation | None): The representation
+                the rows were read for, if any.
+        """
+        paginator = self.paginator
+        assert isinstance(paginator, tasks_pagination.BaseTaskPagination)
+        etag = self.get_page_etag([(row.id, row.updated_at) for row in rows])
+        page = paginator.paginate_rows(rows)
+        data = (
+            self.get_serializer(page, many=True).data
+            if representation is None
+            else representation.to_representation(page)
+        )
+        response = paginator.get_paginated_response(data)
+        response["ETag"] = etag
+        return response
+
+    def retrieve(self, request, *args, **kwargs) -> drf_response.Response:
+        """Retrieve a task through the task cache.
+
+        Answers 304 when the client's copy is current, straight from the cache
+        or after a single cheap query. Only full representations are cached,
+        sparse fieldsets are cut out of them.
+        """
+        task_id = self.get_lookup_task_id()
+        entry = tasks_cache.task_cache.get(task_id)
+        if entry is not None:
+            return self.get_task_response(task_id, entry, cache_status="HIT")
+
+        if tasks_conditional.is_conditional(request):
+            not_modified = self.get_task_not_modified(
+                task_id, self.get_version_queryset(task_id).first()
+            )
+            if not_modified is not None:
+                return not_modified
+
+        entry = self.cache_task(self.get_object())
+        return self.get_task_response(task_id, entry, cache_status="MISS")
+
+    def get_version_queryset(self, task_id: int) -> models.QuerySet:
+        """Return the queryset of the `updated_at` of a task."""
+        return (
+            self.get_queryset().filter(pk=task_id).values_list("updated_at", flat=True)
+        )
+
+    def get_task_not_modified(
+        self, task_id: int, updated_at: datetime.datetime | None
+    ) -> drf_response.Response | None:
+        """Return the 304 answer to a conditional retrieve request, if the task is unchanged."""
+        if updated_at is None:
+            return None
+        return _conditional_response(
+            self.request,
+            tasks_conditional.task_etag(
+                task_id, updated_at, self.get_representation_variant()
+            ),
+            last_modified=int(updated_at.timestamp()),
+        )
+
+    def cache_task(self, task: tasks_models.Task) -> tasks_cache.CacheEntry:
+        """Serialize a task, caching its representation if it is a full one."""
+        entry = (task.updated_at, self.get_serializer(task).data)
+        if self.get_requested_fields() is None:
+            tasks_cache.task_cache.set(task.id, *entry, using=task._state.db)
+        return entry
+
+    def get_task_response(
+        self, task_id: int, entry: tasks_cache.CacheEntry, cache_status: str
+    ) -> drf_response.Response:
+        """Return the response to a retrieve request from a task cache entry."""
+        updated_at, data = entry
+        if updated_at is None:
+            # A pre-rendered 404 payload of an id known to be missing.
+            return drf_response.Response(
+                data, status=status.HTTP_404_NOT_FOUND, headers={"X-Cache": "HIT"}
+            )
+        fields = self.get_requested_fields()
+        if fields is not None:
+            data = {name: data[name] for name in fields}
+        etag = tasks_conditional.task_etag(
+            task_id, updated_at, self.get_representation_variant()
+        )
+        last_modified = int(updated_at.timestamp())
+        response = _conditional_response(
+            self.request, etag, last_modified=last_modified
+        ) or drf_response.Response(data)
+        response["ETag"] = etag
+        response["Last-Modified"] = tasks_conditional.last_modified(updated_at)
+        response["X-Cache"] = cache_status
+        return response
+
+    @decorators.action(
+        detail=False,
+        methods=["get"],
+        renderer_classes=[
+            tasks_renderers.TaskNDJSONRenderer,
+            tasks_renderers.TaskCSVRenderer,
+        ],
+    )
+    def export(self, request, *args, **kwargs) -> django_http.StreamingHttpResponse:
+        """Stream all the tasks matching the list filters, as NDJSON or CSV.
+
+        Rows are read through a server-side cursor and encoded as they come,
+        so memory use does not grow with the number of tasks.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        # Rows are read after the view returns, pick the database now, while
+        # the request is routed.
+        queryset = queryset.using(queryset.db)
+        renderer = request.accepted_renderer
+        assert isinstance(renderer, tasks_renderers.TaskStreamRenderer)
+        fields = (
+            self.get_requested_fields() or tasks_serializers.TaskSerializer.Meta.fields
+        )
+        items = tasks_representations.iter_representations(
+            queryset, fields, self.export_chunk_size
+        )
+        response = django_http.StreamingHttpResponse(
+            _streamed(request, _buffered(renderer.render_stream(items, fields))),
+            content_type=f"{renderer.media_type}; charset={renderer.charset}",
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="tasks.{renderer.format}"'
+        )
+        return response
+
+    @decorators.action(detail=False, methods=["get"])
+    def stats(self, request, *args, **kwargs) -> drf_response.Response:
+        """Return the task totals by completion status and the tasks created per day.
+
+        The statistics are read from the daily counts maintained by the
+        database, so they cover all the tasks and ignore the list filters.
+        """
+        serializer = tasks_serializers.TaskStatsSerializer(tasks_stats.task_stats())
+        return drf_response.Response(serializer.data)
+
+    @decorators.action(detail=False, methods=["get"])
+    def changes(self, request, *args, **kwargs) -> drf_response.Response:
+        """Return the tasks written or deleted since a cursor, oldest change first.
+
+        Clients keep the returned `cursor` and send it as `since` on their
+        next sync, so they only download what changed, see `tasks.changes`.
+        The list filters do not apply: a task leaving a filter would look
+        unchanged to the client.
+        """
+        token = request.query_params.get("since")
+        since = tasks_changes.decode_change_cursor(token) if token else None
+        changes, has_more = tasks_changes.read_changes(
+            self.get_queryset(), since, self.paginator.get_page_size(request)
+        )
+        cursor = changes[-1].cursor if changes else since
+        serializer = tasks_serializers.TaskChangesSerializer(
+            {
+                "changes": changes,
+                "cursor": (
+                    None
+                    if cursor is None
+                    else tasks_changes.encode_change_cursor(cursor)
+                ),
+                "has_more": has_more,
+            }
+        )
+        return drf_response.Response(serializer.data)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        """Report the errors of streamed actions as JSON, like the other errors."""
+        if isinstance(response, drf_response.Response) and isinstance(
+            getattr(request, "accepted_renderer", None),
+            tasks_renderers.TaskStreamRenderer,
+        ):
+            request.accepted_renderer = tasks_renderers.TaskJSONRenderer()
+            request.accepted_media_type = request.accepted_renderer.media_type
+        return super().finalize_response(request, response, *args, **kwargs)
+
+    def get_task_id(self) -> int | None:
+        """Return the id of the task in the url, if it is a valid one."""
+        pk = self.kwargs["pk"]
+        return int(pk) if pk.isascii() and pk.isdigit() else None
+
+    def get_lookup_task_id(self) -> int:
+        """Return the id of the task in the url.
+
+        Raises:
+            TaskNotFoundException: If the url holds no valid task id.
+        """
+        task_id = self.get_task_id()
+        if task_id is None:
+            raise tasks_exceptions.TaskNotFoundException(task_id=self.kwargs["pk"])
+        return task_id
+
+    def update(self, request, *args, **kwargs) -> drf_response.Response:
+        """Update the fields of a task given in the request, in a single query.
+
+        The task is not loaded first: only the given fields are written, by an
+        UPDATE ... RETURNING statement which also reads the updated task back
+        for the response, see `TaskQuerySet.update_returning()`.
+        """
+        partial = kwargs.pop("partial", False)
+        serializer = self.get_serializer(data=request.data, partial=partial)
+        if not serializer.is_valid():
+            # A missing task is reported before the errors of the data.
+            self.get_object()
+            serializer.is_valid(raise_exception=True)
+        tasks = self.get_update_queryset().update_returning(**serializer.validated_data)
+        if not tasks:
+            # Reports, and remembers, the missing task.
+            self.get_object()
+        return drf_response.Response(self.get_serializer(tasks[0]).data)
+
+    def get_update_queryset(self) -> tasks_models.TaskQuerySet:
+        """Return the queryset of the task in the url, for `update()`.
+
+        Raises:
+            TaskNotFoundException: If the url holds no valid task id, or one
+                known to be missing.
+        """
+        task_id = self.get_lookup_task_id()
+        if tasks_cache.task_cache.get_missing(task_id) is not None:
+            raise tasks_exceptions.TaskNotFoundException(task_id=task_id)
+        queryset = self.filter_queryset(self.get_queryset()).filter(pk=task_id)
+        assert isinstance(queryset, tasks_models.TaskQuerySet)
+        return queryset
+
+    def filter_queryset(self, queryset: models.QuerySet) -> models.QuerySet:
+        """Apply the list filters, except to the task of a detail url.
+
+        A detail url names one task whatever its query string: a filter
+        excluding the task must not answer 404, which the task cache would
+        then remember for requests without the filter.
+        """
+        if self.lookup_field in self.kwargs:
+            return queryset
+        return super().filter_queryset(queryset)
 
     def get_object(self) -> tasks_models.Task:
-        """Override the get_object method to raise a custom exception when the task is not found."""
+        """Override the get_object method to raise a custom exception when the task is not found.
+
+        Missing ids are remembered in the task cache for a short while, so
+        that requests for them do not reach the database.
+        """
+        task_id = self.get_task_id()
+        # retrieve() has looked the id up in the cache already.
+        if (
+            task_id is not None
+            and self.action != "retrieve"
+            and tasks_cache.task_cache.get_missing(task_id) is not None
+        ):
+            raise tasks_exceptions.TaskNotFoundException(task_id=task_id)
         try:
             return super().get_object()
         except django_http.Http404:
-            raise tasks_exceptions.TaskNotFoundException(task_id=self.kwargs["pk"])
+            exception = tasks_exceptions.TaskNotFoundException(
+                task_id=self.kwargs["pk"]
+            )
+            if task_id is not None:
+                tasks_cache.task_cache.set_missing(
+                    task_id, exception.detail, using=self.get_queryset().db
+                )
+            raise exception
+
+    @decorators.action(detail=False, methods=["post"], url_path="bulk", url_name="bulk")
+    def bulk_create(self, request, *args, **kwargs) -> drf_response.Response:
+        """Create a batch of tasks in one transaction."""
+        serializer = self.get_serializer(data=request.data, many=True)
+        _validate_bulk(serializer)
+        with transaction.atomic():
+            serializer.save()
+        return drf_response.Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @bulk_create.mapping.patch
+    def bulk_update(self, request, *args, **kwargs) -> drf_response.Response:
+        """Partially update a batch of tasks, each identified by its `id`, in one transaction."""
+        ids = _bulk_update_ids(request.data)
+        with transaction.atomic():
+            # Rows are locked in id order so concurrent batches cannot deadlock.
+            tasks = list(
+                self.get_queryset()
+                .filter(id__in=ids)
+                .select_for_update()
+                .order_by("id")
+            )
+            serializer = self.get_serializer(
+                tasks, data=request.data, many=True, partial=True
+            )
+            _validate_bulk(serializer)
+            serializer.save()
+        return drf_response.Response(serializer.data)
+
+    @bulk_create.mapping.delete
+    def bulk_destroy(self, request, *args, **kwargs) -> drf_response.Response:
+        """Delete a batch of tasks with a single DELETE statement."""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data["ids"]
+        with transaction.atomic():
+            queryset = self.get_queryset().filter(id__in=ids)
+            existing_ids = set(
+                queryset.select_for_update().order_by("id").values_list("id", flat=True)
+            )
+            missing = {
+                index: tasks_exceptions.TaskNotFoundException(task_id=task_id).detail
+                for index, task_id in enumerate(ids)
+                if task_id not in existing_ids
+            }
+            if missing:
+                raise tasks_exceptions.BulkOperationException(missing)
+            # post_delete receivers make Django load the rows before deleting
+            # them, only their ids are needed.
+            queryset.only("id").delete()
+        return drf_response.Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class JobViewSet(
+    mixins.CreateModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet
+):
+    """This class provides the viewset for the background jobs.
+
+    Jobs are queued by `create`, which answers 202 right away, and run by the
+    workers of `manage.py run_task_workers`, see `tasks.jobs`. Clients poll
+    the job at the `Location` of the answer to follow its progress.
+    """
+
+    queryset = tasks_models.Job.objects.all()
+    serializer_class = tasks_serializers.JobSerializer
+    renderer_classes = [
+        tasks_renderers.TaskJSONRenderer,
+        renderers.BrowsableAPIRenderer,
+    ]
+
+    def get_queryset(self) -> models.QuerySet:
+        """Return the jobs of the primary database, which workers update."""
+        # A replica may not have the job queued by the previous request yet.
+        return super().get_queryset().using(router.db_for_write(tasks_models.Job))
+
+    def get_object(self) -> tasks_models.Job:
+        """Override the get_object method to raise a custom exception when the job is not found."""
+        try:
+            return super().get_object()
+        except django_http.Http404:
+            raise tasks_exceptions.JobNotFoundException(job_id=self.kwargs["pk"])
+
+    def create(self, request, *args, **kwargs) -> drf_response.Response:
+        """Queue a job and answer before it runs."""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job = serializer.save()
+        return drf_response.Response(
+            serializer.data,
+            status=status.HTTP_202_ACCEPTED,
+            headers={
+                "Location": drf_reverse.reverse(
+                    "job-detail", args=[job.pk], request=request
+                )
+            },
+        )
+
+    @decorators.action(detail=True, methods=["get"])
+    def download(self, request, *args, **kwargs) -> django_http.FileResponse:
+        """Download the file written by a succeeded export job."""
+        job = self.get_object()
+        if (
+            job.kind != tasks_models.Job.Kind.EXPORT
+            or job.status != tasks_models.Job.Status.SUCCEEDED
+            or job.result is None
+        ):
+            raise tasks_exceptions.JobResultUnavailableException(job_id=job.pk)
+        renderer = tasks_jobs.EXPORT_RENDERERS[job.result["format"]]
+        file = storage.default_storage.open(job.result["file"])
+        response = django_http.FileResponse(
+            file,
+            as_attachment=True,
+            filename=f"tasks.{renderer.format}",
+            content_type=f"{renderer.media_type}; charset={renderer.charset}",
+        )
+        if isinstance(request._request, asgi.ASGIRequest):
+            # The headers were set from the file, which the response closes.
+            response.streaming_content = _iterate_in_thread(
+                iter(lambda: file.read(STREAM_CHUNK_SIZE), b"")
+            )
+        return response